@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Requests/sec for /api/learning-path with pre-encoded bodies vs rebuilding them.
+
+"rebuilt" re-registers the previous handler shape (dict -> NaN walk -> FastAPI
+JSON encoding on every request) on the same app, so both paths share routing,
+middleware and dataset loading. Runs in-process over ASGI.
+
+    python benchmarks/bench_encoded_responses.py --requests 2000 --course data_structures_algorithms
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from dataset_cache import replace_nan_with_none  # noqa: E402
+
+
+@main.app.get("/bench/rebuilt/{course_name}", include_in_schema=False)
+def rebuilt_learning_path(course_name: str, mode: str = "Elaborate"):
+    filename = main.find_dataset_filename_for_course(course_name)
+    records = main.dataset_cache.get_view(os.path.join(main.DATASET_DIR, filename), mode)
+    records = replace_nan_with_none(records)
+    return {
+        "course_name": course_name,
+        "dataset_filename": filename,
+        "learning_mode": mode,
+        "total_modules": len(records),
+        "content": records,
+    }
+
+
+# the catch-all routes were registered first; move the bench route ahead of them
+main.app.router.routes.insert(0, main.app.router.routes.pop())
+
+
+async def measure(client: httpx.AsyncClient, path: str, headers: dict, n: int, expect: int) -> float:
+    for _ in range(20):
+        await client.get(path, headers=headers)
+    start = time.perf_counter()
+    for _ in range(n):
+        r = await client.get(path, headers=headers)
+        assert r.status_code == expect, (path, r.status_code)
+    return n / (time.perf_counter() - start)
+
+
+async def run(course: str, n: int) -> None:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        path = f"/api/learning-path/{course}"
+        etag = (await client.get(path, headers={"accept-encoding": "identity"})).headers["etag"]
+        cases = [
+            ("rebuilt per request", f"/bench/rebuilt/{course}", {"accept-encoding": "identity"}, 200),
+            ("pre-encoded", path, {"accept-encoding": "identity"}, 200),
+            ("pre-encoded gzip", path, {"accept-encoding": "gzip"}, 200),
+            ("If-None-Match -> 304", path, {"accept-encoding": "identity", "if-none-match": etag}, 304),
+        ]
+        baseline = None
+        for name, p, headers, expect in cases:
+            rps = await measure(client, p, headers, n, expect)
+            baseline = baseline or rps
+            print(f"{name:24s} {rps:8.0f} req/s  ({rps / baseline:.2f}x)")
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--course", default="data_structures_algorithms")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logging.getLogger("hiredai").setLevel(logging.WARNING)
+    asyncio.run(run(args.course, args.requests))
+
+
+if __name__ == "__main__":
+    cli()
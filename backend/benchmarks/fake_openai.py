@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI chat-completions API, used by the benchmarks.
+
+    python benchmarks/fake_openai.py --port 9100 --latency-ms 800 --error-rate 0.1
+
+Point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:9100/v1 and any
+OPENAI_API_KEY. --error-rate makes that fraction of calls answer 429; requests
+with "stream": true are answered as SSE chunks, one word per --token-latency-ms.
+Tests can queue exact failures in ``app.state.scripted_statuses`` (answered in
+order, before any normal response) and read the peak upstream concurrency from
+``app.state.max_in_flight``. ``app.state.in_flight`` counts calls waiting out
+--latency-ms plus streams that are still being sent.
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import random
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def create_app(latency_ms: float = 500.0, error_rate: float = 0.0, token_latency_ms: float = 20.0) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    app.state.latency_ms = latency_ms
+    app.state.error_rate = error_rate
+    app.state.token_latency_ms = token_latency_ms
+    app.state.calls = 0
+    app.state.streams_completed = 0
+    app.state.streams_cancelled = 0
+    app.state.scripted_statuses = collections.deque()
+    app.state.in_flight = 0
+    app.state.max_in_flight = 0
+
+    async def stream_chunks(body: dict, content: str):
+        chunk_id = f"chatcmpl-fake-{app.state.calls}"
+        # a stream stays in flight until it is fully sent or the client goes away
+        app.state.in_flight += 1
+        try:
+            for token in content.split(" "):
+                chunk = {
+                    "id": chunk_id,
+                    "object": "chat.completion.chunk",
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": {"content": token + " "}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(app.state.token_latency_ms / 1000)
+            yield "data: [DONE]\n\n"
+            app.state.streams_completed += 1
+        except asyncio.CancelledError:
+            app.state.streams_cancelled += 1
+            raise
+        finally:
+            app.state.in_flight -= 1
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            await asyncio.sleep(app.state.latency_ms / 1000)
+        finally:
+            app.state.in_flight -= 1
+        if app.state.scripted_statuses:
+            status = app.state.scripted_statuses.popleft()
+            return JSONResponse({"error": {"message": f"scripted {status}"}}, status_code=status, headers={"Retry-After": "0"})
+        if random.random() < app.state.error_rate:
+            return JSONResponse({"error": {"message": "rate limited"}}, status_code=429, headers={"Retry-After": "0"})
+        prompt = body["messages"][-1]["content"]
+        content = f"Situation: {prompt[:40]} Task: ... Action: ... Result: ..."
+        if body.get("stream"):
+            return StreamingResponse(stream_chunks(body, content), media_type="text/event-stream")
+        await asyncio.sleep(len(content.split(" ")) * app.state.token_latency_ms / 1000)
+        return {
+            "id": f"chatcmpl-fake-{app.state.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        }
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve_in_thread(app, port: int) -> uvicorn.Server:
+    """Run an ASGI app with uvicorn on its own thread and event loop; returns once it is accepting."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--token-latency-ms", type=float, default=20.0, help="delay between streamed tokens")
+    args = parser.parse_args()
+    app = create_app(args.latency_ms, args.error_rate, args.token_latency_ms)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Show that in-flight generations do not stall the other routes.
+
+Starts the fake OpenAI upstream and the backend on local sockets, fires N
+concurrent /api/generate-answer calls, and samples /api/health latency while
+they are in flight and again once they have finished.
+
+    python benchmarks/loop_latency.py --generations 100 --upstream-latency-ms 1500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_openai import create_app, free_port, serve_in_thread  # noqa: E402
+
+
+async def sample_latency(client: httpx.AsyncClient, path: str, duration: float) -> list:
+    samples = []
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        start = time.monotonic()
+        r = await client.get(path)
+        r.raise_for_status()
+        samples.append((time.monotonic() - start) * 1000)
+        await asyncio.sleep(0.02)
+    return samples
+
+
+def summarize(samples: list) -> str:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"n={len(samples)} p50={statistics.median(samples):.1f}ms p99={p99:.1f}ms max={samples[-1]:.1f}ms"
+
+
+async def run(base_url: str, generations: int, window: float) -> None:
+    limits = httpx.Limits(max_connections=generations + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        idle = await sample_latency(client, "/api/health", 1.0)
+
+        tasks = [
+            asyncio.create_task(client.post("/api/generate-answer", json={"prompt": f"Question {i}"}))
+            for i in range(generations)
+        ]
+        await asyncio.sleep(0.1)
+        busy = await sample_latency(client, "/api/health", window)
+        responses = await asyncio.gather(*tasks)
+        ok = sum(1 for r in responses if r.status_code == 200 and not r.json()["answer"].startswith("Error"))
+
+    print(f"/api/health idle:           {summarize(idle)}")
+    print(f"/api/health {generations} in flight: {summarize(busy)}")
+    print(f"generations succeeded: {ok}/{generations}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--upstream-latency-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    upstream_port = free_port()
+    serve_in_thread(create_app(args.upstream_latency_ms), upstream_port)
+
+    os.environ["OPENAI_API_KEY"] = "sk-fake"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{upstream_port}/v1"
+    os.environ.setdefault("OPENAI_MAX_CONCURRENCY", str(args.generations))
+    import main as backend
+
+    backend_port = free_port()
+    serve_in_thread(backend.app, backend_port)
+
+    window = max(0.5, args.upstream_latency_ms / 1000 * 0.8)
+    asyncio.run(run(f"http://127.0.0.1:{backend_port}", args.generations, window))
+
+
+if __name__ == "__main__":
+    main()
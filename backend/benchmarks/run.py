@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Load and microbenchmark suite for the backend, with a JSON report and a
+baseline comparison.
+
+HTTP scenarios run against the app in-process (httpx over ASGI, no socket) and
+over a real uvicorn process on a local port; /api/generate-answer talks to the
+fake OpenAI server from fake_openai.py. Microbenchmarks time the resolver,
+NaN cleanup and dataset loading directly.
+
+    python benchmarks/run.py                                  # both transports, repo datasets
+    python benchmarks/run.py --courses 2000 --rows 200        # synthetic datasets
+    python benchmarks/run.py --baseline benchmarks/baseline.json --threshold 0.25
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+
+Exits 1 when --baseline is given and a result regressed past --threshold
+(throughput down, or p99 up, by more than that fraction). Exits 2 without
+comparing when the baseline was recorded with a different configuration or
+CPU count; re-record it with --save-baseline on the same settings instead.
+"""
+
+import argparse
+import asyncio
+import datetime
+import glob
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing as t
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fake_openai import create_app, free_port, serve_in_thread  # noqa: E402
+from benchmarks.synthetic import WORDS, generate_course_csv, generate_dataset_dir  # noqa: E402
+
+# Differences smaller than this are timer noise, whatever the ratio says
+P99_NOISE_FLOOR_MS = 1.0
+
+
+class Scenario(t.NamedTuple):
+    name: str
+    method: str
+    path: str
+    body: t.Optional[t.Callable[[int], dict]] = None
+    headers: t.Optional[t.Dict[str, str]] = None
+
+
+def percentile(sorted_samples: t.List[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(math.ceil(q * len(sorted_samples))) - 1)]
+
+
+def assessments(n: int, seed: int = 0) -> t.List[dict]:
+    """n random learning-style assessment results, as the frontend posts them."""
+    rng = random.Random(seed)
+    styles = ("Short", "Elaborate", "Realistic")
+    batch = []
+    for _ in range(n):
+        scores = {style: rng.randint(0, 10) for style in styles}
+        dominant = max(styles, key=scores.get)
+        batch.append({"dominantStyle": dominant, "scores": scores, "percentage": round(100 * scores[dominant] / (sum(scores.values()) or 1))})
+    return batch
+
+
+def build_scenarios(course: str, static_asset: t.Optional[str]) -> t.List[Scenario]:
+    scenarios = [
+        Scenario("learning_path_short", "GET", f"/api/learning-path/{course}?mode=Short"),
+        Scenario("learning_path_elaborate", "GET", f"/api/learning-path/{course}?mode=Elaborate"),
+        Scenario("learning_path_realistic", "GET", f"/api/learning-path/{course}?mode=Realistic"),
+        Scenario("learning_path_gzip", "GET", f"/api/learning-path/{course}?mode=Elaborate", headers={"Accept-Encoding": "gzip"}),
+        Scenario("check_data", "GET", "/api/check-data"),
+        Scenario("health", "GET", "/api/health"),
+        Scenario("spa_fallback", "GET", "/dashboard/courses/42"),
+        Scenario("search", "GET", f"/api/search?q={'+'.join(WORDS[:2])}&limit=10"),
+        # a fresh prompt per request goes to the upstream; a fixed one is served from the response cache
+        Scenario("generate_answer", "POST", "/api/generate-answer", body=lambda i: {"prompt": f"Benchmark question {i} {random.random()}"}),
+        Scenario("generate_answer_cached", "POST", "/api/generate-answer", body=lambda i: {"prompt": "Tell me about yourself"}),
+        Scenario("predict_batch_100", "POST", "/api/predict-learning-path/batch", body=lambda i: {"assessments": assessments(100, seed=i)}),
+    ]
+    if static_asset:
+        # same URL index.html references, served from the in-memory asset table
+        scenarios.insert(7, Scenario("static_asset", "GET", f"/{static_asset}", headers={"Accept-Encoding": "gzip"}))
+    return scenarios
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int, warmup: int) -> dict:
+    async def send(i: int) -> httpx.Response:
+        body = scenario.body(i) if scenario.body else None
+        return await client.request(scenario.method, scenario.path, json=body, headers=scenario.headers)
+
+    for i in range(warmup):
+        await send(-1 - i)
+
+    latencies: t.List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            r = await send(i)
+            await r.aread()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if r.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(requests / wall, 1),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+    }
+
+
+async def run_scenarios(client: httpx.AsyncClient, scenarios: t.List[Scenario], args) -> t.Dict[str, dict]:
+    results = {}
+    for scenario in scenarios:
+        requests = args.requests
+        if scenario.name == "generate_answer":
+            # upstream-bound: each call waits --upstream-latency-ms
+            requests = min(requests, args.generate_requests)
+        results[scenario.name] = await drive(client, scenario, requests, args.concurrency, args.warmup)
+        print(f"  {scenario.name:<26} {format_http(results[scenario.name])}")
+    return results
+
+
+def format_http(r: dict) -> str:
+    return f"{r['rps']:>9.1f} req/s  p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms p99={r['p99_ms']:.2f}ms errors={r['errors']}"
+
+
+def run_inprocess(scenarios: t.List[Scenario], args) -> t.Dict[str, dict]:
+    import main as backend
+
+    async def go():
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_scenarios(client, scenarios, args)
+
+    return asyncio.run(go())
+
+
+def run_socket(scenarios: t.List[Scenario], args) -> t.Dict[str, dict]:
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=dict(os.environ),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+            try:
+                if httpx.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not come up within 60s")
+            time.sleep(0.1)
+
+        async def go():
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+                return await run_scenarios(client, scenarios, args)
+
+        return asyncio.run(go())
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def timeit(fn: t.Callable[[], t.Any], min_time: float = 0.5, max_iterations: int = 1_000_000) -> dict:
+    """Call fn repeatedly for about min_time seconds; report per-call cost."""
+    fn()
+    iterations = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    batch = 1
+    while elapsed < min_time and iterations < max_iterations:
+        for _ in range(batch):
+            fn()
+        iterations += batch
+        elapsed = time.perf_counter() - started
+        batch = min(batch * 2, max_iterations - iterations) or 1
+    return {"iterations": iterations, "ops_per_sec": round(iterations / elapsed, 1), "us_per_op": round(elapsed / iterations * 1e6, 3)}
+
+
+def run_micro(dataset_dir: str, args) -> t.Dict[str, dict]:
+    import main as backend
+    from course_resolver import CourseResolver
+    from dataset_cache import build_mode_views, replace_nan_with_none
+    from dataset_pack import DatasetPack, compile_pack
+
+    import pandas as pd
+
+    files = sorted(f for f in os.listdir(dataset_dir) if f.lower().endswith(".csv"))
+    course_names = [f[:-len("_learning.csv")].replace("_", " ").title() if f.endswith("_learning.csv") else f[:-4] for f in files]
+    queries = course_names + [n.lower() + " course" for n in course_names] + ["quantum basket weaving", "intro to cloud"]
+    rng = random.Random(1)
+
+    results = {}
+
+    def record(name: str, fn: t.Callable[[], t.Any], **kwargs) -> None:
+        results[name] = timeit(fn, min_time=args.micro_time, **kwargs)
+        r = results[name]
+        print(f"  {name:<26} {r['ops_per_sec']:>12.1f} ops/s  {r['us_per_op']:.2f}us/op")
+
+    record("resolver_build", lambda: CourseResolver(files), max_iterations=200)
+
+    resolver = CourseResolver(files)
+    record("resolve_cold", lambda: resolver._resolve_uncached(rng.choice(queries)))
+    # warm the memo first so these measure the hit path, not the first pass over the queries
+    for query in queries:
+        resolver.resolve(query)
+        backend.find_dataset_filename_for_course(query)
+    record("resolve_memoized", lambda: resolver.resolve(rng.choice(queries)))
+    record("find_dataset_filename", lambda: backend.find_dataset_filename_for_course(rng.choice(queries)))
+
+    from search_index import SearchIndexer
+
+    snapshot = backend.dataset_store.current
+    if not snapshot.entries:
+        snapshot = backend.dataset_store.reload("benchmark", notify=False)
+    load_records = lambda snap, filename: backend.get_dataset_entry(snap, filename).views["Elaborate"]
+    record("search_index_build", lambda: SearchIndexer(load_records, backend.QUESTION_BANK_DIR).refresh(snapshot), max_iterations=50)
+    index = SearchIndexer(load_records, backend.QUESTION_BANK_DIR).refresh(snapshot)
+    record("search_query", lambda: index.search(" ".join(rng.sample(WORDS, 2)), limit=10))
+
+    # throughput per 10k assessments: ranking alone, then the whole handler (validation, ranking, JSON)
+    batch = assessments(10_000, seed=5)
+    ranker = backend.course_ranker.refresh(snapshot)
+    batch_scores = [[a["scores"][style] for style in ("Short", "Elaborate", "Realistic")] for a in batch]
+    batch_dominant = [a["dominantStyle"] for a in batch]
+    record("course_rank_10k", lambda: ranker.recommend(batch_scores, batch_dominant, 3), max_iterations=1_000)
+    record("predict_batch_10k", lambda: backend.predict_learning_path_batch(backend.BatchAssessmentRequest.model_validate({"assessments": batch})),
+           max_iterations=200)
+
+    # one 1k-row frame's worth of records with ~2% NaN cells
+    tmp = tempfile.mkdtemp(prefix="hiredai-micro-")
+    try:
+        csv_path = os.path.join(tmp, "micro_learning.csv")
+        generate_course_csv(csv_path, args.micro_rows, seed=3)
+        records = pd.read_csv(csv_path).to_dict(orient="records")
+        record("replace_nan_with_none", lambda: replace_nan_with_none(records), max_iterations=10_000)
+        record("dataset_csv_load", lambda: build_mode_views(csv_path), max_iterations=1_000)
+
+        pack_path = os.path.join(tmp, "micro.pack")
+        compile_pack(tmp, pack_path)
+        pack = DatasetPack(pack_path)
+        try:
+            record("dataset_pack_load", lambda: pack.load_views(csv_path), max_iterations=10_000)
+        finally:
+            pack.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> t.List[str]:
+    """Human-readable regressions of report against baseline; only names present in both count."""
+    regressions = []
+    for key, current in report.get("http", {}).items():
+        base = baseline.get("http", {}).get(key)
+        if not base:
+            continue
+        if current["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"http {key}: {current['rps']:.1f} req/s vs baseline {base['rps']:.1f}")
+        if current["p99_ms"] > base["p99_ms"] * (1 + threshold) and current["p99_ms"] - base["p99_ms"] > P99_NOISE_FLOOR_MS:
+            regressions.append(f"http {key}: p99 {current['p99_ms']:.2f}ms vs baseline {base['p99_ms']:.2f}ms")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"http {key}: {current['errors']} errors vs baseline {base['errors']}")
+    for key, current in report.get("micro", {}).items():
+        base = baseline.get("micro", {}).get(key)
+        if base and current["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"micro {key}: {current['ops_per_sec']:.1f} ops/s vs baseline {base['ops_per_sec']:.1f}")
+    return regressions
+
+
+def config_mismatches(baseline_meta: dict, meta: dict) -> t.List[str]:
+    """Settings that differ between two reports; ratios between them would not mean anything."""
+    mismatched = []
+    base_config, config = baseline_meta.get("config") or {}, meta["config"]
+    for key in sorted(set(base_config) | set(config)):
+        if base_config.get(key) != config.get(key):
+            mismatched.append(f"{key}: {base_config.get(key)!r} in baseline, {config.get(key)!r} now")
+    if baseline_meta.get("cpu_count") != meta["cpu_count"]:
+        mismatched.append(f"cpu_count: {baseline_meta.get('cpu_count')!r} in baseline, {meta['cpu_count']!r} now")
+    return mismatched
+
+
+def git_commit() -> t.Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["inprocess", "socket", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per HTTP scenario")
+    parser.add_argument("--generate-requests", type=int, default=400, help="cap for the upstream-bound generate_answer scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--only", action="append", default=[], help="run only scenarios/microbenchmarks whose name contains this (repeatable)")
+    parser.add_argument("--skip-http", action="store_true")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--micro-time", type=float, default=0.5, help="seconds per microbenchmark")
+    parser.add_argument("--micro-rows", type=int, default=1000, help="rows in the microbenchmark CSV")
+    parser.add_argument("--courses", type=int, default=0, help="generate this many synthetic courses instead of using backend/datasets")
+    parser.add_argument("--rows", type=int, default=200, help="rows per synthetic course")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0, help="fake OpenAI latency per call")
+    parser.add_argument("--output", default=os.path.join(BACKEND_DIR, "benchmarks", "report.json"))
+    parser.add_argument("--baseline", help="compare against this report and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--save-baseline", help="also write the report here")
+    args = parser.parse_args()
+
+    synthetic_dir = None
+    if args.courses:
+        synthetic_dir = tempfile.mkdtemp(prefix="hiredai-bench-")
+        started = time.perf_counter()
+        generate_dataset_dir(synthetic_dir, args.courses, args.rows)
+        print(f"Generated {args.courses} synthetic courses x {args.rows} rows in {time.perf_counter() - started:.1f}s")
+    dataset_dir = synthetic_dir or os.path.join(BACKEND_DIR, "datasets")
+
+    upstream_port = free_port()
+    serve_in_thread(create_app(args.upstream_latency_ms, token_latency_ms=0), upstream_port)
+
+    # main.py reads its configuration at import time, in this process and in the uvicorn child
+    os.environ.update({
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{upstream_port}/v1",
+        "OPENAI_MAX_CONCURRENCY": str(max(args.concurrency, 1)),
+        "DATASET_DIR": dataset_dir,
+        "LOG_LEVEL": "ERROR",
+    })
+    if synthetic_dir:
+        # the committed pack describes backend/datasets; synthetic runs load from CSV
+        os.environ["DATASET_PACK_PATH"] = os.path.join(synthetic_dir, "datasets.pack")
+
+    files = sorted(f for f in os.listdir(dataset_dir) if f.lower().endswith(".csv"))
+    course = files[0][:-len("_learning.csv")] if files else "missing_course"
+    assets = sorted(glob.glob(os.path.join(BACKEND_DIR, "dist", "assets", "*.js")))
+    static_asset = os.path.relpath(assets[0], os.path.join(BACKEND_DIR, "dist")) if assets else None
+
+    def selected(name: str) -> bool:
+        return not args.only or any(pattern in name for pattern in args.only)
+
+    scenarios = [s for s in build_scenarios(course, static_asset) if selected(s.name)]
+    transports = ["inprocess", "socket"] if args.transport == "both" else [args.transport]
+
+    report: t.Dict[str, t.Any] = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {
+                "requests": args.requests, "generate_requests": args.generate_requests, "concurrency": args.concurrency,
+                "warmup": args.warmup, "courses": args.courses or len(files), "rows": args.rows if args.courses else None,
+                "upstream_latency_ms": args.upstream_latency_ms, "synthetic": bool(synthetic_dir),
+                "micro_time": args.micro_time, "micro_rows": args.micro_rows,
+            },
+        },
+        "http": {},
+        "micro": {},
+    }
+
+    try:
+        if not args.skip_http and scenarios:
+            for transport in transports:
+                print(f"HTTP ({transport}, concurrency={args.concurrency}, course={course})")
+                runner = run_inprocess if transport == "inprocess" else run_socket
+                for name, result in runner(scenarios, args).items():
+                    report["http"][f"{transport}:{name}"] = result
+        if not args.skip_micro:
+            print(f"Microbenchmarks ({len(files)} datasets)")
+            report["micro"] = {k: v for k, v in run_micro(dataset_dir, args).items() if selected(k)}
+    finally:
+        if synthetic_dir:
+            shutil.rmtree(synthetic_dir, ignore_errors=True)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        mismatched = config_mismatches(baseline.get("meta", {}), report["meta"])
+        if mismatched:
+            print(f"❌ {args.baseline} was recorded with different settings; not comparing:")
+            for line in mismatched:
+                print(f"  - {line}")
+            return 2
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+End-to-end check of /api/generate-answer/stream against the fake upstream.
+
+Measures time-to-first-token against the buffered endpoint, then opens
+streams, drops them after the first delta and confirms the upstream calls were
+cancelled rather than run to completion.
+
+    python benchmarks/stream_check.py --upstream-latency-ms 300 --token-latency-ms 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_openai import create_app, free_port, serve_in_thread  # noqa: E402
+
+
+async def time_to_first_delta(client: httpx.AsyncClient) -> tuple:
+    start = time.monotonic()
+    first = None
+    answer = None
+    async with client.stream("POST", "/api/generate-answer/stream", json={"prompt": "Tell me about a conflict"}) as r:
+        event = None
+        async for line in r.aiter_lines():
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                if first is None:
+                    first = time.monotonic() - start
+                if event == "done":
+                    answer = json.loads(line[5:])["answer"]
+                event = None
+    return first, time.monotonic() - start, answer
+
+
+async def drop_after_first_delta(client: httpx.AsyncClient) -> None:
+    async with client.stream("POST", "/api/generate-answer/stream", json={"prompt": "Walk away early"}) as r:
+        async for line in r.aiter_lines():
+            if line.startswith("data:"):
+                return
+
+
+async def run(base_url: str, upstream, drops: int) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        start = time.monotonic()
+        buffered = (await client.post("/api/generate-answer", json={"prompt": "Tell me about a conflict"})).json()["answer"]
+        buffered_total = time.monotonic() - start
+
+        first, total, streamed = await time_to_first_delta(client)
+        print(f"buffered: {buffered_total * 1000:.0f}ms until any content")
+        print(f"streamed: first delta after {first * 1000:.0f}ms, done after {total * 1000:.0f}ms")
+        print(f"answers match: {streamed == buffered}")
+
+        before = upstream.state.streams_cancelled
+        await asyncio.gather(*(drop_after_first_delta(client) for _ in range(drops)))
+    await asyncio.sleep(1.0)
+    print(f"upstream streams cancelled after client disconnect: {upstream.state.streams_cancelled - before}/{drops}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--upstream-latency-ms", type=float, default=300.0)
+    parser.add_argument("--token-latency-ms", type=float, default=100.0)
+    parser.add_argument("--drops", type=int, default=5)
+    args = parser.parse_args()
+
+    upstream = create_app(args.upstream_latency_ms, token_latency_ms=args.token_latency_ms)
+    upstream_port = free_port()
+    serve_in_thread(upstream, upstream_port)
+
+    os.environ["OPENAI_API_KEY"] = "sk-fake"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{upstream_port}/v1"
+    import main as backend
+
+    backend_port = free_port()
+    serve_in_thread(backend.app, backend_port)
+    asyncio.run(run(f"http://127.0.0.1:{backend_port}", upstream, args.drops))
+
+
+if __name__ == "__main__":
+    main()
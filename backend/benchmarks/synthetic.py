@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Synthetic course datasets for benchmarking at scale.
+
+Writes CSVs with the same columns as backend/datasets/*_learning.csv, properly
+quoted, with multi-line code examples, a Beginner/Intermediate/Advanced mix and
+a few empty cells (NaN after parsing).
+
+    python benchmarks/synthetic.py --out /tmp/hiredai-datasets --courses 1000 --rows 200
+    python benchmarks/synthetic.py --out /tmp/hiredai-big --courses 1 --rows 100000
+"""
+
+import argparse
+import csv
+import os
+import random
+import typing as t
+
+COLUMNS = ["module_id", "module_name", "topic_title", "content_summary", "code_example", "difficulty"]
+DIFFICULTIES = ["Beginner", "Intermediate", "Advanced"]
+WORDS = (
+    "cloud security react typescript python kubernetes docker data structures algorithms machine learning "
+    "graph database sql networking linux testing design patterns system distributed caching observability "
+    "serverless frontend backend mobile rust golang java spring devops terraform streaming analytics"
+).split()
+
+
+def course_slugs(n: int, seed: int = 7) -> t.List[str]:
+    rng = random.Random(seed)
+    slugs = []
+    for i in range(n):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        slugs.append("_".join(words) + f"_{i:05d}")
+    return slugs
+
+
+def generate_course_csv(path: str, rows: int, seed: int = 0, nan_rate: float = 0.02) -> None:
+    rng = random.Random(seed)
+    modules_per_course = max(1, rows // 5)
+    module_titles = [rng.choice(WORDS).title() for _ in range(modules_per_course)]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            module = i * modules_per_course // rows
+            topic = " ".join(rng.sample(WORDS, 3)).title()
+            summary = ", ".join(" ".join(rng.sample(WORDS, 4)) for _ in range(rng.randint(1, 3))) + "."
+            code = "\n".join(f"# step {j}\nrun_{rng.choice(WORDS)}({j})" for j in range(rng.randint(1, 4)))
+            row = [i + 1, f"Module {module + 1}: {module_titles[module]}", topic, summary, code, rng.choice(DIFFICULTIES)]
+            for col in (3, 4):
+                if rng.random() < nan_rate:
+                    row[col] = ""
+            writer.writerow(row)
+
+
+def generate_dataset_dir(out_dir: str, courses: int, rows: int, seed: int = 7) -> t.List[str]:
+    """Write `courses` CSVs of `rows` rows each into out_dir; returns the filenames."""
+    os.makedirs(out_dir, exist_ok=True)
+    filenames = []
+    for i, slug in enumerate(course_slugs(courses, seed)):
+        filename = f"{slug}_learning.csv"
+        generate_course_csv(os.path.join(out_dir, filename), rows, seed=seed + i)
+        filenames.append(filename)
+    return filenames
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--courses", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    files = generate_dataset_dir(args.out, args.courses, args.rows, args.seed)
+    print(f"✅ Wrote {len(files)} datasets x {args.rows} rows to {args.out}")
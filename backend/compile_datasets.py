@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Compile every course CSV in the datasets directory into a single memory-mappable
+pack (see dataset_pack.py). Run this from the backend directory after adding or
+editing datasets; the backend falls back to the CSV for any entry that is stale.
+
+    python compile_datasets.py [--dataset-dir DIR] [--output PATH] [--check]
+"""
+
+import argparse
+import os
+import sys
+
+from dataset_cache import file_signature
+from dataset_pack import DatasetPack, PackError, compile_pack
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def check_pack(dataset_dir: str, output: str) -> int:
+    pack = DatasetPack.open_if_exists(output)
+    if pack is None:
+        print(f"❌ No readable pack at {output}")
+        return 1
+    csvs = sorted(f for f in os.listdir(dataset_dir) if f.lower().endswith(".csv"))
+    stale = [f for f in csvs if not pack.is_fresh(os.path.join(dataset_dir, f), file_signature(os.path.join(dataset_dir, f)))]
+    corrupt = []
+    for f in csvs:
+        if f not in stale:
+            try:
+                pack.verify(os.path.join(dataset_dir, f))
+            except PackError:
+                corrupt.append(f)
+    extra = sorted(set(pack.manifest["entries"]) - set(csvs))
+    for f in stale:
+        print(f"❌ Stale or missing: {f}")
+    for f in corrupt:
+        print(f"❌ Checksum mismatch: {f}")
+    for f in extra:
+        print(f"⚠️  Compiled but no longer present: {f}")
+    if stale or corrupt:
+        return 1
+    print(f"✅ {output} is up to date ({len(csvs)} datasets)")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset-dir", default=os.getenv("DATASET_DIR", os.path.join(BASE_DIR, "datasets")))
+    parser.add_argument("--output", default=os.getenv("DATASET_PACK_PATH", os.path.join(BASE_DIR, "datasets.pack")))
+    parser.add_argument("--check", action="store_true", help="only report whether the existing pack is stale or corrupt")
+    args = parser.parse_args()
+
+    if args.check:
+        return check_pack(args.dataset_dir, args.output)
+
+    manifest = compile_pack(args.dataset_dir, args.output)
+    for filename, meta in manifest["entries"].items():
+        print(f"  {filename}: {meta['records']} records")
+    print(f"✅ Wrote {args.output} ({len(manifest['entries'])} datasets, {manifest['payload_size']} payload bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# backend/course_ranker.py
+"""
+Vectorized course recommendations for batches of learning-style assessments.
+
+Every course dataset is summarised as a feature row (difficulty mix, breadth,
+module count, share of topics with code). Features are standardized across
+the catalogue and projected once through STYLE_AFFINITY into a
+(styles x courses) score matrix, so ranking a batch is a single
+(users x styles) @ (styles x courses) product plus a partial sort per row.
+
+Rankers are immutable and swapped by reference after each dataset snapshot,
+like the search index. Per-file features are cached by signature.
+"""
+import threading
+import time
+import typing as t
+import logging
+
+import numpy as np
+
+from course_resolver import course_key
+from metrics import observe_span
+
+logger = logging.getLogger("hiredai.course_ranker")
+
+STYLES = ("Short", "Elaborate", "Realistic")
+FEATURES = ("beginner", "intermediate", "advanced", "topics", "modules", "hands_on")
+# How much each learning style favours a course that is above the catalogue average on a feature
+STYLE_AFFINITY = np.array([
+    # beginner intermediate advanced topics modules hands_on
+    [1.0, 0.5, -0.5, -1.0, -0.5, 0.25],  # Short: compact, approachable courses
+    [0.25, 0.75, 0.25, 1.0, 1.0, 0.0],   # Elaborate: broad, in-depth courses
+    [-0.5, 0.5, 1.0, 0.0, 0.0, 1.0],     # Realistic: advanced, hands-on courses
+], dtype=np.float64)
+
+
+def course_features(records: t.List[dict]) -> np.ndarray:
+    """Raw feature row for one course dataset; topics and modules are log counts."""
+    n = len(records)
+    if not n:
+        return np.zeros(len(FEATURES))
+    difficulty = [str(r.get("difficulty") or "").strip().lower() for r in records]
+    modules = {str(r.get("module_name") or r.get("module_id") or "") for r in records}
+    hands_on = sum(1 for r in records if str(r.get("code_example") or "").strip())
+    return np.array([
+        difficulty.count("beginner") / n,
+        difficulty.count("intermediate") / n,
+        difficulty.count("advanced") / n,
+        np.log1p(n),
+        np.log1p(len(modules)),
+        hands_on / n,
+    ])
+
+
+def style_weights(scores: t.Sequence[t.Sequence[float]], dominant: t.Sequence[str]) -> np.ndarray:
+    """Row-normalized (users x styles) weights; users without scores fall back to their dominant style."""
+    scores = np.clip(np.asarray(scores, dtype=np.float64).reshape(-1, len(STYLES)), 0, None)
+    totals = scores.sum(axis=1, keepdims=True)
+    weights = np.divide(scores, totals, out=np.zeros_like(scores), where=totals > 0)
+    for i in np.flatnonzero(totals[:, 0] == 0):
+        if dominant[i] in STYLES:
+            weights[i, STYLES.index(dominant[i])] = 1.0
+    return weights
+
+
+class CourseRanker:
+    """Immutable (styles x courses) score matrix for one dataset snapshot."""
+
+    def __init__(self, courses: t.List[str], filenames: t.List[str], features: np.ndarray, version: int = 0):
+        self.version = version
+        self.courses = courses
+        self.filenames = filenames
+        self.features = features
+        if len(courses):
+            std = features.std(axis=0)
+            standardized = (features - features.mean(axis=0)) / np.where(std > 0, std, 1.0)
+        else:
+            standardized = np.zeros((0, len(FEATURES)))
+        self.style_scores = STYLE_AFFINITY @ standardized.T
+        self._course_names = np.array(courses, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def rank(self, weights: np.ndarray, top_k: int) -> t.Tuple[np.ndarray, np.ndarray]:
+        """Top top_k course indices per user, best first, and their scores."""
+        scores = weights @ self.style_scores
+        k = min(top_k, len(self.courses))
+        rows = np.arange(len(weights))[:, None]
+        if k < len(self.courses):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            # back in course order, so the stable sort below breaks ties alphabetically
+            top.sort(axis=1)
+        else:
+            top = np.broadcast_to(np.arange(k), scores.shape)
+        top = top[rows, np.argsort(-scores[rows, top], axis=1, kind="stable")]
+        return top, scores[rows, top]
+
+    def recommend(self, scores: t.Sequence[t.Sequence[float]], dominant: t.Sequence[str], top_k: int) -> t.Tuple[t.List[t.List[str]], t.List[t.List[float]]]:
+        """Course keys and rounded scores per user, for (users x STYLES) raw assessment scores."""
+        # assessment scores are small integers, so cohorts repeat the same weights a lot:
+        # rank each distinct row once and share its lists
+        weights, inverse = np.unique(style_weights(scores, dominant), axis=0, return_inverse=True)
+        top, top_scores = self.rank(weights, top_k)
+        names, rounded = self._course_names[top].tolist(), np.round(top_scores, 4).tolist()
+        inverse = inverse.ravel().tolist()
+        return [names[i] for i in inverse], [rounded[i] for i in inverse]
+
+
+class CourseRankerBuilder:
+    """Rebuilds the CourseRanker from dataset snapshots; ``current`` is swapped atomically.
+
+    load_records(snapshot, filename) returns the full (Elaborate) records of a course dataset.
+    """
+
+    def __init__(self, load_records: t.Callable[[t.Any, str], t.List[dict]]):
+        self.load_records = load_records
+        self.current = CourseRanker([], [], np.zeros((0, len(FEATURES))))
+        self._features: t.Dict[str, t.Tuple[t.Tuple[int, int], np.ndarray]] = {}
+        self._built_from: t.Optional[int] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.last_build_ms: t.Optional[float] = None
+
+    def refresh(self, snapshot) -> CourseRanker:
+        """Rebuild if the snapshot changed since the last build."""
+        with self._lock:
+            if self._built_from == snapshot.version:
+                return self.current
+            start = time.perf_counter()
+            features: t.Dict[str, t.Tuple[t.Tuple[int, int], np.ndarray]] = {}
+            for filename, signature in snapshot.signatures.items():
+                cached = self._features.get(filename)
+                if cached is None or cached[0] != signature:
+                    try:
+                        cached = (signature, course_features(self.load_records(snapshot, filename)))
+                    except Exception as e:
+                        logger.warning("Not ranking %s: %s", filename, e)
+                        continue
+                features[filename] = cached
+
+            filenames = sorted(features, key=course_key)
+            matrix = np.array([features[f][1] for f in filenames]).reshape(len(filenames), len(FEATURES))
+            ranker = CourseRanker([course_key(f) for f in filenames], filenames, matrix, version=self.current.version + 1)
+            self._features = features
+            self._built_from = snapshot.version
+            self.current = ranker
+            duration = time.perf_counter() - start
+            self.builds += 1
+            self.last_build_ms = round(duration * 1000, 1)
+            observe_span("course_ranker_build", duration)
+            logger.info("Course ranker v%d: %d courses in %.1fms", ranker.version, len(ranker), duration * 1000)
+            return ranker
+
+    def stats(self) -> dict:
+        ranker = self.current
+        return {
+            "version": ranker.version,
+            "courses": len(ranker),
+            "builds": self.builds,
+            "last_build_ms": self.last_build_ms,
+        }
@@ -0,0 +1,171 @@
+# backend/course_resolver.py
+"""
+Course-name -> dataset filename resolution.
+
+CourseResolver is built once per directory listing and answers lookups with the
+same tiers the original per-request scan used:
+
+1. exact candidate filenames (``<name>_learning.csv``, ``<name>.csv``, ...)
+2. every input token contained in the file's basename
+3. difflib close match (cutoff 0.55)
+4. any input token contained in the basename
+
+Tiers 2 and 4 are substring tests, so they are served from an n-gram index
+(all 1-, 2- and 3-grams of each basename); tier 3 is the same difflib pass over
+every basename.
+"""
+import difflib
+import os
+import typing as t
+import urllib.parse
+import logging
+
+logger = logging.getLogger("hiredai.course_resolver")
+
+_NGRAM = 3
+_MISSING = object()
+
+
+def normalize_text_for_match(s: str) -> str:
+    if s is None:
+        return ""
+    s = s.strip().lower()
+    for ch in ("-", "_", ".", "/"):
+        s = s.replace(ch, " ")
+    s = " ".join(s.split())
+    return s
+
+
+def tokens_from(s: str):
+    return [t for t in normalize_text_for_match(s).split(" ") if t]
+
+
+def candidate_filenames(norm_input: str) -> t.List[str]:
+    return [
+        f"{norm_input.replace(' ', '_')}_learning.csv",
+        f"{norm_input.replace(' ', '-')}_learning.csv",
+        f"{norm_input.replace(' ', '')}_learning.csv",
+        f"{norm_input}_learning.csv",
+        f"{norm_input.replace(' ', '_')}.csv",
+        f"{norm_input.replace(' ', '-')}.csv",
+        f"{norm_input}.csv",
+    ]
+
+
+def course_key(filename: str) -> str:
+    """Short course id of a dataset file: the stem without its _learning / _clean suffix."""
+    stem = os.path.splitext(filename)[0]
+    for suffix in ("_learning", "_clean"):
+        if stem.endswith(suffix):
+            return stem[:-len(suffix)]
+    return stem
+
+
+def _grams(s: str, n: int) -> t.Set[str]:
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+class CourseResolver:
+    """Immutable lookup structure over one listing of dataset CSV filenames."""
+
+    def __init__(self, files: t.Iterable[str], memo_size: int = 1024):
+        self.files = [f for f in files if f.lower().endswith(".csv")]
+        self.lower_map = {f.lower(): f for f in self.files}
+
+        basenames = {os.path.splitext(f)[0].lower(): f for f in self.files}
+        self._bases = list(basenames.keys())
+        self._base_files = list(basenames.values())
+
+        # n-gram -> sorted basename positions; grams up to _NGRAM long make
+        # substring tests for short tokens exact lookups
+        index: t.Dict[str, t.List[int]] = {}
+        for pos, base in enumerate(self._bases):
+            grams = set()
+            for n in range(1, _NGRAM + 1):
+                grams |= _grams(base, n)
+            for g in grams:
+                index.setdefault(g, []).append(pos)
+        self._ngram_index = {g: frozenset(p) for g, p in index.items()}
+
+        # lookups never lock: single dict operations are atomic, and a full memo is
+        # simply cleared (results are deterministic, so a racing clear only costs a recompute)
+        self._memo: t.Dict[str, t.Optional[str]] = {}
+        self._memo_size = memo_size
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def _positions_containing(self, token: str) -> t.FrozenSet[int]:
+        if len(token) <= _NGRAM:
+            return self._ngram_index.get(token, frozenset())
+        postings = [self._ngram_index.get(g) for g in _grams(token, _NGRAM)]
+        if any(p is None for p in postings):
+            return frozenset()
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return frozenset(pos for pos in candidates if token in self._bases[pos])
+
+    def _fuzzy(self, norm_input: str) -> t.Optional[str]:
+        # every basename is scored: a name sharing no trigram with the input can still have the
+        # best ratio, and get_close_matches' quick-ratio filters already skip hopeless candidates
+        matches = difflib.get_close_matches(norm_input, self._bases, n=1, cutoff=0.55)
+        if matches:
+            return self._base_files[self._bases.index(matches[0])]
+        return None
+
+    def resolve(self, course_name: str) -> t.Optional[str]:
+        cached = self._memo.get(course_name, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        result = self._resolve_uncached(course_name)
+        if len(self._memo) >= self._memo_size:
+            self._memo.clear()
+        self._memo[course_name] = result
+        return result
+
+    def _resolve_uncached(self, course_name: str) -> t.Optional[str]:
+        if not self.files:
+            return None
+
+        try:
+            decoded = urllib.parse.unquote(course_name)
+        except Exception:
+            decoded = course_name
+        norm_input = normalize_text_for_match(decoded)
+
+        for cand in candidate_filenames(norm_input):
+            if cand in self.lower_map:
+                logger.debug("Matched candidate filename: %s -> %s", cand, self.lower_map[cand])
+                return self.lower_map[cand]
+
+        input_tokens = tokens_from(norm_input)
+        if input_tokens:
+            matched = None
+            for tok in input_tokens:
+                positions = self._positions_containing(tok)
+                matched = positions if matched is None else matched & positions
+                if not matched:
+                    break
+            if matched:
+                orig_filename = self._base_files[min(matched)]
+                logger.debug("Matched by token containment: input tokens %s -> %s", input_tokens, orig_filename)
+                return orig_filename
+
+        try:
+            fuzzy = self._fuzzy(norm_input)
+            if fuzzy:
+                logger.debug("Fuzzy matched '%s' -> '%s'", norm_input, fuzzy)
+                return fuzzy
+        except Exception as e:
+            logger.exception("Fuzzy matching error: %s", e)
+
+        any_match = set()
+        for tok in input_tokens:
+            any_match |= self._positions_containing(tok)
+        if any_match:
+            orig_filename = self._base_files[min(any_match)]
+            logger.debug("Lenient token match (any token) matched %s -> %s", input_tokens, orig_filename)
+            return orig_filename
+
+        return None
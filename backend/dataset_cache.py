@@ -0,0 +1,196 @@
+# backend/dataset_cache.py
+"""
+In-process cache for course datasets.
+
+Each course CSV is parsed once, and the Short / Elaborate / Realistic record
+lists served by /api/learning-path are precomputed at load time, so the hot
+path is a stat() plus a dict lookup. Entries are invalidated when the file's
+mtime or size changes and evicted LRU-first once the byte budget is exceeded.
+"""
+import hashlib
+import math
+import os
+import sys
+import threading
+import typing as t
+import logging
+from collections import OrderedDict
+
+from metrics import span
+
+logger = logging.getLogger("hiredai.dataset_cache")
+
+LEARNING_MODES = ("Short", "Elaborate", "Realistic")
+
+
+def replace_nan_with_none(obj):
+    if isinstance(obj, dict):
+        return {k: replace_nan_with_none(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [replace_nan_with_none(x) for x in obj]
+    if isinstance(obj, float) and math.isnan(obj):
+        return None
+    return obj
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_signature(path: str) -> t.Tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def build_mode_views(file_path: str) -> t.Dict[str, t.List[dict]]:
+    """Parse a course CSV and return the record list for every learning mode."""
+    import pandas as pd
+
+    with span("dataset_csv_parse"):
+        df = pd.read_csv(file_path, encoding="utf-8", on_bad_lines="skip")
+        df = df.where(pd.notnull(df), None)
+
+    short_df = df.sample(frac=0.5, random_state=42) if len(df) > 1 else df
+    realistic_df = df
+    if "difficulty" in df.columns:
+        realistic_df = df[df["difficulty"].isin(["Intermediate", "Advanced"])]
+        if len(realistic_df) == 0:
+            logger.info("No Intermediate/Advanced found for Realistic mode in %s; using full dataset", file_path)
+            realistic_df = df
+
+    with span("records_build"):
+        return {
+            "Short": replace_nan_with_none(short_df.to_dict(orient="records")),
+            "Elaborate": replace_nan_with_none(df.to_dict(orient="records")),
+            "Realistic": replace_nan_with_none(realistic_df.to_dict(orient="records")),
+        }
+
+
+def estimate_records_size(records: t.List[dict]) -> int:
+    total = sys.getsizeof(records)
+    for rec in records:
+        total += sys.getsizeof(rec)
+        for v in rec.values():
+            total += sys.getsizeof(v)
+    return total
+
+
+class DatasetEntry(t.NamedTuple):
+    path: str
+    signature: t.Tuple[int, int]
+    views: t.Dict[str, t.List[dict]]
+    nbytes: int
+    # sha256 of the source file; response ETags are derived from it
+    sha256: str
+
+
+class DatasetCache:
+    """Thread-safe LRU of parsed datasets keyed by absolute file path."""
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024, pack=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # optional compiled DatasetPack; fresh entries are decoded from it instead of parsing the CSV
+        self.pack = pack
+        self._entries: "OrderedDict[str, DatasetEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pack_loads = 0
+        self.csv_loads = 0
+
+    def get(self, file_path: str) -> DatasetEntry:
+        """Return the cached entry for file_path, (re)loading it if the file changed.
+
+        Raises FileNotFoundError if the file is gone.
+        """
+        signature = file_signature(file_path)
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(file_path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        loaded = self._load_from_pack(file_path, signature)
+        if loaded is None:
+            views, sha256 = build_mode_views(file_path), sha256_file(file_path)
+            self.csv_loads += 1
+        else:
+            views, sha256 = loaded
+            self.pack_loads += 1
+        nbytes = sum(estimate_records_size(v) for v in views.values())
+        entry = DatasetEntry(file_path, signature, views, nbytes, sha256)
+        logger.info("Loaded dataset %s (%d records, ~%d bytes)", file_path, len(views["Elaborate"]), nbytes)
+
+        with self._lock:
+            self._discard(file_path)
+            if nbytes > self.max_bytes:
+                logger.warning("Dataset %s exceeds cache budget (%d > %d bytes); not caching", file_path, nbytes, self.max_bytes)
+                return entry
+            self._entries[file_path] = entry
+            self._bytes += nbytes
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                evicted_path, _ = next(iter(self._entries.items()))
+                self._discard(evicted_path)
+                self.evictions += 1
+                logger.info("Evicted dataset %s from cache", evicted_path)
+        return entry
+
+    def _load_from_pack(self, file_path: str, signature: t.Tuple[int, int]) -> t.Optional[t.Tuple[t.Dict[str, t.List[dict]], str]]:
+        pack = self.pack
+        if pack is None:
+            return None
+        try:
+            if not pack.is_fresh(file_path, signature):
+                logger.info("Dataset pack entry for %s is missing or stale; reading CSV", file_path)
+                return None
+            with span("dataset_pack_decode"):
+                return pack.load_views(file_path), pack.source_sha256(file_path)
+        except Exception as e:
+            logger.warning("Could not load %s from dataset pack (%s); reading CSV", file_path, e)
+            return None
+
+    def record_hit(self) -> None:
+        """Count a lookup served without calling get(), e.g. from a dataset snapshot's entries."""
+        with self._lock:
+            self.hits += 1
+
+    def get_view(self, file_path: str, mode: str) -> t.List[dict]:
+        return self.get(file_path).views[mode]
+
+    def discard(self, file_path: str) -> None:
+        with self._lock:
+            self._discard(file_path)
+
+    def _discard(self, file_path: str) -> None:
+        old = self._entries.pop(file_path, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "pack_loads": self.pack_loads,
+                "csv_loads": self.csv_loads,
+                "pack": self.pack.path if self.pack is not None else None,
+            }
@@ -0,0 +1,159 @@
+# backend/dataset_pack.py
+"""
+Compiled dataset pack: every course CSV's precomputed mode views in one
+offset-indexed file that the backend memory-maps at startup.
+
+Layout::
+
+    MAGIC (8 bytes) | manifest length (uint32 LE) | manifest JSON | payload
+
+The manifest maps each CSV filename to its source fingerprint (size, mtime_ns,
+sha256) and, per learning mode, an (offset, length, crc32) triple pointing at a
+UTF-8 JSON array of records in the payload. Entries whose source no longer
+matches the fingerprint are reported stale and the caller falls back to the CSV.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import typing as t
+import zlib
+import logging
+
+from dataset_cache import LEARNING_MODES, build_mode_views, sha256_file
+
+logger = logging.getLogger("hiredai.dataset_pack")
+
+MAGIC = b"HAIDPK01"
+PACK_VERSION = 1
+_HEADER = struct.Struct("<I")
+
+
+class PackError(Exception):
+    pass
+
+
+def encode_records(records: t.List[dict]) -> bytes:
+    return json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def compile_pack(dataset_dir: str, output_path: str) -> dict:
+    """Parse every CSV in dataset_dir and write the pack atomically. Returns the manifest."""
+    files = sorted(f for f in os.listdir(dataset_dir) if f.lower().endswith(".csv"))
+    entries = {}
+    blobs = []
+    offset = 0
+    for filename in files:
+        path = os.path.join(dataset_dir, filename)
+        st = os.stat(path)
+        views = build_mode_views(path)
+        view_index = {}
+        for mode in LEARNING_MODES:
+            blob = encode_records(views[mode])
+            view_index[mode] = [offset, len(blob), zlib.crc32(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+        entries[filename] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": sha256_file(path),
+            "records": len(views["Elaborate"]),
+            "views": view_index,
+        }
+
+    manifest = {"version": PACK_VERSION, "created": time.time(), "payload_size": offset, "entries": entries}
+    header = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+
+    tmp_path = f"{output_path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
+    return manifest
+
+
+class DatasetPack:
+    """Read-only, memory-mapped view over a compiled pack."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._mmap[:len(MAGIC)] != MAGIC:
+                raise PackError(f"{path} is not a dataset pack")
+            (header_len,) = _HEADER.unpack_from(self._mmap, len(MAGIC))
+            header_start = len(MAGIC) + _HEADER.size
+            self.manifest = json.loads(self._mmap[header_start:header_start + header_len])
+            if self.manifest.get("version") != PACK_VERSION:
+                raise PackError(f"Unsupported pack version {self.manifest.get('version')}")
+            self._payload_start = header_start + header_len
+            if len(self._mmap) != self._payload_start + self.manifest["payload_size"]:
+                raise PackError(f"{path} is truncated")
+        except Exception:
+            self._mmap.close()
+            raise
+        self._fresh: t.Dict[str, t.Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_if_exists(cls, path: str) -> t.Optional["DatasetPack"]:
+        if not os.path.isfile(path):
+            return None
+        try:
+            pack = cls(path)
+        except (OSError, ValueError, PackError) as e:
+            logger.warning("Ignoring unreadable dataset pack %s: %s", path, e)
+            return None
+        logger.info("Opened dataset pack %s (%d datasets)", path, len(pack.manifest["entries"]))
+        return pack
+
+    def is_fresh(self, file_path: str, signature: t.Tuple[int, int]) -> bool:
+        """True if the pack entry for file_path was compiled from the file as it is now."""
+        meta = self.manifest["entries"].get(os.path.basename(file_path))
+        if meta is None:
+            return False
+        mtime_ns, size = signature
+        if size != meta["size"]:
+            return False
+        if mtime_ns == meta["mtime_ns"]:
+            return True
+        # Same size but touched (checkout, copy): fall back to the content hash once per signature
+        with self._lock:
+            if self._fresh.get(file_path) == signature:
+                return True
+        if sha256_file(file_path) != meta["sha256"]:
+            return False
+        with self._lock:
+            self._fresh[file_path] = signature
+        return True
+
+    def source_sha256(self, file_path: str) -> str:
+        return self.manifest["entries"][os.path.basename(file_path)]["sha256"]
+
+    def _blobs(self, file_path: str) -> t.Iterator[t.Tuple[str, bytes]]:
+        meta = self.manifest["entries"][os.path.basename(file_path)]
+        for mode, (offset, length, crc) in meta["views"].items():
+            start = self._payload_start + offset
+            blob = self._mmap[start:start + length]
+            if zlib.crc32(blob) != crc:
+                raise PackError(f"Checksum mismatch for {file_path} ({mode}) in {self.path}")
+            yield mode, blob
+
+    def load_views(self, file_path: str) -> t.Dict[str, t.List[dict]]:
+        return {mode: json.loads(blob) for mode, blob in self._blobs(file_path)}
+
+    def verify(self, file_path: str) -> None:
+        """Raise PackError if any view of file_path fails its checksum."""
+        for _ in self._blobs(file_path):
+            pass
+
+    def close(self) -> None:
+        self._mmap.close()
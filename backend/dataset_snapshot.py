@@ -0,0 +1,267 @@
+# backend/dataset_snapshot.py
+"""
+Immutable snapshots of DATASET_DIR and a watcher that swaps in new ones.
+
+A DatasetSnapshot bundles one listing of the course CSVs: the resolver, the
+file signatures it was built from and the parsed entries that fit the cache budget.
+Request handlers read ``store.current`` once and use only that object, so they
+never take a lock and never see a resolver and entries from different
+listings. Rebuilds happen on the watcher thread (watchfiles when installed,
+polling otherwise) and publish by replacing a single reference.
+
+Files whose size or mtime is still moving are left out of a rebuild (or keep
+their previous entry) and retried once they settle, so a CSV that is being
+copied in is never parsed half-written.
+"""
+import os
+import threading
+import time
+import types
+import typing as t
+import logging
+from collections import deque
+
+from course_resolver import CourseResolver
+from dataset_cache import DatasetCache, DatasetEntry, file_signature
+from metrics import observe_span
+
+try:
+    import watchfiles
+except ImportError:  # optional: polling is used without it
+    watchfiles = None
+
+logger = logging.getLogger("hiredai.dataset_snapshot")
+
+
+class DatasetSnapshot(t.NamedTuple):
+    version: int
+    resolver: CourseResolver
+    # every CSV in the listing -> (mtime_ns, size) it was built from
+    signatures: t.Mapping[str, t.Tuple[int, int]]
+    # filename -> parsed entry, for the datasets that fit the cache budget
+    entries: t.Mapping[str, DatasetEntry]
+    created: float
+
+
+def _scan(dataset_dir: str) -> t.Dict[str, t.Tuple[int, int]]:
+    try:
+        files = sorted(os.listdir(dataset_dir))
+    except FileNotFoundError:
+        return {}
+    signatures = {}
+    for f in files:
+        if f.lower().endswith(".csv"):
+            try:
+                signatures[f] = file_signature(os.path.join(dataset_dir, f))
+            except FileNotFoundError:
+                pass
+    return signatures
+
+
+class SnapshotStore:
+    def __init__(self, dataset_dir: str, cache: DatasetCache, settle_seconds: float = 0.5, history: int = 20):
+        self.dataset_dir = dataset_dir
+        self.cache = cache
+        self.settle_seconds = settle_seconds
+        self._rebuild_lock = threading.Lock()
+        self.reloads = 0
+        self.reload_errors = 0
+        self.pending: t.FrozenSet[str] = frozenset()
+        self.events: "deque[dict]" = deque(maxlen=history)
+        self._listeners: t.List[t.Callable[[DatasetSnapshot], t.Any]] = []
+        # listing only; datasets are parsed by the first reload() (warm-up)
+        signatures = _scan(dataset_dir)
+        self.current = DatasetSnapshot(0, CourseResolver(signatures), types.MappingProxyType(signatures),
+                                       types.MappingProxyType({}), time.time())
+
+    def add_listener(self, callback: t.Callable[[DatasetSnapshot], t.Any]) -> None:
+        """Call callback(snapshot) on the rebuilding thread after every published reload."""
+        self._listeners.append(callback)
+
+    def changed(self) -> bool:
+        """True if the directory no longer matches the current snapshot (or files are still settling)."""
+        return bool(self.pending) or _scan(self.dataset_dir) != dict(self.current.signatures)
+
+    def reload(self, reason: str = "change", notify: bool = True) -> DatasetSnapshot:
+        """Build a snapshot from the directory as it is now and publish it. Serialized; never blocks readers."""
+        with self._rebuild_lock:
+            start = time.perf_counter()
+            previous = self.current
+            try:
+                snapshot, event = self._build(previous)
+            except Exception as e:
+                self.reload_errors += 1
+                logger.exception("Dataset reload (%s) failed; keeping snapshot v%d", reason, previous.version)
+                self.events.append({"version": previous.version, "reason": reason, "at": time.time(), "error": str(e)})
+                return previous
+            duration = time.perf_counter() - start
+            if not (event["added"] or event["removed"] or event["changed"]) and snapshot.entries.keys() == previous.entries.keys():
+                # nothing to publish yet (e.g. only files that are still being written)
+                logger.debug("Dataset reload (%s): no settled changes; %d files settling", reason, len(event["pending"]))
+                return previous
+            self.current = snapshot
+            self.reloads += 1
+            observe_span("dataset_reload", duration)
+            event.update({"version": snapshot.version, "reason": reason, "at": snapshot.created, "duration_ms": round(duration * 1000, 1)})
+            self.events.append(event)
+            logger.info(
+                "Dataset snapshot v%d (%s) in %.1fms: %d files, %d loaded, +%d -%d ~%d, %d settling",
+                snapshot.version, reason, duration * 1000, len(snapshot.signatures), len(snapshot.entries),
+                len(event["added"]), len(event["removed"]), len(event["changed"]), len(event["pending"]),
+            )
+            if notify:
+                for callback in self._listeners:
+                    try:
+                        callback(snapshot)
+                    except Exception:
+                        logger.exception("Dataset snapshot listener %r failed", callback)
+            return snapshot
+
+    def _build(self, previous: DatasetSnapshot) -> t.Tuple[DatasetSnapshot, dict]:
+        signatures = _scan(self.dataset_dir)
+        moving = [f for f, sig in signatures.items() if previous.signatures.get(f) != sig]
+        unsettled: t.Set[str] = set()
+        if moving and self.settle_seconds > 0:
+            time.sleep(self.settle_seconds)
+            for f in moving:
+                try:
+                    if file_signature(os.path.join(self.dataset_dir, f)) != signatures[f]:
+                        unsettled.add(f)
+                except FileNotFoundError:
+                    unsettled.add(f)
+
+        entries: t.Dict[str, DatasetEntry] = {}
+        kept_signatures: t.Dict[str, t.Tuple[int, int]] = {}
+        budget_bytes = 0
+        for f, sig in signatures.items():
+            if f in unsettled:
+                # still being written: keep serving the old version, if there is one
+                if f in previous.signatures:
+                    kept_signatures[f] = previous.signatures[f]
+                    if f in previous.entries:
+                        entries[f] = previous.entries[f]
+                continue
+            kept_signatures[f] = sig
+            old = previous.entries.get(f)
+            if old is not None and old.signature == sig:
+                entry = old
+            elif len(entries) < self.cache.max_entries and budget_bytes < self.cache.max_bytes:
+                try:
+                    entry = self.cache.get(os.path.join(self.dataset_dir, f))
+                except Exception as e:
+                    # served lazily (and the error reported) by the request that needs it
+                    logger.warning("Could not load %s into snapshot: %s", f, e)
+                    continue
+            else:
+                continue
+            entries[f] = entry
+            budget_bytes += entry.nbytes
+
+        for f in set(previous.signatures) - set(signatures):
+            self.cache.discard(os.path.join(self.dataset_dir, f))
+
+        same_files = kept_signatures.keys() == previous.signatures.keys()
+        resolver = previous.resolver if same_files else CourseResolver(kept_signatures)
+        self.pending = frozenset(unsettled)
+        snapshot = DatasetSnapshot(
+            previous.version + 1, resolver, types.MappingProxyType(kept_signatures),
+            types.MappingProxyType(entries), time.time(),
+        )
+        event = {
+            "added": sorted(set(kept_signatures) - set(previous.signatures)),
+            "removed": sorted(set(previous.signatures) - set(kept_signatures)),
+            "changed": sorted(f for f in kept_signatures if f in previous.signatures and kept_signatures[f] != previous.signatures[f]),
+            "pending": sorted(unsettled),
+        }
+        return snapshot, event
+
+    def stats(self) -> dict:
+        snapshot = self.current
+        return {
+            "version": snapshot.version,
+            "files": len(snapshot.signatures),
+            "loaded": len(snapshot.entries),
+            "pending": sorted(self.pending),
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "last_reload": self.events[-1] if self.events else None,
+        }
+
+
+class DatasetWatcher:
+    """Background thread that calls store.reload() whenever DATASET_DIR changes.
+
+    mode is "auto" (watchfiles if installed, else polling), "watch" or "poll".
+    """
+
+    def __init__(self, store: SnapshotStore, mode: str = "auto", poll_interval: float = 2.0):
+        self.store = store
+        self.mode = "poll" if mode == "poll" or watchfiles is None else "watch"
+        if mode == "watch" and watchfiles is None:
+            logger.warning("watchfiles is not installed; polling %s instead", store.dataset_dir)
+        self.poll_interval = poll_interval
+        self._hooks: t.List[t.Callable[[], t.Any]] = []
+        self._stop = threading.Event()
+        self._thread: t.Optional[threading.Thread] = None
+
+    def add_hook(self, callback: t.Callable[[], t.Any]) -> None:
+        """Also call callback() on the watcher thread every poll interval (for files outside DATASET_DIR)."""
+        self._hooks.append(callback)
+
+    def _run_hooks(self) -> None:
+        for callback in self._hooks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Dataset watcher hook %r failed", callback)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Watching %s for dataset changes (%s)", self.store.dataset_dir, self.mode)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _reload_until_settled(self, reason: str) -> None:
+        self.store.reload(reason)
+        while self.store.pending and not self._stop.wait(self.store.settle_seconds):
+            self.store.reload("settle")
+
+    def _run(self) -> None:
+        # catch anything that changed between the last snapshot and now
+        if self.store.changed():
+            self._reload_until_settled("startup")
+        if self.mode == "watch":
+            try:
+                self._watch()
+                return
+            except Exception:
+                logger.exception("watchfiles failed on %s; falling back to polling", self.store.dataset_dir)
+                self.mode = "poll"
+        self._poll()
+
+    def _watch(self) -> None:
+        for changes in watchfiles.watch(
+            self.store.dataset_dir, stop_event=self._stop, recursive=False,
+            watch_filter=lambda _change, path: path.lower().endswith(".csv"),
+            rust_timeout=int(self.poll_interval * 1000), yield_on_timeout=True,
+        ):
+            if changes or self.store.pending:
+                self._reload_until_settled("watch")
+            self._run_hooks()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                if self.store.changed():
+                    self._reload_until_settled("poll")
+            except Exception:
+                logger.exception("Polling %s failed", self.store.dataset_dir)
+            self._run_hooks()
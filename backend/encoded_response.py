@@ -0,0 +1,151 @@
+# backend/encoded_response.py
+"""
+Pre-encoded JSON response bodies with strong ETags and cached compression.
+
+An EncodedBody holds the serialized bytes of a response once; gzip and brotli
+variants are produced on first request for that encoding and kept. Handlers
+answer If-None-Match with 304 and pick the variant from Accept-Encoding.
+Bodies built for a single response (transient=True, e.g. /api/health) are
+compressed at the fastest level instead, since the work is never reused.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import typing as t
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip is offered without it
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed; the framing costs more than it saves
+MIN_COMPRESS_SIZE = 512
+# (gzip level, brotli quality): maximum for cached bodies, fastest for transient ones
+COMPRESS_LEVELS = {False: (9, 11), True: (1, 1)}
+
+
+def encode_json(obj) -> bytes:
+    # same encoding FastAPI's JSONResponse uses, so clients see identical bytes
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return f'"{h.hexdigest()[:32]}"'
+
+
+class EncodedBody:
+    __slots__ = ("body", "etag", "media_type", "transient", "_variants")
+
+    def __init__(self, body: bytes, etag: t.Optional[str] = None, media_type: str = "application/json", transient: bool = False):
+        self.body = body
+        self.etag = etag or make_etag(hashlib.sha256(body).hexdigest())
+        self.media_type = media_type
+        self.transient = transient
+        self._variants: t.Dict[str, bytes] = {}
+
+    @classmethod
+    def from_obj(cls, obj, etag: t.Optional[str] = None, transient: bool = False) -> "EncodedBody":
+        return cls(encode_json(obj), etag, transient=transient)
+
+    def variant(self, encoding: str) -> bytes:
+        data = self._variants.get(encoding)
+        if data is None:
+            gzip_level, brotli_quality = COMPRESS_LEVELS[self.transient]
+            if encoding == "br":
+                data = brotli.compress(self.body, quality=brotli_quality)
+            else:
+                data = gzip.compress(self.body, compresslevel=gzip_level, mtime=0)
+            self._variants[encoding] = data
+        return data
+
+
+def choose_encoding(accept_encoding: str) -> t.Optional[str]:
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            offered[name] = q
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    base = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        # encoded variants carry a "-gzip"/"-br" suffix but are the same resource
+        if candidate == base or candidate.rsplit("-", 1)[0] == base:
+            return True
+    return False
+
+
+def conditional_response(request: Request, encoded: EncodedBody, headers: t.Optional[t.Dict[str, str]] = None) -> Response:
+    """Serve encoded as-is, 304 if the client already has it, compressed if it asks for that."""
+    out_headers = {"Vary": "Accept-Encoding", **(headers or {})}
+    if_none_match = request.headers.get("if-none-match")
+    encoding = None
+    if len(encoded.body) >= MIN_COMPRESS_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    etag = encoded.etag if encoding is None else f'{encoded.etag[:-1]}-{encoding}"'
+    out_headers["ETag"] = etag
+
+    if if_none_match and etag_matches(if_none_match, encoded.etag):
+        return Response(status_code=304, headers=out_headers)
+    if encoding is None:
+        return Response(content=encoded.body, media_type=encoded.media_type, headers=out_headers)
+    out_headers["Content-Encoding"] = encoding
+    return Response(content=encoded.variant(encoding), media_type=encoded.media_type, headers=out_headers)
+
+
+class EncodedBodyCache:
+    """Small LRU of EncodedBody objects; keys must include whatever the bytes depend on."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[t.Hashable, EncodedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: t.Hashable, build: t.Callable[[], EncodedBody]) -> EncodedBody:
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return encoded
+            self.misses += 1
+        encoded = build()
+        with self._lock:
+            self._entries[key] = encoded
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return encoded
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
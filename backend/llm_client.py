@@ -0,0 +1,214 @@
+# backend/llm_client.py
+"""
+Async OpenAI chat-completions client.
+
+One pooled httpx.AsyncClient is shared by every request; a semaphore caps the
+number of upstream calls in flight and callers beyond the cap queue on it.
+Timeouts, 429 and 5xx responses are retried with full-jitter exponential
+backoff (honouring Retry-After when the upstream sends one).
+"""
+import asyncio
+import json
+import random
+import time
+import typing as t
+import logging
+
+import httpx
+
+from metrics import observe_span, span
+
+logger = logging.getLogger("hiredai.llm_client")
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    pass
+
+
+class AsyncOpenAIClient:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.openai.com/v1",
+        model: str = "gpt-3.5-turbo",
+        max_concurrency: int = 16,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._http: t.Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.queued = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            # (re)created lazily so the pool and semaphore bind to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)),
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _backoff(self, attempt: int, retry_after: t.Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def build_payload(self, messages: t.List[dict], max_tokens: int, temperature: float, **extra) -> dict:
+        return {"model": self.model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature, "n": 1, **extra}
+
+    async def chat(self, messages: t.List[dict], max_tokens: int = 200, temperature: float = 0.6) -> str:
+        """Return the content of the first choice, retrying transient upstream failures."""
+        payload = self.build_payload(messages, max_tokens, temperature)
+        client = self._client()
+        semaphore = self._semaphore
+        self.queued += 1
+        try:
+            with span("openai_queue_wait"):
+                await semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        self.requests += 1
+        try:
+            with span("openai_call"):
+                return await self._chat_with_retries(client, payload)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    async def stream_chat(self, messages: t.List[dict], max_tokens: int = 200, temperature: float = 0.6) -> t.AsyncIterator[str]:
+        """Yield content deltas as the upstream streams them.
+
+        Connection failures and retryable statuses are retried only until the
+        first delta arrives; closing the generator closes the upstream response.
+        """
+        payload = self.build_payload(messages, max_tokens, temperature, stream=True)
+        client = self._client()
+        semaphore = self._semaphore
+        self.queued += 1
+        try:
+            with span("openai_queue_wait"):
+                await semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        self.requests += 1
+        stream_start = time.perf_counter()
+        try:
+            attempt = 0
+            started = False
+            while True:
+                retry_after = None
+                try:
+                    async with client.stream("POST", "/chat/completions", json=payload) as response:
+                        if response.status_code < 400:
+                            async for delta in _iter_sse_deltas(response):
+                                if not started:
+                                    observe_span("openai_stream_first_delta", time.perf_counter() - stream_start)
+                                started = True
+                                yield delta
+                            return
+                        await response.aread()
+                        if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                            raise LLMError(f"upstream returned {response.status_code}: {response.text[:200]}")
+                        error = f"HTTP {response.status_code}"
+                        retry_after = response.headers.get("retry-after")
+                except (httpx.TimeoutException, httpx.TransportError) as e:
+                    if started or attempt >= self.max_retries:
+                        raise LLMError(f"upstream request failed: {e!r}") from e
+                    error = repr(e)
+                delay = self._backoff(attempt, retry_after)
+                attempt += 1
+                self.retries += 1
+                logger.warning("OpenAI stream failed (%s); retry %d/%d in %.2fs", error, attempt, self.max_retries, delay)
+                await asyncio.sleep(delay)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            observe_span("openai_stream", time.perf_counter() - stream_start)
+            self.in_flight -= 1
+            semaphore.release()
+
+    async def _chat_with_retries(self, client: httpx.AsyncClient, payload: dict) -> str:
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            retry_after = None
+            try:
+                response = await client.post("/chat/completions", json=payload)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                if attempt >= self.max_retries:
+                    raise LLMError(f"upstream request failed: {e!r}") from e
+                error = repr(e)
+            else:
+                if response.status_code < 400:
+                    data = response.json()
+                    return data["choices"][0]["message"]["content"]
+                if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                    raise LLMError(f"upstream returned {response.status_code}: {response.text[:200]}")
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("retry-after")
+
+            delay = self._backoff(attempt, retry_after)
+            attempt += 1
+            self.retries += 1
+            logger.warning(
+                "OpenAI call failed after %.0fms (%s); retry %d/%d in %.2fs",
+                (time.monotonic() - start) * 1000, error, attempt, self.max_retries, delay,
+            )
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+async def _iter_sse_deltas(response: httpx.Response) -> t.AsyncIterator[str]:
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        chunk = json.loads(data)
+        for choice in chunk.get("choices", []):
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
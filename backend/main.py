@@ -1,36 +1,72 @@
 # backend/main.py
+import asyncio
+import json
 import os
-import math
 import typing as t
-import difflib
-import urllib.parse
 from pathlib import Path
 import logging
 import time
-import re
-from fastapi.responses import Response
+
+# first, so the startup clock covers the imports below
+from startup import STARTUP
 
 from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
-import openai
 from dotenv import load_dotenv
 
+from course_ranker import STYLES, CourseRankerBuilder
+from course_resolver import CourseResolver, normalize_text_for_match
+from dataset_cache import DatasetCache, DatasetEntry, file_signature
+from dataset_pack import DatasetPack, compile_pack
+from dataset_snapshot import DatasetSnapshot, DatasetWatcher, SnapshotStore
+from encoded_response import EncodedBody, EncodedBodyCache, conditional_response, make_etag
+from llm_client import AsyncOpenAIClient
+from metrics import register_callback, render_latest, span
+from middleware import AccessLogMiddleware, CORSMiddleware, MetricsMiddleware, start_async_access_log, stop_async_access_log
+from response_cache import ResponseCache
+from search_index import SOURCES, SearchIndexer
+from static_assets import AssetServer
+
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger("hiredai")
 logger.info("Loaded backend from file: %s", __file__)
+STARTUP.mark("imports")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+llm_client: t.Optional[AsyncOpenAIClient] = None
 if OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
+    llm_client = AsyncOpenAIClient(
+        api_key=OPENAI_API_KEY,
+        base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1"),
+        model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+        max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "16")),
+        timeout=float(os.getenv("OPENAI_TIMEOUT", "30")),
+        max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "3")),
+    )
+
+# Generated answers, keyed on (prompt, max_tokens, temperature, model); set LLM_CACHE_DB to persist them
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+    db_path=os.getenv("LLM_CACHE_DB") or None,
+    max_temperature=float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.7")),
+    cache_high_temperature=os.getenv("LLM_CACHE_HIGH_TEMPERATURE", "").lower() in ("1", "true", "yes"),
+    max_disk_entries=int(os.getenv("LLM_CACHE_DB_MAX_ENTRIES", "100000")),
+    prune_interval=float(os.getenv("LLM_CACHE_DB_PRUNE_INTERVAL", "60")),
+)
 
 app = FastAPI(title="HiredAI Backend (final corrected)")
 
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    if llm_client is not None:
+        await llm_client.aclose()
+
 _allowed = os.getenv("FRONTEND_ORIGINS", "")
 if _allowed:
     FRONTEND_ORIGINS = [s.strip() for s in _allowed.split(",") if s.strip()]
@@ -49,65 +85,105 @@ ALLOW_ORIGIN_REGEX = r"^https://([A-Za-z0-9-]+\.)?vercel\.app$"
 logger.info("Allowed CORS origin regex: %s", ALLOW_ORIGIN_REGEX)
 
 
+# Pure ASGI middleware; the last one added runs outermost
 app.add_middleware(
     CORSMiddleware,
     allow_origins=FRONTEND_ORIGINS,
-     allow_origin_regex=ALLOW_ORIGIN_REGEX,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origin_regex=ALLOW_ORIGIN_REGEX,
+    max_age=int(os.getenv("CORS_MAX_AGE", "600")),
+)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0")),
+    slow_ms=float(os.getenv("ACCESS_LOG_SLOW_MS", "1000")),
 )
 
 
-# --- safe preflight OPTIONS handler ---
-_origin_re = re.compile(ALLOW_ORIGIN_REGEX)
+@app.on_event("startup")
+async def start_access_log():
+    start_async_access_log()
 
-@app.options("/{rest_of_path:path}", include_in_schema=False)
-async def preflight_handler(rest_of_path: str, request: Request):
-    """
-    Handles automatic preflight OPTIONS requests for any path.
-    Returns Access-Control-Allow-* headers only when the Origin is allowed
-    (either in explicit FRONTEND_ORIGINS or matches the ALLOW_ORIGIN_REGEX).
-    """
-    origin = request.headers.get("origin")
-    logger.info("Preflight OPTIONS for %s from Origin=%s", rest_of_path, origin)
-
-    if not origin:
-        return Response(status_code=200)
-
-    if origin in FRONTEND_ORIGINS or _origin_re.match(origin):
-        headers = {
-            "Access-Control-Allow-Origin": origin,
-            "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
-            "Access-Control-Allow-Headers": request.headers.get("access-control-request-headers", "*"),
-            "Access-Control-Allow-Credentials": "true",
-        }
-        return Response(status_code=200, headers=headers)
 
-    logger.warning("Blocked preflight from origin: %s", origin)
-    return Response(status_code=403, content="Origin not allowed")
+@app.on_event("shutdown")
+async def stop_access_log():
+    stop_async_access_log()
 
 
-# Simple request logging middleware to show incoming paths and response status
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start = time.time()
-    path = request.url.path
-    logger.info("Incoming request: %s %s", request.method, path)
-    response = await call_next(request)
-    duration = (time.time() - start) * 1000
-    logger.info("Completed %s %s -> %s (%.1fms)", request.method, path, response.status_code, duration)
-    return response
+@app.on_event("startup")
+async def start_warm_up():
+    # serve.py warms up before forking; plain `uvicorn main:app` does it here, in the
+    # background, and /api/ready answers 503 until it is done
+    if not STARTUP.ready.is_set() and os.getenv("WARM_UP_ON_STARTUP", "1").lower() in ("1", "true", "yes"):
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATASET_DIR = os.path.join(BASE_DIR, "datasets")
+DATASET_DIR = os.getenv("DATASET_DIR", os.path.join(BASE_DIR, "datasets"))
 os.makedirs(DATASET_DIR, exist_ok=True)
 
+# Serialized (and lazily compressed) JSON bodies for dataset endpoints
+encoded_bodies = EncodedBodyCache(max_entries=int(os.getenv("ENCODED_RESPONSE_CACHE_SIZE", "256")))
+
+# Compiled datasets (see compile_datasets.py); memory-mapped so workers share pages
+DATASET_PACK_PATH = os.getenv("DATASET_PACK_PATH", os.path.join(BASE_DIR, "datasets.pack"))
+dataset_pack = DatasetPack.open_if_exists(DATASET_PACK_PATH)
+
+# Parsed datasets (with precomputed Short/Elaborate/Realistic views) are kept in-process
+dataset_cache = DatasetCache(
+    max_entries=int(os.getenv("DATASET_CACHE_MAX_ENTRIES", "64")),
+    max_bytes=int(os.getenv("DATASET_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    pack=dataset_pack,
+)
+
+# Immutable view of DATASET_DIR (resolver + parsed datasets); the watcher swaps in a new
+# one when CSVs are added, changed or removed. DATASET_WATCH=off means restart to reload.
+dataset_store = SnapshotStore(DATASET_DIR, dataset_cache, settle_seconds=float(os.getenv("DATASET_SETTLE_SECONDS", "0.5")))
+DATASET_WATCH = os.getenv("DATASET_WATCH", "auto").lower()
+dataset_watcher = DatasetWatcher(dataset_store, mode=DATASET_WATCH, poll_interval=float(os.getenv("DATASET_POLL_INTERVAL", "2")))
+
+
+def get_dataset_entry(snapshot: DatasetSnapshot, filename: str) -> DatasetEntry:
+    entry = snapshot.entries.get(filename)
+    if entry is None:
+        # beyond the preload budget: loaded on demand through the LRU
+        return dataset_cache.get(os.path.join(DATASET_DIR, filename))
+    # preloaded entries are the cache's own, so serving one is a cache hit
+    dataset_cache.record_hit()
+    return entry
+
+
+# Interview question banks indexed for /api/search alongside the course modules
+QUESTION_BANK_DIR = os.getenv("QUESTION_BANK_DIR", os.path.normpath(os.path.join(BASE_DIR, "..", "public", "datasets")))
+search_indexer = SearchIndexer(
+    load_records=lambda snapshot, filename: get_dataset_entry(snapshot, filename).views["Elaborate"],
+    question_dir=QUESTION_BANK_DIR,
+)
+dataset_store.add_listener(search_indexer.refresh)
+dataset_watcher.add_hook(lambda: search_indexer.refresh(dataset_store.current))
+
+# Course feature matrix behind /api/predict-learning-path/batch
+course_ranker = CourseRankerBuilder(load_records=lambda snapshot, filename: get_dataset_entry(snapshot, filename).views["Elaborate"])
+dataset_store.add_listener(course_ranker.refresh)
+PREDICT_BATCH_MAX = int(os.getenv("PREDICT_BATCH_MAX", "10000"))
+
+
+@app.on_event("startup")
+async def start_dataset_watcher():
+    # threads do not survive fork(), so each serve.py worker starts its own here
+    if DATASET_WATCH != "off":
+        dataset_watcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_dataset_watcher():
+    await asyncio.to_thread(dataset_watcher.stop)
+
 FRONTEND_DIST_DIR = os.path.join(BASE_DIR, "dist")
-if os.path.isdir(FRONTEND_DIST_DIR):
-    logger.info("Found frontend dist at %s - mounting static files", FRONTEND_DIST_DIR)
-    app.mount("/static", StaticFiles(directory=os.path.join(FRONTEND_DIST_DIR, "assets")), name="static_assets")
+# Indexed once; SPA routes and assets are then served from memory
+asset_server = AssetServer(FRONTEND_DIST_DIR, max_memory_size=int(os.getenv("STATIC_MAX_MEMORY_FILE", str(4 * 1024 * 1024))))
+if asset_server.index is not None:
+    logger.info("Found frontend dist at %s - serving static files", FRONTEND_DIST_DIR)
 
 
 # -------------------------
@@ -128,123 +204,254 @@ class PsychologyAssessmentResult(BaseModel):
     scores: AssessmentScores
     percentage: int
 
+class BatchAssessmentRequest(BaseModel):
+    # the size limit is checked by the validator, before any item is validated past it
+    assessments: t.List[PsychologyAssessmentResult] = Field(..., min_length=1, max_length=PREDICT_BATCH_MAX)
+    top_k: int = Field(3, ge=1, le=50)
+    include_previews: bool = False
+    preview_size: int = Field(3, ge=1, le=100)
+
 
 # -------------------------
 # Utilities
 # -------------------------
-def replace_nan_with_none(obj):
-    if isinstance(obj, dict):
-        return {k: replace_nan_with_none(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [replace_nan_with_none(x) for x in obj]
-    if isinstance(obj, float) and math.isnan(obj):
-        return None
-    return obj
-
-def normalize_text_for_match(s: str) -> str:
-    if s is None:
-        return ""
-    s = s.strip().lower()
-    for ch in ("-", "_", ".", "/"):
-        s = s.replace(ch, " ")
-    s = " ".join(s.split())
-    return s
+def get_course_resolver() -> CourseResolver:
+    """Resolver of the current dataset snapshot."""
+    return dataset_store.current.resolver
 
-def tokens_from(s: str):
-    return [t for t in normalize_text_for_match(s).split(" ") if t]
 
-def find_dataset_filename_for_course(course_name: str) -> t.Optional[str]:
+def find_dataset_filename_for_course(course_name: str, snapshot: t.Optional[DatasetSnapshot] = None) -> t.Optional[str]:
     if not os.path.isdir(DATASET_DIR):
         logger.error("DATASET_DIR not found: %s", DATASET_DIR)
         return None
 
-    files = [f for f in os.listdir(DATASET_DIR) if f.lower().endswith(".csv")]
-    if not files:
+    resolver = (snapshot or dataset_store.current).resolver
+    if not len(resolver):
         logger.warning("No CSV files found in DATASET_DIR: %s", DATASET_DIR)
         return None
 
-    try:
-        decoded = urllib.parse.unquote(course_name)
-    except Exception:
-        decoded = course_name
-    norm_input = normalize_text_for_match(decoded)
-    logger.info("find_dataset: raw='%s' decoded='%s' normalized='%s'", course_name, decoded, norm_input)
-
-    lower_map = {f.lower(): f for f in files}
-    basenames = {os.path.splitext(f)[0].lower(): f for f in files}
-
-    candidates = set()
-    candidates.add(f"{norm_input.replace(' ', '_')}_learning.csv")
-    candidates.add(f"{norm_input.replace(' ', '-')}_learning.csv")
-    candidates.add(f"{norm_input.replace(' ', '')}_learning.csv")
-    candidates.add(f"{norm_input}_learning.csv")
-    candidates.add(f"{norm_input.replace(' ', '_')}.csv")
-    candidates.add(f"{norm_input.replace(' ', '-')}.csv")
-    candidates.add(f"{norm_input}.csv")
-
-    for cand in candidates:
-        if cand in lower_map:
-            logger.info("Matched candidate filename: %s -> %s", cand, lower_map[cand])
-            return lower_map[cand]
-
-    input_tokens = tokens_from(norm_input)
-    if input_tokens:
-        for base_lower, orig_filename in basenames.items():
-            if all(tok in base_lower for tok in input_tokens):
-                logger.info("Matched by token containment: input tokens %s -> %s", input_tokens, orig_filename)
-                return orig_filename
+    with span("dataset_resolve"):
+        filename = resolver.resolve(course_name)
+    if filename is None:
+        logger.warning("No matching dataset file for '%s'. Available: %s", course_name, resolver.files)
+    return filename
 
-    try:
-        keys = list(basenames.keys())
-        matches = difflib.get_close_matches(norm_input, keys, n=1, cutoff=0.55)
-        if matches:
-            matched_base = basenames[matches[0]]
-            logger.info("Fuzzy matched '%s' -> '%s'", norm_input, matched_base)
-            return matched_base
-    except Exception as e:
-        logger.exception("Fuzzy matching error: %s", e)
 
-    for base_lower, orig_filename in basenames.items():
-        if any(tok in base_lower for tok in input_tokens):
-            logger.info("Lenient token match (any token) matched %s -> %s", input_tokens, orig_filename)
-            return orig_filename
+def warm_up(compile_stale_pack: bool = False) -> None:
+    """Load the datasets in DATASET_DIR into the first full snapshot, then mark the process ready.
 
-    logger.warning("No matching dataset file for '%s'. Available: %s", course_name, files)
-    return None
+    With compile_stale_pack, a missing or stale dataset pack is recompiled first so
+    the loads decode from it; if that fails the datasets are parsed from CSV instead.
+    Any other failure is recorded as the warm-up error, which keeps /api/ready at 503.
+    """
+    global dataset_pack
+    error = None
+    try:
+        with STARTUP.phase("dataset_load"):
+            csv_files = get_course_resolver().files
+            paths = [os.path.join(DATASET_DIR, f) for f in csv_files]
+            if compile_stale_pack and csv_files and (
+                dataset_pack is None or not all(dataset_pack.is_fresh(p, file_signature(p)) for p in paths)
+            ):
+                try:
+                    logger.info("Compiling dataset pack %s from %d datasets", DATASET_PACK_PATH, len(csv_files))
+                    compile_pack(DATASET_DIR, DATASET_PACK_PATH)
+                    old_pack, dataset_pack = dataset_pack, DatasetPack.open_if_exists(DATASET_PACK_PATH)
+                    dataset_cache.pack = dataset_pack
+                    if old_pack is not None:
+                        old_pack.close()
+                except Exception:
+                    # e.g. read-only code directory: the pack only speeds up loading, so carry on from CSV
+                    logger.exception("Could not compile dataset pack %s; loading datasets from CSV", DATASET_PACK_PATH)
+            snapshot = dataset_store.reload("warm-up", notify=False)
+            if len(snapshot.entries) < len(snapshot.signatures):
+                logger.warning("Preloaded %d of %d datasets (DATASET_CACHE_MAX_ENTRIES / DATASET_CACHE_MAX_BYTES); "
+                               "the rest load on first request", len(snapshot.entries), len(snapshot.signatures))
+        with STARTUP.phase("search_index"):
+            search_indexer.refresh(snapshot)
+        with STARTUP.phase("course_ranker"):
+            course_ranker.refresh(snapshot)
+    except Exception as e:
+        logger.exception("Dataset warm-up failed; datasets will load on first request")
+        error = str(e)
+    STARTUP.mark_ready(error)
 
 
 # -------------------------
 # Root / health / API endpoints (ALL defined BEFORE API fallback)
 # -------------------------
 @app.get("/api/health")
-def health():
-    return {"status": "ok", "dataset_dir": DATASET_DIR, "dataset_count": len([f for f in os.listdir(DATASET_DIR) if f.lower().endswith('.csv')])}
+def health(request: Request):
+    body = {
+        "status": "ok",
+        "pid": os.getpid(),
+        "startup": STARTUP.as_dict(),
+        "dataset_dir": DATASET_DIR,
+        "dataset_count": len(get_course_resolver()),
+        "datasets": {**dataset_store.stats(), "watcher": dataset_watcher.mode if DATASET_WATCH != "off" else "off"},
+        "dataset_cache": dataset_cache.stats(),
+        "search": search_indexer.stats(),
+        "course_ranker": course_ranker.stats(),
+        "encoded_responses": encoded_bodies.stats(),
+        "llm": llm_client.stats() if llm_client is not None else None,
+        "llm_cache": response_cache.stats(),
+    }
+    # rebuilt on every request, so compressed at the fastest level rather than cached
+    return conditional_response(request, EncodedBody.from_obj(body, transient=True))
+
+@app.get("/api/ready")
+def ready():
+    if not STARTUP.ready.is_set():
+        return JSONResponse({"status": "starting", "startup": STARTUP.as_dict()}, status_code=503)
+    if STARTUP.warmup_error is not None:
+        # serving, but every request would load lazily; keep this instance out of rotation
+        return JSONResponse({"status": "failed", "startup": STARTUP.as_dict()}, status_code=503)
+    return {"status": "ready", "startup": STARTUP.as_dict()}
 
 @app.get("/api/check-data")
-async def check_data():
+async def check_data(request: Request):
     if not os.path.isdir(DATASET_DIR):
         raise HTTPException(status_code=404, detail="Datasets directory not found.")
-    available_files = [f for f in os.listdir(DATASET_DIR) if f.lower().endswith(".csv")]
-    return {"available_files": available_files, "available_datasets": [os.path.splitext(f)[0] for f in available_files]}
+    available_files = get_course_resolver().files
+
+    def build():
+        return EncodedBody.from_obj({"available_files": available_files, "available_datasets": [os.path.splitext(f)[0] for f in available_files]})
+
+    return conditional_response(request, encoded_bodies.get_or_build(("check-data", tuple(available_files)), build))
+
+
+register_callback(
+    "hiredai_dataset_cache_lookups_total", "Dataset cache lookups by result.", "counter",
+    lambda: [({"result": "hit"}, dataset_cache.hits), ({"result": "miss"}, dataset_cache.misses)],
+)
+register_callback(
+    "hiredai_dataset_cache_bytes", "Estimated bytes held by the dataset cache.", "gauge",
+    lambda: [({}, dataset_cache.stats()["bytes"])],
+)
+register_callback(
+    "hiredai_dataset_snapshot_version", "Version of the dataset snapshot being served.", "gauge",
+    lambda: [({}, dataset_store.current.version)],
+)
+register_callback(
+    "hiredai_dataset_reloads_total", "Dataset snapshot rebuilds by result.", "counter",
+    lambda: [({"result": "ok"}, dataset_store.reloads), ({"result": "error"}, dataset_store.reload_errors)],
+)
+register_callback(
+    "hiredai_encoded_response_cache_lookups_total", "Pre-encoded response body lookups by result.", "counter",
+    lambda: [({"result": "hit"}, encoded_bodies.hits), ({"result": "miss"}, encoded_bodies.misses)],
+)
+register_callback(
+    "hiredai_llm_requests", "OpenAI calls waiting for a concurrency slot or in flight.", "gauge",
+    lambda: [({"state": "queued"}, llm_client.queued), ({"state": "in_flight"}, llm_client.in_flight)] if llm_client else [],
+)
+register_callback(
+    "hiredai_llm_cache_lookups_total", "Generated-answer cache lookups by result.", "counter",
+    lambda: [
+        ({"result": "hit"}, response_cache.hits),
+        ({"result": "miss"}, response_cache.misses),
+        ({"result": "coalesced"}, response_cache.coalesced),
+        ({"result": "bypassed"}, response_cache.bypassed),
+    ],
+)
+register_callback(
+    "hiredai_llm_cache_saved_seconds_total", "Upstream latency avoided by answer-cache hits.", "counter",
+    lambda: [({}, response_cache.saved_latency)],
+)
+
+
+@app.get("/api/metrics", include_in_schema=False)
+def metrics_endpoint():
+    return PlainTextResponse(render_latest(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+LOCAL_FALLBACK_ANSWER = "💡 (Local fallback) Structure answers with STAR: Situation, Task, Action, Result."
+
+
+def interview_coach_messages(prompt: str) -> t.List[dict]:
+    return [
+        {"role": "system", "content": "You are an interview coach that writes concise STAR-format answers."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def sse_event(data: dict, event: t.Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_answer_events(req: PromptRequest) -> t.AsyncIterator[str]:
+    """SSE body for generate-answer: one "delta" per upstream token, then "done" with the full answer."""
+    if llm_client is None:
+        yield sse_event({"delta": LOCAL_FALLBACK_ANSWER})
+        yield sse_event({"answer": LOCAL_FALLBACK_ANSWER}, event="done")
+        return
+    max_tokens = req.max_tokens or 200
+    temperature = req.temperature or 0.6
+    cache_key = None
+    if response_cache.cacheable(temperature):
+        cache_key = response_cache.key(req.prompt, max_tokens, temperature, llm_client.model)
+        # no single-flight here: each stream relays its own upstream deltas as they arrive,
+        # so identical concurrent streams each call the upstream (only finished answers are shared)
+        cached = await response_cache.lookup(cache_key, count_miss=True)
+        if cached is not None:
+            yield sse_event({"delta": cached})
+            yield sse_event({"answer": cached.strip()}, event="done")
+            return
+
+    parts = []
+    start = time.monotonic()
+    try:
+        async for delta in llm_client.stream_chat(
+            interview_coach_messages(req.prompt),
+            max_tokens=max_tokens,
+            temperature=temperature,
+        ):
+            parts.append(delta)
+            yield sse_event({"delta": delta})
+    except asyncio.CancelledError:
+        logger.info("Client disconnected; cancelled upstream stream after %d deltas", len(parts))
+        raise
+    except Exception as e:
+        logger.exception("OpenAI streaming error")
+        yield sse_event({"answer": f"Error: AI generation failed ({str(e)})"}, event="error")
+        return
+    answer = "".join(parts)
+    if cache_key is not None:
+        await response_cache.store(cache_key, answer, time.monotonic() - start)
+    yield sse_event({"answer": answer.strip()}, event="done")
+
+
+def streaming_answer_response(req: PromptRequest) -> StreamingResponse:
+    return StreamingResponse(
+        stream_answer_events(req),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/generate-answer/stream")
+async def generate_answer_stream(req: PromptRequest):
+    return streaming_answer_response(req)
 
 
 @app.post("/api/generate-answer")
-async def generate_answer(req: PromptRequest):
-    if not OPENAI_API_KEY:
-        return {"answer": "💡 (Local fallback) Structure answers with STAR: Situation, Task, Action, Result."}
+async def generate_answer(req: PromptRequest, request: Request):
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return streaming_answer_response(req)
+    if llm_client is None:
+        return {"answer": LOCAL_FALLBACK_ANSWER}
+    max_tokens = req.max_tokens or 200
+    temperature = req.temperature or 0.6
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an interview coach that writes concise STAR-format answers."},
-                {"role": "user", "content": req.prompt},
-            ],
-            max_tokens=req.max_tokens or 200,
-            temperature=req.temperature or 0.6,
-            n=1,
-        )
-        answer = response["choices"][0]["message"]["content"].strip()
-        return {"answer": answer}
+        def compute():
+            return llm_client.chat(interview_coach_messages(req.prompt), max_tokens=max_tokens, temperature=temperature)
+
+        if response_cache.cacheable(temperature):
+            cache_key = response_cache.key(req.prompt, max_tokens, temperature, llm_client.model)
+            answer = await response_cache.get_or_compute(cache_key, compute)
+        else:
+            answer = await compute()
+        return {"answer": answer.strip()}
     except Exception as e:
         logger.exception("OpenAI error")
         return {"answer": f"Error: AI generation failed ({str(e)})"}
@@ -275,34 +482,111 @@ async def predict_learning_path(assessment_result: PsychologyAssessmentResult):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/predict-learning-path/batch")
+def predict_learning_path_batch(req: BatchAssessmentRequest):
+    """Rank the course datasets for many assessments at once.
+
+    Results are in request order. With include_previews, the first preview_size
+    records of every recommended course in each mode are returned once under
+    "previews", keyed by course, rather than repeated per user.
+    """
+    start = time.perf_counter()
+    snapshot = dataset_store.current
+    ranker = course_ranker.current
+    if course_ranker.builds == 0:
+        # warm-up disabled or still running
+        ranker = course_ranker.refresh(snapshot)
+    with span("predict_batch_rank"):
+        scores = [[getattr(a.scores, style) for style in STYLES] for a in req.assessments]
+        courses, course_scores = ranker.recommend(scores, [a.dominantStyle for a in req.assessments], req.top_k)
+    results = [
+        {"user_category": a.dominantStyle, "recommended_courses": c, "course_scores": s}
+        for a, c, s in zip(req.assessments, courses, course_scores)
+    ]
+    body = {"ranker_version": ranker.version, "count": len(results), "results": results}
+    if req.include_previews:
+        previews = {}
+        filenames = dict(zip(ranker.courses, ranker.filenames))
+        for course in sorted({c for row in courses for c in row}):
+            filename = filenames[course]
+            try:
+                views = get_dataset_entry(snapshot, filename).views
+            except Exception as e:
+                # removed or unreadable since the ranker was built; recommendations still stand
+                logger.warning("No preview for %s: %s", filename, e)
+                continue
+            previews[course] = {mode: views[mode][:req.preview_size] for mode in STYLES}
+        body["previews"] = previews
+    body["took_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return JSONResponse(body)
+
+
+def filter_records_by_module(records: t.List[dict], module: str) -> t.List[dict]:
+    wanted = normalize_text_for_match(module)
+    return [
+        r for r in records
+        if normalize_text_for_match(str(r.get("module_name") or "")) == wanted or str(r.get("module_id")) == module.strip()
+    ]
+
+
+def parse_fields(fields: t.Optional[str], records: t.List[dict]) -> t.Optional[t.List[str]]:
+    if not fields:
+        return None
+    columns = [f.strip() for f in fields.split(",") if f.strip()]
+    if records:
+        unknown = [c for c in columns if c not in records[0]]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}; available: {list(records[0])}")
+    return columns or None
+
+
+def decode_cursor(cursor: t.Optional[str]) -> int:
+    if cursor is None:
+        return 0
+    if not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return int(cursor)
+
+
+def project_records(records: t.Iterable[dict], columns: t.List[str]) -> t.List[dict]:
+    return [{c: r.get(c) for c in columns} for r in records]
+
+
+def iter_ndjson(records: t.List[dict], columns: t.Optional[t.List[str]]) -> t.Iterator[bytes]:
+    """Serialize one record per line as the response is sent."""
+    for r in records:
+        if columns:
+            r = {c: r.get(c) for c in columns}
+        yield json.dumps(r, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
 @app.get("/api/learning-path/{course_name}")
-def get_learning_path(course_name: str, mode: str = Query("Elaborate", enum=["Short", "Elaborate", "Realistic"])):
+def get_learning_path(
+    course_name: str,
+    request: Request,
+    mode: str = Query("Elaborate", enum=["Short", "Elaborate", "Realistic"]),
+    limit: t.Optional[int] = Query(None, ge=1, le=1000, description="Page size; enables cursor pagination"),
+    cursor: t.Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    fields: t.Optional[str] = Query(None, description="Comma-separated columns to return, e.g. module_id,topic_title"),
+    module: t.Optional[str] = Query(None, description="Only records whose module_name or module_id matches"),
+    format: t.Optional[str] = Query(None, enum=["json", "ndjson"]),
+):
     logger.info("Request learning-path for '%s' mode=%s", course_name, mode)
     try:
-        filename = find_dataset_filename_for_course(course_name)
+        # one snapshot for the whole request, so a concurrent reload cannot mix listings
+        snapshot = dataset_store.current
+        filename = find_dataset_filename_for_course(course_name, snapshot)
         logger.info("find_dataset_filename_for_course returned: %s", filename)
         if not filename:
             raise HTTPException(status_code=404, detail=f"Learning path data not found for course: {course_name}")
 
         file_path = os.path.join(DATASET_DIR, filename)
-        if not os.path.isfile(file_path):
+        try:
+            entry = get_dataset_entry(snapshot, filename)
+            data_records = entry.views[mode]
+        except FileNotFoundError:
             logger.error("Expected dataset file missing at path: %s", file_path)
             raise HTTPException(status_code=404, detail=f"Dataset file not found at expected path: {file_path}")
-
-        try:
-            import pandas as pd
-            df = pd.read_csv(file_path, encoding="utf-8", on_bad_lines="skip")
-            df = df.where(pd.notnull(df), None)
-
-            if mode == "Short":
-                df = df.sample(frac=0.5, random_state=42) if len(df) > 1 else df
-            elif mode == "Realistic" and "difficulty" in df.columns:
-                df = df[df["difficulty"].isin(["Intermediate", "Advanced"])]
-                if len(df) == 0:
-                    logger.info("No Intermediate/Advanced found for Realistic mode; using full dataset")
-                    df = pd.read_csv(file_path, encoding="utf-8", on_bad_lines="skip")
-
-            data_records = df.to_dict(orient="records")
         except Exception as e:
             logger.exception("Error reading CSV %s: %s", file_path, e)
             raise HTTPException(status_code=500, detail=f"Error loading course data: {str(e)}")
@@ -318,14 +602,36 @@ def get_learning_path(course_name: str, mode: str = Query("Elaborate", enum=["Sh
             key = normalize_text_for_match(course_name).replace(" ", "_")
             data_records = fallback_content_map.get(key, [])
 
-        data_records = replace_nan_with_none(data_records)
-        return {
-            "course_name": course_name,
-            "dataset_filename": filename,
-            "learning_mode": mode,
-            "total_modules": len(data_records),
-            "content": data_records,
-        }
+        if module is not None:
+            data_records = filter_records_by_module(data_records, module)
+        columns = parse_fields(fields, data_records)
+        offset = decode_cursor(cursor)
+        end = offset + limit if limit is not None else len(data_records)
+        page = data_records[offset:end]
+        next_cursor = str(end) if limit is not None and end < len(data_records) else None
+
+        if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+            headers = {"X-Total-Modules": str(len(data_records)), "X-Dataset-Filename": filename}
+            if next_cursor is not None:
+                headers["X-Next-Cursor"] = next_cursor
+            return StreamingResponse(iter_ndjson(page, columns), media_type="application/x-ndjson", headers=headers)
+
+        def build():
+            response = {
+                "course_name": course_name,
+                "dataset_filename": filename,
+                "learning_mode": mode,
+                "total_modules": len(data_records),
+                "content": project_records(page, columns) if columns else page,
+            }
+            if limit is not None:
+                response["next_cursor"] = next_cursor
+            with span("response_encode"):
+                return EncodedBody.from_obj(response, etag=make_etag(entry.sha256, *map(str, variant)))
+
+        # the body is a pure function of the dataset content and these parameters
+        variant = (course_name, mode, limit, cursor, fields, module)
+        return conditional_response(request, encoded_bodies.get_or_build(("learning-path", entry.sha256, variant), build))
 
     except HTTPException:
         raise
@@ -334,6 +640,34 @@ def get_learning_path(course_name: str, mode: str = Query("Elaborate", enum=["Sh
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/search")
+def search(
+    q: str = Query(..., min_length=1, max_length=256, description="Search terms, e.g. 'iam roles'"),
+    course: t.Optional[str] = Query(None, description="Comma-separated courses or question banks to search in"),
+    difficulty: t.Optional[str] = Query(None, description="Comma-separated difficulties, e.g. Intermediate,Advanced"),
+    source: t.Optional[str] = Query(None, enum=list(SOURCES)),
+    limit: int = Query(10, ge=1, le=50),
+):
+    if search_indexer.builds == 0:
+        # warm-up did not run (e.g. WARM_UP_ON_STARTUP=0): build on first use
+        search_indexer.refresh(dataset_store.current)
+    start = time.perf_counter()
+    index = search_indexer.current
+    courses = None
+    if course:
+        courses = index.course_codes([c for c in course.split(",") if c.strip()], resolver=dataset_store.current.resolver)
+    difficulties = [d.strip() for d in difficulty.split(",") if d.strip()] if difficulty else None
+    with span("search_query"):
+        total, results = index.search(q, limit=limit, courses=courses, difficulties=difficulties, source=source)
+    return JSONResponse({
+        "query": q,
+        "total": total,
+        "took_ms": round((time.perf_counter() - start) * 1000, 3),
+        "index_version": index.version,
+        "results": results,
+    })
+
+
 # -------------------------
 # API fallback: declared AFTER real API routes so it only catches unknown API paths
 # -------------------------
@@ -346,27 +680,33 @@ def api_fallback(rest: str):
 # -------------------------
 # Serve frontend index + SPA fallback (non-API paths)
 # -------------------------
-@app.get("/", include_in_schema=False)
-def serve_root():
-    index_path = os.path.join(FRONTEND_DIST_DIR, "index.html")
-    if os.path.isfile(index_path):
-        return FileResponse(index_path, media_type="text/html")
+@app.api_route("/", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_root(request: Request):
+    if asset_server.index is not None:
+        return asset_server.serve(request, asset_server.index)
     return JSONResponse({"message": "Backend running. No frontend build found."})
 
 
-@app.get("/{full_path:path}", include_in_schema=False)
+@app.api_route("/static/{asset_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_static(asset_path: str, request: Request):
+    asset = asset_server.lookup(f"assets/{asset_path}")
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return asset_server.serve(request, asset)
+
+
+@app.api_route("/{full_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
 def spa_fallback(full_path: str, request: Request):
     normalized = (full_path or "").lstrip("/")
     if normalized.lower().startswith("api/") or normalized.lower() == "api":
         logger.info("SPA fallback blocking API path: %s", normalized)
         return JSONResponse({"detail": "Not Found."}, status_code=404)
 
-    requested = os.path.join(FRONTEND_DIST_DIR, full_path)
-    if os.path.isfile(requested):
-        return FileResponse(requested)
-    index_path = os.path.join(FRONTEND_DIST_DIR, "index.html")
-    if os.path.isfile(index_path):
-        return FileResponse(index_path, media_type="text/html")
+    asset = asset_server.lookup(normalized)
+    if asset is not None:
+        return asset_server.serve(request, asset)
+    if asset_server.index is not None:
+        return asset_server.serve(request, asset_server.index)
     return JSONResponse({"message": "Backend running. No frontend build found."})
 
 
@@ -379,4 +719,7 @@ class CreateUserPayload(BaseModel):
 
 @app.post("/api/admin/create-user")
 async def create_user(payload: CreateUserPayload):
-    return {"ok": True, "user": {"email": payload.email}}
\ No newline at end of file
+    return {"ok": True, "user": {"email": payload.email}}
+
+
+STARTUP.mark("app_construction")
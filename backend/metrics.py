@@ -0,0 +1,262 @@
+# backend/metrics.py
+"""
+Process-local metrics rendered in the Prometheus text format.
+
+Hot-path writes never take a lock: every histogram/gauge child keeps one shard
+per live thread (the event loop thread, each threadpool worker) and a thread only
+ever writes its own shard. Shards of exited threads are folded into a retired
+total. Scrapes sum the shards. Timings use perf_counter.
+"""
+import bisect
+import threading
+import time
+import typing as t
+import weakref
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: t.Sequence[str], values: t.Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _ShardOwner:
+    """Lives in a thread's local storage only, so it is collected when that thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _Sharded:
+    """Per-thread shards created on first write from each thread.
+
+    When a thread exits, its shard is folded into a retired total and dropped, so
+    short-lived threadpool workers do not leave one shard each behind.
+    """
+
+    def __init__(self, factory: t.Callable[[], list]):
+        self._factory = factory
+        self._local = threading.local()
+        self._shards: t.List[list] = []
+        self._retired = factory()
+        self._lock = threading.Lock()
+
+    def shard(self) -> list:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._factory()
+            owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, shard)
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            self._local.owner = owner
+            return shard
+
+    def _retire(self, shard: list) -> None:
+        # the owning thread is gone, so nothing writes to shard any more
+        with self._lock:
+            for i, v in enumerate(shard):
+                self._retired[i] += v
+            self._shards.remove(shard)
+
+    def shards(self) -> t.List[list]:
+        with self._lock:
+            return self._shards + [list(self._retired)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._shards)
+
+
+class _HistogramChild:
+    __slots__ = ("_buckets", "_sharded")
+
+    def __init__(self, buckets: t.Tuple[float, ...]):
+        self._buckets = buckets
+        # shard layout: [count per bucket..., +Inf count, sum]
+        size = len(buckets) + 2
+        self._sharded = _Sharded(lambda: [0] * size)
+
+    def observe(self, value: float) -> None:
+        shard = self._sharded.shard()
+        shard[bisect.bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> t.Tuple[t.List[int], float]:
+        totals = [0] * (len(self._buckets) + 2)
+        for shard in self._sharded.shards():
+            for i, v in enumerate(shard):
+                totals[i] += v
+        return totals[:-1], totals[-1]
+
+
+class _GaugeChild:
+    __slots__ = ("_sharded",)
+
+    def __init__(self):
+        self._sharded = _Sharded(lambda: [0])
+
+    def inc(self, amount: float = 1) -> None:
+        self._sharded.shard()[0] += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self._sharded.shard()[0] -= amount
+
+    def value(self) -> float:
+        return sum(s[0] for s in self._sharded.shards())
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: t.Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: t.Dict[tuple, t.Any] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _items(self) -> t.List[t.Tuple[tuple, t.Any]]:
+        with self._lock:
+            return sorted(self._children.items(), key=lambda item: item[0])
+
+    def _header(self) -> t.List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: t.Sequence[str] = (), buckets: t.Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        self.labels(*labelvalues).observe(value)
+
+    def render(self) -> t.List[str]:
+        lines = self._header()
+        for values, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for le, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le_label = 'le="+Inf"' if le == float("inf") else f'le="{le!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, values)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, values)} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def render(self) -> t.List[str]:
+        lines = self._header()
+        for values, child in self._items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {child.value()}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from a callback at scrape time."""
+
+    def __init__(self, name: str, documentation: str, kind: str, callback: t.Callable[[], t.Iterable[t.Tuple[t.Dict[str, str], float]]]):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.callback = callback
+
+    def render(self) -> t.List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.callback():
+            lines.append(f"{self.name}{_format_labels(list(labels), list(labels.values()))} {value}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: t.List[t.Any] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: t.List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "hiredai_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"),
+))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "hiredai_http_requests_in_flight", "HTTP requests currently being handled.", ("method",),
+))
+SPAN_LATENCY = REGISTRY.register(Histogram(
+    "hiredai_span_duration_seconds", "Duration of named timing spans inside handlers.", ("span",),
+))
+
+
+class span:
+    """Time a block into hiredai_span_duration_seconds{span=name}.
+
+        with span("dataset_resolve"):
+            ...
+    """
+
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, name: str):
+        self._child = SPAN_LATENCY.labels(name)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+def observe_span(name: str, seconds: float) -> None:
+    """Record a span timed by the caller, for blocks that cannot be a with-statement (e.g. across yields)."""
+    SPAN_LATENCY.labels(name).observe(seconds)
+
+
+def register_callback(name: str, documentation: str, kind: str, callback) -> CallbackMetric:
+    return REGISTRY.register(CallbackMetric(name, documentation, kind, callback))
+
+
+def render_latest() -> str:
+    return REGISTRY.render()
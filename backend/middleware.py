@@ -0,0 +1,234 @@
+# backend/middleware.py
+"""
+Pure ASGI middleware: CORS with cached origin decisions, sampled access
+logging handed to a background thread, and per-route request metrics.
+
+Each wraps ``send`` directly instead of going through BaseHTTPMiddleware, so
+streaming responses pass through unbuffered.
+"""
+import logging
+import queue
+import random
+import re
+import time
+import typing as t
+from logging.handlers import QueueHandler, QueueListener
+
+from metrics import REQUEST_LATENCY, REQUESTS_IN_FLIGHT
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT", "QUERY")
+PREFLIGHT_VARY = "Origin, Access-Control-Request-Method, Access-Control-Request-Headers, Access-Control-Request-Private-Network"
+
+
+def _request_headers(scope, *names: bytes) -> t.Dict[bytes, str]:
+    found = {}
+    for key, value in scope["headers"]:
+        if key in names and key not in found:
+            found[key] = value.decode("latin-1")
+    return found
+
+
+async def _plain_response(send, status: int, body: bytes, headers: t.List[t.Tuple[bytes, bytes]]) -> None:
+    headers = headers + [(b"content-length", str(len(body)).encode())]
+    if body:
+        headers.append((b"content-type", b"text/plain; charset=utf-8"))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class CORSMiddleware:
+    """CORS for an explicit origin list plus an origin regex, always with credentials.
+
+    Matches Starlette's CORSMiddleware(allow_methods=["*"], allow_headers=["*"],
+    allow_credentials=True) for preflights and simple requests. OPTIONS requests
+    without Access-Control-Request-Method are also answered here: 200 with the
+    allow headers for permitted origins, 403 otherwise.
+    """
+
+    def __init__(self, app, allow_origins: t.Iterable[str] = (), allow_origin_regex: t.Optional[str] = None,
+                 max_age: int = 600, cache_size: int = 1024):
+        self.app = app
+        self.allow_origins = frozenset(allow_origins)
+        self.allow_origin_regex = re.compile(allow_origin_regex) if allow_origin_regex else None
+        self.max_age = str(max_age).encode()
+        self.cache_size = cache_size
+        self._decisions: t.Dict[str, bool] = {}
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        allowed = self._decisions.get(origin)
+        if allowed is None:
+            allowed = origin in self.allow_origins or bool(self.allow_origin_regex and self.allow_origin_regex.fullmatch(origin))
+            if len(self._decisions) >= self.cache_size:
+                self._decisions.clear()
+            self._decisions[origin] = allowed
+        return allowed
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = _request_headers(
+            scope, b"origin", b"access-control-request-method", b"access-control-request-headers",
+            b"access-control-request-private-network",
+        )
+        origin = headers.get(b"origin")
+        if scope["method"] == "OPTIONS":
+            await self.preflight(send, origin, headers)
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                out = list(message.get("headers", []))
+                if origin is not None:
+                    out.append((b"access-control-allow-credentials", b"true"))
+                    if self.is_allowed_origin(origin):
+                        out.append((b"access-control-allow-origin", origin.encode("latin-1")))
+                out = _append_vary(out, b"Origin")
+                message = {**message, "headers": out}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight(self, send, origin: t.Optional[str], headers: t.Dict[bytes, str]) -> None:
+        if origin is None:
+            await _plain_response(send, 200, b"", [(b"vary", b"Origin")])
+            return
+
+        allowed = self.is_allowed_origin(origin)
+        requested_method = headers.get(b"access-control-request-method")
+        requested_headers = headers.get(b"access-control-request-headers")
+        out = [
+            (b"access-control-allow-methods", ", ".join(ALL_METHODS).encode()),
+            (b"access-control-max-age", self.max_age),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+        if allowed:
+            out.append((b"access-control-allow-origin", origin.encode("latin-1")))
+
+        if requested_method is None:
+            # plain OPTIONS from a browser-less client
+            out.append((b"vary", b"Origin"))
+            if not allowed:
+                await _plain_response(send, 403, b"Origin not allowed", [(b"access-control-allow-credentials", b"true"), (b"vary", b"Origin")])
+                return
+            out.append((b"access-control-allow-headers", (requested_headers or "*").encode("latin-1")))
+            await _plain_response(send, 200, b"", out)
+            return
+
+        out.append((b"vary", PREFLIGHT_VARY.encode()))
+        if requested_headers is not None:
+            out.append((b"access-control-allow-headers", requested_headers.encode("latin-1")))
+        failures = []
+        if not allowed:
+            failures.append("origin")
+        if requested_method not in ALL_METHODS:
+            failures.append("method")
+        if b"access-control-request-private-network" in headers:
+            failures.append("private-network")
+        if failures:
+            await _plain_response(send, 400, ("Disallowed CORS " + ", ".join(failures)).encode(), out)
+            return
+        await _plain_response(send, 200, b"OK", out)
+
+
+def _append_vary(headers: t.List[t.Tuple[bytes, bytes]], value: bytes) -> t.List[t.Tuple[bytes, bytes]]:
+    existing = [v for k, v in headers if k.lower() == b"vary"]
+    if not existing:
+        return headers + [(b"vary", value)]
+    merged = b", ".join(existing + [value])
+    return [(k, v) for k, v in headers if k.lower() != b"vary"] + [(b"vary", merged)]
+
+
+class AccessLogMiddleware:
+    """One access-log line per sampled request; errors and slow requests are always logged."""
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_ms: float = 1000.0, logger_name: str = "hiredai.access"):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.logger = logging.getLogger(logger_name)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            if status >= 500 or duration >= self.slow_ms or random.random() < self.sample_rate:
+                self.logger.info("%s %s -> %s (%.1fms)", scope["method"], scope["path"], status, duration)
+
+
+class MetricsMiddleware:
+    """Records request latency per route template (not raw path) and requests in flight."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(method, template, str(status)).observe(time.perf_counter() - start)
+
+
+_access_log_listener: t.Optional[QueueListener] = None
+
+
+def start_async_access_log(logger_name: str = "hiredai.access") -> None:
+    """Route the access logger through a queue so handlers run on a background thread."""
+    global _access_log_listener
+    if _access_log_listener is not None:
+        return
+    access_logger = logging.getLogger(logger_name)
+    handlers = logging.getLogger().handlers
+    if not handlers:
+        return
+    q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _access_log_listener = QueueListener(q, *handlers, respect_handler_level=True)
+    _access_log_listener.start()
+    access_logger.addHandler(QueueHandler(q))
+    access_logger.propagate = False
+
+
+def stop_async_access_log(logger_name: str = "hiredai.access") -> None:
+    global _access_log_listener
+    if _access_log_listener is None:
+        return
+    access_logger = logging.getLogger(logger_name)
+    for handler in [h for h in access_logger.handlers if isinstance(h, QueueHandler)]:
+        access_logger.removeHandler(handler)
+    access_logger.propagate = True
+    _access_log_listener.stop()
+    _access_log_listener = None
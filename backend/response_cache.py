@@ -0,0 +1,221 @@
+# backend/response_cache.py
+"""
+Cache for generated answers, keyed on (prompt, max_tokens, temperature, model).
+
+A bounded in-memory LRU with TTL sits in front of an optional SQLite table that
+survives restarts. The table is pruned as it is written: expired rows are
+deleted, and past max_disk_entries the rows closest to expiry (the oldest
+writes) go first. Concurrent misses for the same key are coalesced: one task
+calls the upstream and every waiter gets its result. Streamed answers use
+lookup()/store() only, so they are cached but not coalesced.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import typing as t
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger("hiredai.response_cache")
+
+
+class CachedAnswer(t.NamedTuple):
+    answer: str
+    expires_at: float
+    # how long the upstream took to produce it; every hit saves this much
+    latency: float
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 86400.0,
+        db_path: t.Optional[str] = None,
+        max_temperature: float = 0.7,
+        cache_high_temperature: bool = False,
+        max_disk_entries: int = 100_000,
+        prune_interval: float = 60.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.cache_high_temperature = cache_high_temperature
+        self._entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self._inflight: t.Dict[str, asyncio.Task] = {}
+        self._db: t.Optional[sqlite3.Connection] = None
+        self._db_pid: t.Optional[int] = None
+        self._db_lock = threading.Lock()
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self.prune_interval = prune_interval
+        self._last_prune = float("-inf")
+        self._writes_since_prune = 0
+        self.disk_pruned = 0
+        if db_path:
+            # created and closed here; _connection() opens one per process, since a
+            # SQLite connection must not be carried across fork() into workers
+            db = sqlite3.connect(db_path)
+            try:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, answer TEXT NOT NULL, expires_at REAL NOT NULL, latency REAL NOT NULL)"
+                )
+                db.execute("CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)")
+                self._prune(db)
+                db.commit()
+            finally:
+                db.close()
+            logger.info("Persisting generated answers to %s", db_path)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.bypassed = 0
+        self.saved_latency = 0.0
+
+    @staticmethod
+    def key(prompt: str, max_tokens: int, temperature: float, model: str) -> str:
+        raw = json.dumps([prompt, max_tokens, temperature, model], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def cacheable(self, temperature: float) -> bool:
+        if temperature <= self.max_temperature or self.cache_high_temperature:
+            return True
+        self.bypassed += 1
+        return False
+
+    def _get_memory(self, key: str) -> t.Optional[CachedAnswer]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put_memory(self, key: str, entry: CachedAnswer) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _connection(self) -> sqlite3.Connection:
+        # callers hold _db_lock
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _get_disk(self, key: str) -> t.Optional[CachedAnswer]:
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT answer, expires_at, latency FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return CachedAnswer(*row)
+
+    def _put_disk(self, key: str, entry: CachedAnswer) -> None:
+        with self._db_lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, answer, expires_at, latency) VALUES (?, ?, ?, ?)",
+                (key, *entry),
+            )
+            self._writes_since_prune += 1
+            # on a timer, and often enough that the table stays within ~10% of the cap between prunes
+            if (time.monotonic() - self._last_prune >= self.prune_interval
+                    or self._writes_since_prune >= max(1, self.max_disk_entries // 10)):
+                self._prune(db)
+            db.commit()
+
+    def _prune(self, db: sqlite3.Connection) -> None:
+        """Delete expired rows, then the rows closest to expiry beyond max_disk_entries. Caller commits."""
+        deleted = db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),)).rowcount
+        excess = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            deleted += db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY expires_at LIMIT ?)", (excess,)
+            ).rowcount
+        self._last_prune = time.monotonic()
+        self._writes_since_prune = 0
+        if deleted:
+            self.disk_pruned += deleted
+            logger.info("Pruned %d cached answers from %s", deleted, self.db_path)
+
+    async def lookup(self, key: str, count_miss: bool = False) -> t.Optional[str]:
+        """Return a cached answer (memory, then disk) and record the hit, or None.
+
+        count_miss records a None as a miss, for callers that go upstream without get_or_compute.
+        """
+        entry = self._get_memory(key)
+        if entry is None and self.db_path:
+            entry = await asyncio.to_thread(self._get_disk, key)
+            if entry is not None:
+                self._put_memory(key, entry)
+                self.disk_hits += 1
+        if entry is None:
+            if count_miss:
+                self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_latency += entry.latency
+        return entry.answer
+
+    async def store(self, key: str, answer: str, latency: float) -> None:
+        entry = CachedAnswer(answer, time.time() + self.ttl, latency)
+        self._put_memory(key, entry)
+        if self.db_path:
+            await asyncio.to_thread(self._put_disk, key, entry)
+
+    async def get_or_compute(self, key: str, compute: t.Callable[[], t.Awaitable[str]]) -> str:
+        cached = await self.lookup(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            answer, latency = await asyncio.shield(task)
+            self.saved_latency += latency
+            return answer
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._compute_and_store(key, compute))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None)
+        # shielded so a disconnecting leader does not cancel the call its followers wait on
+        answer, _ = await asyncio.shield(task)
+        return answer
+
+    async def _compute_and_store(self, key: str, compute: t.Callable[[], t.Awaitable[str]]) -> t.Tuple[str, float]:
+        start = time.monotonic()
+        answer = await compute()
+        latency = time.monotonic() - start
+        await self.store(key, answer, latency)
+        return answer, latency
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "disk": self.db_path,
+            "disk_max_entries": self.max_disk_entries if self.db_path else None,
+            "disk_pruned": self.disk_pruned,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "bypassed": self.bypassed,
+            "in_flight": len(self._inflight),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "saved_upstream_seconds": round(self.saved_latency, 3),
+        }
@@ -0,0 +1,328 @@
+# backend/search_index.py
+"""
+Full-text search over every course module and the interview question banks.
+
+An inverted index with BM25 scoring: each posting list is a pair of NumPy
+arrays (doc ids, precomputed BM25 term weights), so a query is one vectorized
+scatter-add per term followed by a partial sort for the top k.
+Fields are weighted BM25F-style (a topic title hit counts more than one in a
+code example).
+
+Indexes are immutable and swapped by reference like the dataset snapshots.
+SearchIndexer keeps the tokenized documents of every file keyed by its
+signature, so a rebuild after a dataset change only re-tokenizes what changed.
+"""
+import csv
+import math
+import os
+import re
+import threading
+import time
+import typing as t
+import logging
+
+import numpy as np
+
+from course_resolver import CourseResolver, course_key, normalize_text_for_match
+from dataset_cache import file_signature
+from metrics import observe_span
+
+logger = logging.getLogger("hiredai.search_index")
+
+K1 = 1.2
+B = 0.75
+# (field, weight) per document kind
+MODULE_FIELDS = (("topic_title", 2.0), ("module_name", 1.5), ("content_summary", 1.0), ("code_example", 0.5))
+QUESTION_FIELDS = (("question", 1.0),)
+SOURCES = ("course", "question_bank")
+SNIPPET_WIDTH = 160
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or that the this to what when where which who why with"
+    .split()
+)
+
+
+def tokenize(text: str) -> t.List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def query_terms(query: str) -> t.List[str]:
+    terms = [term for term in tokenize(query) if term not in STOPWORDS]
+    # a query of nothing but stopwords still searches for them
+    return list(dict.fromkeys(terms or tokenize(query)))
+
+
+def _text(value) -> str:
+    return value if isinstance(value, str) else ""
+
+
+class SearchDoc(t.NamedTuple):
+    source: str
+    # dataset stem for courses (aws_developer), bank name for questions (amazon)
+    course: str
+    filename: str
+    record: dict
+    fields: t.Tuple[t.Tuple[str, float], ...]
+
+
+class _FileDocs(t.NamedTuple):
+    signature: t.Any
+    docs: t.List[SearchDoc]
+    # per doc: weighted term frequencies and weighted length
+    term_freqs: t.List[t.Dict[str, float]]
+    lengths: t.List[float]
+
+
+def _tokenize_docs(docs: t.List[SearchDoc]) -> _FileDocs:
+    term_freqs, lengths = [], []
+    for doc in docs:
+        tf: t.Dict[str, float] = {}
+        length = 0.0
+        for field, weight in doc.fields:
+            tokens = tokenize(_text(doc.record.get(field)))
+            length += weight * len(tokens)
+            for token in tokens:
+                tf[token] = tf.get(token, 0.0) + weight
+        term_freqs.append(tf)
+        lengths.append(length)
+    return _FileDocs(None, docs, term_freqs, lengths)
+
+
+def make_snippet(text: str, terms: t.Collection[str], width: int = SNIPPET_WIDTH) -> t.Tuple[str, t.List[t.Tuple[int, int]]]:
+    """A window of text around the first query-term hit, with [start, end) offsets of every hit in it."""
+    hits = [(m.start(), m.end()) for m in _TOKEN_RE.finditer(text) if m.group().lower() in terms]
+    start = 0
+    if hits and hits[0][0] > width // 4:
+        start = text.rfind(" ", 0, hits[0][0] - width // 4) + 1
+    end = min(len(text), start + width)
+    if end < len(text):
+        cut = text.rfind(" ", start, end)
+        end = cut if cut > start else end
+    prefix = "…" if start > 0 else ""
+    snippet = prefix + text[start:end] + ("…" if end < len(text) else "")
+    shift = len(prefix) - start
+    highlights = [(s + shift, e + shift) for s, e in hits if s >= start and e <= end]
+    return snippet, highlights
+
+
+class SearchIndex:
+    """Immutable BM25 index over a list of SearchDocs."""
+
+    def __init__(self, files: t.List[_FileDocs], version: int = 0):
+        self.version = version
+        self.docs: t.List[SearchDoc] = [doc for f in files for doc in f.docs]
+        n = len(self.docs)
+        lengths = np.fromiter((length for f in files for length in f.lengths), dtype=np.float64, count=n)
+        avgdl = float(lengths.mean()) if n else 0.0
+        norm = K1 * (1 - B + B * lengths / avgdl) if avgdl else np.full(n, K1)
+
+        postings: t.Dict[str, t.Tuple[t.List[int], t.List[float]]] = {}
+        doc_id = 0
+        for f in files:
+            for tf in f.term_freqs:
+                k = norm[doc_id]
+                for term, freq in tf.items():
+                    ids, weights = postings.setdefault(term, ([], []))
+                    ids.append(doc_id)
+                    weights.append(freq * (K1 + 1) / (freq + k))
+                doc_id += 1
+        self._postings: t.Dict[str, t.Tuple[np.ndarray, np.ndarray]] = {}
+        for term, (ids, weights) in postings.items():
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            self._postings[term] = (np.asarray(ids, dtype=np.int32), np.asarray(weights, dtype=np.float32) * np.float32(idf))
+
+        self.courses = sorted({doc.course for doc in self.docs})
+        course_codes = {c: i for i, c in enumerate(self.courses)}
+        self._course_keys = {normalize_text_for_match(c): i for c, i in course_codes.items()}
+        self._doc_course = np.fromiter((course_codes[d.course] for d in self.docs), dtype=np.int32, count=n)
+        self.difficulties = sorted({_text(d.record.get("difficulty")) for d in self.docs} - {""})
+        difficulty_codes = {d.lower(): i for i, d in enumerate(self.difficulties)}
+        self._difficulty_codes = difficulty_codes
+        self._doc_difficulty = np.fromiter(
+            (difficulty_codes.get(_text(d.record.get("difficulty")).lower(), -1) for d in self.docs), dtype=np.int32, count=n,
+        )
+        self._doc_source = np.fromiter((SOURCES.index(d.source) for d in self.docs), dtype=np.int8, count=n)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @property
+    def terms(self) -> int:
+        return len(self._postings)
+
+    def course_codes(self, names: t.Iterable[str], resolver: t.Optional[CourseResolver] = None) -> t.List[int]:
+        """Codes for course filters given as dataset stems, display names or anything the resolver accepts."""
+        codes = []
+        for name in names:
+            code = self._course_keys.get(normalize_text_for_match(name))
+            if code is None and resolver is not None:
+                filename = resolver.resolve(name)
+                if filename is not None:
+                    code = self._course_keys.get(normalize_text_for_match(course_key(filename)))
+            if code is not None:
+                codes.append(code)
+        return codes
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        courses: t.Optional[t.List[int]] = None,
+        difficulties: t.Optional[t.Iterable[str]] = None,
+        source: t.Optional[str] = None,
+    ) -> t.Tuple[int, t.List[dict]]:
+        """Return (number of matching docs, top `limit` hits with snippets)."""
+        terms = query_terms(query)
+        postings = [self._postings[term] for term in terms if term in self._postings]
+        if not postings:
+            return 0, []
+        if len(postings) == 1:
+            candidates, scores = postings[0]
+        else:
+            # ids are unique within a posting list, so fancy-index accumulation is exact;
+            # every BM25 weight is positive, so nonzero means "matched some term"
+            dense = np.zeros(len(self.docs), dtype=np.float32)
+            for ids, weights in postings:
+                dense[ids] += weights
+            candidates = np.flatnonzero(dense)
+            scores = dense[candidates]
+
+        # filters are lookups into small boolean tables indexed by each candidate's code
+        mask = None
+        if courses is not None:
+            allowed = np.zeros(len(self.courses), dtype=bool)
+            allowed[courses] = True
+            mask = allowed[self._doc_course[candidates]]
+        if difficulties is not None:
+            # last slot stands for "no difficulty" (code -1)
+            allowed = np.zeros(len(self.difficulties) + 1, dtype=bool)
+            allowed[[self._difficulty_codes[d.lower()] for d in difficulties if d.lower() in self._difficulty_codes]] = True
+            m = allowed[self._doc_difficulty[candidates]]
+            mask = m if mask is None else mask & m
+        if source is not None:
+            m = self._doc_source[candidates] == SOURCES.index(source)
+            mask = m if mask is None else mask & m
+        if mask is not None:
+            candidates, scores = candidates[mask], scores[mask]
+
+        total = len(candidates)
+        if total > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(total)
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+        term_set = frozenset(terms)
+        return total, [self._hit(int(candidates[i]), float(scores[i]), term_set) for i in top]
+
+    def _hit(self, doc_id: int, score: float, terms: t.FrozenSet[str]) -> dict:
+        doc = self.docs[doc_id]
+        # snippet from the field with the most distinct query terms (ties: the higher-weighted field)
+        best_field, best_hits = doc.fields[0][0], -1
+        for field, _ in doc.fields:
+            hits = len(terms.intersection(tokenize(_text(doc.record.get(field)))))
+            if hits > best_hits:
+                best_field, best_hits = field, hits
+        snippet, highlights = make_snippet(_text(doc.record.get(best_field)), terms)
+        hit = {"score": round(score, 4), "source": doc.source, "course": doc.course, "filename": doc.filename}
+        if doc.source == "course":
+            for key in ("module_id", "module_name", "topic_title", "difficulty"):
+                hit[key] = doc.record.get(key)
+        else:
+            hit["question_id"] = doc.record.get("id")
+            hit["question"] = doc.record.get("question")
+        hit.update({"field": best_field, "snippet": snippet, "highlights": highlights})
+        return hit
+
+
+def read_question_bank(path: str) -> t.List[dict]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [row for row in csv.DictReader(f) if _text(row.get("question")).strip()]
+
+
+class SearchIndexer:
+    """Builds SearchIndexes from dataset snapshots plus the question-bank CSVs.
+
+    load_records(snapshot, filename) returns the full (Elaborate) records of a
+    course dataset. Rebuilds are serialized; ``current`` is swapped atomically.
+    """
+
+    def __init__(self, load_records: t.Callable[[t.Any, str], t.List[dict]], question_dir: t.Optional[str] = None):
+        self.load_records = load_records
+        self.question_dir = question_dir
+        self.current = SearchIndex([])
+        self._files: t.Dict[str, _FileDocs] = {}
+        self._built_from: t.Optional[t.Tuple[int, t.Dict[str, t.Any]]] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.last_build_ms: t.Optional[float] = None
+
+    def _question_banks(self) -> t.Dict[str, t.Tuple[int, int]]:
+        if not self.question_dir or not os.path.isdir(self.question_dir):
+            return {}
+        banks = {}
+        for f in sorted(os.listdir(self.question_dir)):
+            if f.lower().endswith("_clean.csv"):
+                try:
+                    banks[f] = file_signature(os.path.join(self.question_dir, f))
+                except FileNotFoundError:
+                    pass
+        return banks
+
+    def refresh(self, snapshot) -> SearchIndex:
+        """Rebuild if the snapshot or a question bank changed since the last build."""
+        with self._lock:
+            banks = self._question_banks()
+            if self._built_from == (snapshot.version, banks):
+                return self.current
+            start = time.perf_counter()
+            files: t.Dict[str, _FileDocs] = {}
+            for filename, signature in snapshot.signatures.items():
+                key = f"course:{filename}"
+                cached = self._files.get(key)
+                if cached is None or cached.signature != signature:
+                    try:
+                        records = self.load_records(snapshot, filename)
+                    except Exception as e:
+                        logger.warning("Not indexing %s: %s", filename, e)
+                        continue
+                    course = course_key(filename)
+                    docs = [SearchDoc("course", course, filename, r, MODULE_FIELDS) for r in records]
+                    cached = _tokenize_docs(docs)._replace(signature=signature)
+                files[key] = cached
+            for filename, signature in banks.items():
+                key = f"questions:{filename}"
+                cached = self._files.get(key)
+                if cached is None or cached.signature != signature:
+                    try:
+                        records = read_question_bank(os.path.join(self.question_dir, filename))
+                    except (OSError, csv.Error, UnicodeDecodeError) as e:
+                        logger.warning("Not indexing question bank %s: %s", filename, e)
+                        continue
+                    docs = [SearchDoc("question_bank", course_key(filename), filename, r, QUESTION_FIELDS) for r in records]
+                    cached = _tokenize_docs(docs)._replace(signature=signature)
+                files[key] = cached
+
+            index = SearchIndex(list(files.values()), version=self.current.version + 1)
+            self._files = files
+            self._built_from = (snapshot.version, banks)
+            self.current = index
+            duration = time.perf_counter() - start
+            self.builds += 1
+            self.last_build_ms = round(duration * 1000, 1)
+            observe_span("search_index_build", duration)
+            logger.info("Search index v%d: %d docs, %d terms from %d files in %.1fms",
+                        index.version, len(index), index.terms, len(files), duration * 1000)
+            return index
+
+    def stats(self) -> dict:
+        index = self.current
+        return {
+            "version": index.version,
+            "docs": len(index),
+            "terms": index.terms,
+            "courses": len(index.courses),
+            "builds": self.builds,
+            "last_build_ms": self.last_build_ms,
+        }
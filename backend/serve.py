@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Pre-fork server entry point: warm up once in the master, then fork uvicorn
+workers that share the listening socket and, copy-on-write, everything the
+master loaded.
+
+    python serve.py --workers 4 --port 8000
+
+The master imports the heavy modules, builds the app, recompiles the dataset
+pack if it is missing or stale and loads every dataset into the cache, then
+freezes the GC (so collections in the workers do not dirty the shared pages),
+binds the socket and forks. Workers that die are replaced; SIGTERM/SIGINT
+shut them all down gracefully. Startup phases (imports, app construction,
+dataset load) are logged and reported by /api/health and /api/ready.
+"""
+
+import startup  # noqa: F401  (first: starts the startup clock)
+
+import argparse
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+# Imported here so the workers inherit them instead of importing on first use
+import numpy  # noqa: F401
+import pandas  # noqa: F401
+import uvicorn
+
+logger = logging.getLogger("hiredai.serve")
+
+# A worker that dies sooner than this after starting is not respawned immediately
+MIN_WORKER_LIFETIME = 1.0
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, log_level: str) -> None:
+    gc.enable()
+    # forked workers would otherwise share one RNG state (retry jitter, log sampling)
+    random.seed()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level, lifespan="on"))
+    server.run(sockets=[sock])
+
+
+def spawn_worker(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(app, sock, log_level)
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def supervise(app, sock: socket.socket, workers: int, log_level: str, graceful_timeout: float) -> int:
+    children = {}
+    stopping = False
+
+    def start_one():
+        pid = spawn_worker(app, sock, log_level)
+        children[pid] = time.monotonic()
+        logger.info("Started worker %d", pid)
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        if not stopping:
+            logger.info("Received %s; stopping %d workers", signal.Signals(signum).name, len(children))
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        start_one()
+
+    deadline = None
+    while children:
+        if stopping and deadline is None:
+            deadline = time.monotonic() + graceful_timeout
+        if deadline is not None and time.monotonic() > deadline:
+            for pid in list(children):
+                logger.warning("Worker %d did not exit in %.0fs; killing it", pid, graceful_timeout)
+                os.kill(pid, signal.SIGKILL)
+            deadline = float("inf")
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            time.sleep(0.1)
+            continue
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        logger.warning("Worker %d exited with status %d; replacing it", pid, os.waitstatus_to_exitcode(status))
+        if time.monotonic() - started < MIN_WORKER_LIFETIME:
+            time.sleep(MIN_WORKER_LIFETIME)
+        if not stopping:
+            start_one()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info").lower())
+    parser.add_argument("--graceful-timeout", type=float, default=30.0)
+    parser.add_argument("--no-compile-pack", action="store_true", help="load stale datasets from CSV instead of recompiling the pack")
+    args = parser.parse_args()
+
+    # nothing allocated during warm-up is garbage; skip collections until the workers run
+    gc.disable()
+    import main as backend
+
+    # marks the process ready before forking, so workers skip their own warm-up
+    backend.warm_up(compile_stale_pack=not args.no_compile_pack)
+    sock = bind_socket(args.host, args.port, args.backlog)
+    logger.info("Listening on %s:%d", args.host, args.port)
+
+    if args.workers <= 1 or not hasattr(os, "fork"):
+        gc.enable()
+        uvicorn.Server(uvicorn.Config(backend.app, log_level=args.log_level, lifespan="on")).run(sockets=[sock])
+        return 0
+
+    gc.freeze()
+    return supervise(backend.app, sock, args.workers, args.log_level, args.graceful_timeout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# backend/startup.py
+"""
+Startup phase timings and the readiness flag behind /api/ready.
+
+The clock starts when this module is first imported, so entry points import it
+before anything heavy. Each phase runs from the end of the previous one (or
+is timed as a block with ``phase()``), so the phases add up to the time spent
+getting ready.
+"""
+import threading
+import time
+import typing as t
+import logging
+
+logger = logging.getLogger("hiredai.startup")
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._checkpoint = self.started
+        self.phases: t.Dict[str, float] = {}
+        self.ready = threading.Event()
+        self.ready_after: t.Optional[float] = None
+        self.warmup_error: t.Optional[str] = None
+
+    def mark(self, name: str) -> float:
+        """Record the time since the previous checkpoint as phase `name`."""
+        now = time.perf_counter()
+        elapsed = now - self._checkpoint
+        self._checkpoint = now
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+        logger.info("Startup phase %s: %.1fms", name, elapsed * 1000)
+        return elapsed
+
+    def phase(self, name: str) -> "_Phase":
+        """Time just the enclosed block as phase `name`."""
+        return _Phase(self, name)
+
+    def mark_ready(self, error: t.Optional[str] = None) -> None:
+        self.warmup_error = error
+        self.ready_after = time.perf_counter() - self.started
+        self.ready.set()
+        breakdown = ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.phases.items())
+        logger.info("Ready %.1fms after start (%s)", self.ready_after * 1000, breakdown)
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready.is_set(),
+            "ready_after_ms": round(self.ready_after * 1000, 1) if self.ready_after is not None else None,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "warmup_error": self.warmup_error,
+        }
+
+
+class _Phase:
+    __slots__ = ("_timer", "_name")
+
+    def __init__(self, timer: StartupTimer, name: str):
+        self._timer = timer
+        self._name = name
+
+    def __enter__(self):
+        self._timer._checkpoint = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._timer.mark(self._name)
+        return False
+
+
+STARTUP = StartupTimer()
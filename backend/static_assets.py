@@ -0,0 +1,193 @@
+# backend/static_assets.py
+"""
+In-memory file table for the built frontend (FRONTEND_DIST_DIR).
+
+The dist directory is indexed once at startup: small files are held in memory
+together with their gzip/brotli variants (taken from .gz/.br siblings written
+at build time, or compressed at boot), so SPA routes and hashed assets are
+served without touching the filesystem. Content-hashed Vite assets get an
+immutable Cache-Control; index.html is revalidated through its ETag.
+
+Run as a script to write .gz/.br siblings at build time:
+
+    python static_assets.py dist
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+import typing as t
+import logging
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+from encoded_response import brotli, choose_encoding, etag_matches
+
+logger = logging.getLogger("hiredai.static_assets")
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/xml")
+# Vite emits names like index-V6t8lALd.js / index-1_rgf39z.css: exactly 8 hash characters.
+# The hash must also contain a digit, capital or underscore, so a plain word such as
+# app-settings.js is never cached as immutable (a hash made only of lowercase letters
+# just gets the default max-age).
+HASHED_NAME_RE = re.compile(r"-(?=[A-Za-z0-9_-]{0,7}[A-Z0-9_])[A-Za-z0-9_-]{8}\.[a-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+DEFAULT_CACHE = "public, max-age=3600"
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _response(request: Request, body: bytes, status_code: int, media_type: str, headers: t.Dict[str, str]) -> Response:
+    """The response for GET; for HEAD the same headers (Content-Length included) without the body."""
+    if request.method == "HEAD":
+        headers = {**headers, "Content-Length": str(len(body))}
+        body = b""
+    return Response(body, status_code=status_code, media_type=media_type, headers=headers)
+
+
+class StaticAsset:
+    __slots__ = ("path", "size", "content_type", "etag", "cache_control", "data", "variants")
+
+    def __init__(self, path: str, relpath: str, max_memory_size: int):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type == "application/javascript":
+            self.content_type += "; charset=utf-8"
+        if relpath == "index.html":
+            self.cache_control = REVALIDATE_CACHE
+        elif relpath.startswith("assets/") and HASHED_NAME_RE.search(os.path.basename(relpath)):
+            self.cache_control = IMMUTABLE_CACHE
+        else:
+            self.cache_control = DEFAULT_CACHE
+        self.data: t.Optional[bytes] = None
+        self.variants: t.Dict[str, bytes] = {}
+        self.etag: t.Optional[str] = None
+        if self.size <= max_memory_size or relpath == "index.html":
+            with open(path, "rb") as f:
+                self.data = f.read()
+            self.etag = f'"{hashlib.sha256(self.data).hexdigest()[:32]}"'
+            if _is_compressible(self.content_type):
+                self._load_variants()
+
+    def _load_variants(self) -> None:
+        for encoding, suffix in (("gzip", ".gz"), ("br", ".br")):
+            sibling = self.path + suffix
+            if os.path.isfile(sibling) and os.path.getmtime(sibling) >= os.path.getmtime(self.path):
+                with open(sibling, "rb") as f:
+                    self.variants[encoding] = f.read()
+        if "gzip" not in self.variants:
+            self.variants["gzip"] = gzip.compress(self.data, compresslevel=9, mtime=0)
+        if "br" not in self.variants and brotli is not None:
+            self.variants["br"] = brotli.compress(self.data, quality=11)
+        # keep only variants that actually save bytes
+        self.variants = {enc: v for enc, v in self.variants.items() if len(v) < len(self.data)}
+
+
+class AssetServer:
+    def __init__(self, dist_dir: str, max_memory_size: int = 4 * 1024 * 1024):
+        self.dist_dir = dist_dir
+        self.assets: t.Dict[str, StaticAsset] = {}
+        if not os.path.isdir(dist_dir):
+            self.index = None
+            return
+        for root, _, files in os.walk(dist_dir):
+            for name in files:
+                if name.endswith((".gz", ".br")) and os.path.isfile(os.path.join(root, name[:-3])):
+                    continue
+                path = os.path.join(root, name)
+                relpath = os.path.relpath(path, dist_dir).replace(os.sep, "/")
+                self.assets[relpath] = StaticAsset(path, relpath, max_memory_size)
+        self.index = self.assets.get("index.html")
+        in_memory = sum(a.size for a in self.assets.values() if a.data is not None)
+        logger.info("Indexed %d frontend files from %s (%d bytes in memory)", len(self.assets), dist_dir, in_memory)
+
+    def lookup(self, relpath: str) -> t.Optional[StaticAsset]:
+        return self.assets.get(relpath.lstrip("/"))
+
+    def serve(self, request: Request, asset: StaticAsset) -> Response:
+        headers = {"Cache-Control": asset.cache_control, "Accept-Ranges": "bytes"}
+        if asset.data is None:
+            # large files stay on disk; FileResponse handles Range and ETag itself
+            return FileResponse(asset.path, media_type=asset.content_type, headers=headers)
+
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+        headers["ETag"] = asset.etag
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, asset.etag):
+            return Response(status_code=304, headers=headers)
+
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (not if_range or if_range == asset.etag):
+            response = self._range_response(request, asset, range_header, headers)
+            if response is not None:
+                return response
+
+        encoding = choose_encoding(request.headers.get("accept-encoding", "")) if asset.variants else None
+        if encoding in asset.variants:
+            headers["Content-Encoding"] = encoding
+            headers["ETag"] = f'{asset.etag[:-1]}-{encoding}"'
+            return _response(request, asset.variants[encoding], 200, asset.content_type, headers)
+        return _response(request, asset.data, 200, asset.content_type, headers)
+
+    @staticmethod
+    def _range_response(request: Request, asset: StaticAsset, range_header: str, headers: t.Dict[str, str]) -> t.Optional[Response]:
+        """206 for a single satisfiable range, 416 if it cannot be satisfied.
+
+        None for anything else (malformed, multiple ranges): the caller ignores
+        the header and sends the full body, as RFC 9110 allows.
+        """
+        size = len(asset.data)
+        m = _RANGE_RE.match(range_header.strip())
+        if not m or not (m.group(1) or m.group(2)):
+            return None
+        if m.group(1):
+            start = int(m.group(1))
+            end = int(m.group(2)) if m.group(2) else size - 1
+            if m.group(2) and end < start:
+                return None
+        else:
+            start = max(0, size - int(m.group(2)))
+            end = size - 1
+        end = min(end, size - 1)
+        if start > end:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        headers = {**headers, "Content-Range": f"bytes {start}-{end}/{size}"}
+        return _response(request, asset.data[start:end + 1], 206, asset.content_type, headers)
+
+
+def precompress_dist(dist_dir: str) -> int:
+    """Write .gz (and .br when brotli is installed) next to every compressible file."""
+    written = 0
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            if name.endswith((".gz", ".br")):
+                continue
+            path = os.path.join(root, name)
+            content_type = mimetypes.guess_type(path)[0] or ""
+            if not _is_compressible(content_type):
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append((".br", brotli.compress(data, quality=11)))
+            for suffix, compressed in variants:
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "dist")
+    print(f"✅ Wrote {precompress_dist(target)} precompressed files under {target}")
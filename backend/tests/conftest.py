@@ -0,0 +1,13 @@
+# backend/tests/conftest.py
+"""Run from the repo root or backend/: the backend modules are imported as top-level siblings."""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# main reads its configuration at import: quiet logs, no background watcher, warm-up driven by the tests
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("DATASET_WATCH", "off")
+os.environ.setdefault("WARM_UP_ON_STARTUP", "0")
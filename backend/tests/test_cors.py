@@ -0,0 +1,129 @@
+# backend/tests/test_cors.py
+"""middleware.CORSMiddleware must answer like the Starlette CORSMiddleware + OPTIONS route it replaced."""
+import re
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware as StarletteCORSMiddleware
+from fastapi.testclient import TestClient
+
+from middleware import CORSMiddleware
+
+FRONTEND_ORIGINS = ["http://localhost:8080", "http://127.0.0.1:3000", "https://hiredai-frontend.vercel.app"]
+ALLOW_ORIGIN_REGEX = r"^https://([A-Za-z0-9-]+\.)?vercel\.app$"
+
+ORIGINS = [
+    None,
+    "http://localhost:8080",  # FRONTEND_ORIGINS entry
+    "http://127.0.0.1:3000",
+    "https://preview-123.vercel.app",  # regex
+    "https://vercel.app",
+    "http://preview.vercel.app",  # wrong scheme
+    "https://a.b.vercel.app",  # nested subdomain
+    "https://evil.example.com",
+    "http://localhost:9999",
+]
+COMPARED_HEADERS = (
+    "access-control-allow-origin", "access-control-allow-credentials", "access-control-allow-headers", "vary",
+)
+
+
+def add_routes(app: FastAPI) -> FastAPI:
+    @app.get("/api/items")
+    def items():
+        return {"items": []}
+
+    @app.post("/api/items")
+    def create_item():
+        return {"ok": True}
+
+    # like main's API and SPA fallbacks, so unknown paths never reach the OPTIONS-only route as a 405
+    @app.api_route("/{rest:path}", methods=["GET", "POST"])
+    def fallback(rest: str):
+        return Response(status_code=404)
+
+    return app
+
+
+def reference_app() -> FastAPI:
+    """The configuration before the pure ASGI middleware: Starlette CORS plus a catch-all OPTIONS route."""
+    app = add_routes(FastAPI())
+    app.add_middleware(
+        StarletteCORSMiddleware, allow_origins=FRONTEND_ORIGINS, allow_origin_regex=ALLOW_ORIGIN_REGEX,
+        allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+    )
+    origin_re = re.compile(ALLOW_ORIGIN_REGEX)
+
+    @app.options("/{rest_of_path:path}")
+    async def preflight_handler(rest_of_path: str, request: Request):
+        origin = request.headers.get("origin")
+        if not origin:
+            return Response(status_code=200)
+        if origin in FRONTEND_ORIGINS or origin_re.match(origin):
+            return Response(status_code=200, headers={
+                "Access-Control-Allow-Origin": origin,
+                "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+                "Access-Control-Allow-Headers": request.headers.get("access-control-request-headers", "*"),
+                "Access-Control-Allow-Credentials": "true",
+            })
+        return Response(status_code=403, content="Origin not allowed")
+
+    return app
+
+
+def new_app() -> FastAPI:
+    app = add_routes(FastAPI())
+    app.add_middleware(CORSMiddleware, allow_origins=FRONTEND_ORIGINS, allow_origin_regex=ALLOW_ORIGIN_REGEX)
+    return app
+
+
+@pytest.fixture(scope="module")
+def clients():
+    return TestClient(reference_app()), TestClient(new_app())
+
+
+def request_headers(origin, extra):
+    headers = dict(extra)
+    if origin is not None:
+        headers["Origin"] = origin
+    return headers
+
+
+def assert_same(reference, new):
+    assert new.status_code == reference.status_code
+    for name in COMPARED_HEADERS:
+        assert new.headers.get(name) == reference.headers.get(name), name
+
+
+REQUESTS = {
+    "get": ("GET", {}),
+    "post": ("POST", {"Content-Type": "application/json"}),
+    "preflight": ("OPTIONS", {"Access-Control-Request-Method": "POST"}),
+    "preflight_with_headers": ("OPTIONS", {"Access-Control-Request-Method": "POST", "Access-Control-Request-Headers": "content-type,authorization"}),
+    "preflight_bad_method": ("OPTIONS", {"Access-Control-Request-Method": "BREW"}),
+    "bare_options": ("OPTIONS", {}),
+    "bare_options_with_headers": ("OPTIONS", {"Access-Control-Request-Headers": "x-token"}),
+}
+
+
+@pytest.mark.parametrize("kind", list(REQUESTS))
+@pytest.mark.parametrize("origin", ORIGINS)
+@pytest.mark.parametrize("path", ["/api/items", "/api/missing", "/dashboard"])
+def test_matches_reference(clients, kind, origin, path):
+    method, extra = REQUESTS[kind]
+    reference, new = clients
+    headers = request_headers(origin, extra)
+    assert_same(reference.request(method, path, headers=headers), new.request(method, path, headers=headers))
+
+
+def test_preflight_sends_max_age(clients):
+    response = clients[1].options("/api/items", headers={"Origin": "http://localhost:8080", "Access-Control-Request-Method": "GET"})
+    assert response.headers["access-control-max-age"] == "600"
+
+
+def test_origin_decisions_are_cached_and_bounded():
+    middleware = CORSMiddleware(None, allow_origins=FRONTEND_ORIGINS, allow_origin_regex=ALLOW_ORIGIN_REGEX, cache_size=4)
+    for i in range(10):
+        assert not middleware.is_allowed_origin(f"https://evil{i}.example.com")
+    assert len(middleware._decisions) <= 4
+    assert middleware.is_allowed_origin("https://x.vercel.app")
@@ -0,0 +1,87 @@
+# backend/tests/test_course_ranker.py
+"""Batch learning-path ranking: vectorized results match a per-user loop, and the batch size is bounded."""
+import random
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from course_ranker import STYLES, CourseRanker, course_features, style_weights
+
+
+@pytest.fixture(scope="module")
+def ranker():
+    rng = np.random.default_rng(0)
+    features = rng.random((12, 6))
+    return CourseRanker([f"course_{i:02d}" for i in range(12)], [f"course_{i:02d}_learning.csv" for i in range(12)], features)
+
+
+def test_matches_per_user_ranking(ranker):
+    rng = random.Random(1)
+    scores = [[rng.randint(0, 10) for _ in STYLES] for _ in range(500)]
+    dominant = [rng.choice(STYLES) for _ in scores]
+    courses, course_scores = ranker.recommend(scores, dominant, 4)
+
+    weights = style_weights(scores, dominant)
+    for i, w in enumerate(weights):
+        per_course = w @ ranker.style_scores
+        expected = sorted(range(len(ranker)), key=lambda c: (-per_course[c], c))[:4]
+        assert courses[i] == [ranker.courses[c] for c in expected]
+        assert course_scores[i] == pytest.approx([per_course[c] for c in expected], abs=1e-4)
+
+
+def test_zero_scores_fall_back_to_dominant_style():
+    weights = style_weights([[0, 0, 0], [0, 0, 0], [2, 0, 2]], ["Realistic", "unknown", "Short"])
+    assert weights.tolist() == [[0, 0, 1], [0, 0, 0], [0.5, 0, 0.5]]
+
+
+def test_top_k_beyond_catalogue_and_empty_catalogue(ranker):
+    courses, _ = ranker.recommend([[1, 2, 3]], ["Short"], 50)
+    assert sorted(courses[0]) == ranker.courses
+    empty = CourseRanker([], [], np.zeros((0, 6)))
+    assert empty.recommend([[1, 2, 3]], ["Short"], 3) == ([[]], [[]])
+
+
+def test_course_features():
+    records = [
+        {"module_name": "A", "difficulty": "Beginner", "code_example": "x = 1"},
+        {"module_name": "A", "difficulty": "Advanced", "code_example": None},
+        {"module_name": "B", "difficulty": "advanced", "code_example": "y = 2"},
+        {"module_name": "B", "difficulty": None, "code_example": ""},
+    ]
+    assert course_features(records).tolist() == pytest.approx([0.25, 0.0, 0.5, np.log1p(4), np.log1p(2), 0.5])
+
+
+@pytest.fixture(scope="module")
+def client():
+    main.course_ranker.refresh(main.dataset_store.reload("test", notify=False))
+    return TestClient(main.app)
+
+
+def assessment(style: str) -> dict:
+    return {"dominantStyle": style, "scores": {s: 5 if s == style else 1 for s in STYLES}, "percentage": 70}
+
+
+def test_batch_endpoint(client):
+    response = client.post("/api/predict-learning-path/batch", json={
+        "assessments": [assessment(s) for s in STYLES], "top_k": 2, "include_previews": True, "preview_size": 1,
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 3
+    assert [r["user_category"] for r in body["results"]] == list(STYLES)
+    recommended = {c for r in body["results"] for c in r["recommended_courses"]}
+    assert recommended <= set(main.course_ranker.current.courses)
+    assert set(body["previews"]) == recommended
+    for previews in body["previews"].values():
+        assert set(previews) == set(STYLES)
+        assert all(len(records) <= 1 for records in previews.values())
+
+
+def test_batch_size_is_bounded_by_the_model(client):
+    limit = main.PREDICT_BATCH_MAX
+    response = client.post("/api/predict-learning-path/batch", json={"assessments": [assessment("Short")] * (limit + 1)})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+    assert client.post("/api/predict-learning-path/batch", json={"assessments": []}).status_code == 422
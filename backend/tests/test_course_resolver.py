@@ -0,0 +1,98 @@
+# backend/tests/test_course_resolver.py
+"""CourseResolver must pick the same file as the per-request scan it replaced."""
+import difflib
+import os
+import random
+import typing as t
+import urllib.parse
+
+import pytest
+
+from course_resolver import CourseResolver, candidate_filenames, normalize_text_for_match, tokens_from
+
+
+def reference_find(files: t.List[str], course_name: str) -> t.Optional[str]:
+    """The original find_dataset_filename_for_course tiers, minus the directory listing.
+
+    The original iterated its candidate filenames as a set; they are tried in
+    list order here, which is one of the orders that set could produce.
+    """
+    if not files:
+        return None
+    try:
+        decoded = urllib.parse.unquote(course_name)
+    except Exception:
+        decoded = course_name
+    norm_input = normalize_text_for_match(decoded)
+    lower_map = {f.lower(): f for f in files}
+    basenames = {os.path.splitext(f)[0].lower(): f for f in files}
+
+    for cand in candidate_filenames(norm_input):
+        if cand in lower_map:
+            return lower_map[cand]
+
+    input_tokens = tokens_from(norm_input)
+    if input_tokens:
+        for base_lower, orig_filename in basenames.items():
+            if all(tok in base_lower for tok in input_tokens):
+                return orig_filename
+
+    matches = difflib.get_close_matches(norm_input, list(basenames.keys()), n=1, cutoff=0.55)
+    if matches:
+        return basenames[matches[0]]
+
+    for base_lower, orig_filename in basenames.items():
+        if any(tok in base_lower for tok in input_tokens):
+            return orig_filename
+    return None
+
+
+def random_word(rng: random.Random, alphabet: str, low: int, high: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(low, high)))
+
+
+def random_case(rng: random.Random) -> t.Tuple[t.List[str], str]:
+    # a small alphabet makes partial, fuzzy and multi-file matches common
+    alphabet = "abcdefg"
+    files = []
+    for _ in range(rng.randint(1, 6)):
+        stem = random_word(rng, alphabet, 3, 9)
+        files.append(stem + rng.choice([".csv", "_learning.csv", ".CSV"]))
+    if rng.random() < 0.3:
+        query = os.path.splitext(rng.choice(files))[0].replace("_learning", "")
+    else:
+        query = " ".join(random_word(rng, alphabet, 1, 5) for _ in range(rng.randint(1, 3)))
+    if rng.random() < 0.2:
+        query = urllib.parse.quote(query.replace(" ", rng.choice(["-", "_", " "])))
+    return files, query
+
+
+def test_known_fuzzy_regression():
+    files = ["bgcedg.csv", "bdgbddgg.csv", "cbaegece.csv"]
+    assert CourseResolver(files).resolve("bdgb cebd g") == reference_find(files, "bdgb cebd g") == "bgcedg.csv"
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_randomized_parity(seed):
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(5000):
+        files, query = random_case(rng)
+        expected = reference_find(files, query)
+        got = CourseResolver(files).resolve(query)
+        if got != expected:
+            mismatches.append((files, query, expected, got))
+    assert not mismatches, mismatches[:5]
+
+
+def test_real_course_names():
+    files = sorted(f for f in os.listdir(os.path.join(os.path.dirname(__file__), "..", "datasets")) if f.endswith(".csv"))
+    resolver = CourseResolver(files)
+    for query in ["Advanced React Patterns", "aws-developer", "typescript", "data%20structures", "react", "cloud", "zzz"]:
+        assert resolver.resolve(query) == reference_find(files, query)
+
+
+def test_memoized_result_matches_uncached():
+    resolver = CourseResolver(["aws_developer_learning.csv", "typescript_deep_dive_learning.csv"])
+    assert resolver.resolve("typescript") == resolver.resolve("typescript") == "typescript_deep_dive_learning.csv"
+    assert resolver.resolve("nothing like it") is None
@@ -0,0 +1,46 @@
+# backend/tests/test_dataset_cache.py
+"""Dataset cache accounting: requests served from the snapshot's preloaded entries count as hits."""
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture(scope="module")
+def client():
+    main.dataset_store.reload("test", notify=False)
+    return TestClient(main.app)
+
+
+def metric_value(text: str, result: str) -> float:
+    match = re.search(r'^hiredai_dataset_cache_lookups_total\{result="%s"\} (\S+)$' % result, text, re.MULTILINE)
+    return float(match.group(1))
+
+
+def test_snapshot_reads_count_as_hits(client):
+    assert "aws_developer_learning.csv" in main.dataset_store.current.entries
+    before = main.dataset_cache.stats()
+    metrics_before = client.get("/api/metrics").text
+
+    for _ in range(20):
+        assert client.get("/api/learning-path/aws_developer").status_code == 200
+
+    after = main.dataset_cache.stats()
+    assert after["hits"] - before["hits"] == 20
+    assert after["misses"] == before["misses"]
+    assert client.get("/api/health").json()["dataset_cache"]["hits"] >= after["hits"]
+    metrics_after = client.get("/api/metrics").text
+    assert metric_value(metrics_after, "hit") - metric_value(metrics_before, "hit") >= 20
+    assert metric_value(metrics_after, "miss") == metric_value(metrics_before, "miss")
+
+
+def test_loads_beyond_the_snapshot_count_as_misses_then_hits(tmp_path):
+    path = tmp_path / "course_learning.csv"
+    path.write_text("module_id,module_name,topic_title\n1,Intro,Hello\n")
+    cache = main.DatasetCache()
+    cache.get(str(path))
+    cache.get(str(path))
+    cache.record_hit()
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
\ No newline at end of file
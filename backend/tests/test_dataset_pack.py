@@ -0,0 +1,131 @@
+# backend/tests/test_dataset_pack.py
+"""Dataset pack: fresh entries decode from the pack; stale, corrupt or truncated packs fall back to the CSV."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import dataset_pack
+from dataset_cache import DatasetCache, build_mode_views, sha256_file
+from dataset_pack import DatasetPack, PackError, compile_pack
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CSV = "module_id,module_name,topic_title,difficulty\n" + "".join(
+    f"{i},Module {i // 2},Topic {i},{('Beginner', 'Intermediate', 'Advanced')[i % 3]}\n" for i in range(10)
+)
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    dataset_dir = tmp_path / "datasets"
+    dataset_dir.mkdir()
+    csv_path = dataset_dir / "aws_developer_learning.csv"
+    csv_path.write_text(CSV)
+    pack_path = tmp_path / "datasets.pack"
+    compile_pack(str(dataset_dir), str(pack_path))
+    return dataset_dir, csv_path, pack_path
+
+
+def load(pack_path, csv_path) -> DatasetCache:
+    cache = DatasetCache(pack=DatasetPack.open_if_exists(str(pack_path)))
+    cache.get(str(csv_path))
+    return cache
+
+
+def check(dataset_dir, pack_path) -> int:
+    return subprocess.run(
+        [sys.executable, os.path.join(BACKEND_DIR, "compile_datasets.py"), "--check",
+         "--dataset-dir", str(dataset_dir), "--output", str(pack_path)],
+        capture_output=True, cwd=BACKEND_DIR,
+    ).returncode
+
+
+def test_fresh_entries_load_from_the_pack(compiled):
+    dataset_dir, csv_path, pack_path = compiled
+    cache = load(pack_path, csv_path)
+
+    assert (cache.pack_loads, cache.csv_loads) == (1, 0)
+    assert cache.get(str(csv_path)).views == build_mode_views(str(csv_path))
+    assert check(dataset_dir, pack_path) == 0
+
+
+def test_changed_size_is_stale(compiled):
+    dataset_dir, csv_path, pack_path = compiled
+    with open(csv_path, "a") as f:
+        f.write("10,Module 5,Topic 10,Beginner\n")
+
+    pack = DatasetPack(str(pack_path))
+    st = os.stat(csv_path)
+    assert not pack.is_fresh(str(csv_path), (st.st_mtime_ns, st.st_size))
+    cache = load(pack_path, csv_path)
+    assert (cache.pack_loads, cache.csv_loads) == (0, 1)
+    assert len(cache.get(str(csv_path)).views["Elaborate"]) == 11
+    assert check(dataset_dir, pack_path) == 1
+
+
+def test_touched_but_unchanged_file_is_still_fresh(compiled, monkeypatch):
+    dataset_dir, csv_path, pack_path = compiled
+    st = os.stat(csv_path)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    hashed = []
+    monkeypatch.setattr(dataset_pack, "sha256_file", lambda path: hashed.append(path) or sha256_file(path))
+
+    pack = DatasetPack(str(pack_path))
+    signature = (os.stat(csv_path).st_mtime_ns, st.st_size)
+    assert pack.is_fresh(str(csv_path), signature)
+    # the hash is checked once per signature, then remembered
+    assert pack.is_fresh(str(csv_path), signature)
+    assert hashed == [str(csv_path)]
+    assert load(pack_path, csv_path).pack_loads == 1
+    assert check(dataset_dir, pack_path) == 0
+
+
+def test_same_size_different_content_is_stale(compiled):
+    dataset_dir, csv_path, pack_path = compiled
+    csv_path.write_text(CSV.replace("Topic 1,", "Topic X,"))
+    assert os.path.getsize(csv_path) == len(CSV)
+
+    cache = load(pack_path, csv_path)
+    assert (cache.pack_loads, cache.csv_loads) == (0, 1)
+    assert cache.get(str(csv_path)).views["Elaborate"][1]["topic_title"] == "Topic X"
+    assert check(dataset_dir, pack_path) == 1
+
+
+def test_corrupt_payload_falls_back_to_csv(compiled):
+    dataset_dir, csv_path, pack_path = compiled
+    data = bytearray(pack_path.read_bytes())
+    # flip a byte inside the last record of the last view (ASCII digit -> another digit)
+    offset = data.rindex(b"Topic ") + len(b"Topic ")
+    data[offset] ^= 0x01
+    pack_path.write_bytes(bytes(data))
+
+    pack = DatasetPack(str(pack_path))
+    with pytest.raises(PackError, match="Checksum mismatch"):
+        pack.load_views(str(csv_path))
+    cache = load(pack_path, csv_path)
+    assert (cache.pack_loads, cache.csv_loads) == (0, 1)
+    assert cache.get(str(csv_path)).views == build_mode_views(str(csv_path))
+    assert check(dataset_dir, pack_path) == 1
+
+
+def test_truncated_pack_is_ignored(compiled):
+    dataset_dir, csv_path, pack_path = compiled
+    data = pack_path.read_bytes()
+    pack_path.write_bytes(data[:-10])
+
+    with pytest.raises(PackError, match="truncated"):
+        DatasetPack(str(pack_path))
+    assert DatasetPack.open_if_exists(str(pack_path)) is None
+    cache = load(pack_path, csv_path)
+    assert (cache.pack_loads, cache.csv_loads) == (0, 1)
+    assert check(dataset_dir, pack_path) == 1
+
+
+def test_not_a_pack_and_missing_pack(compiled, tmp_path):
+    dataset_dir, _, pack_path = compiled
+    pack_path.write_bytes(b"not a pack at all")
+    assert DatasetPack.open_if_exists(str(pack_path)) is None
+    assert DatasetPack.open_if_exists(str(tmp_path / "missing.pack")) is None
+    assert check(dataset_dir, tmp_path / "missing.pack") == 1
\ No newline at end of file
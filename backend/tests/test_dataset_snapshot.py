@@ -0,0 +1,206 @@
+# backend/tests/test_dataset_snapshot.py
+"""Dataset hot reload: snapshots follow DATASET_DIR, never parse a half-written CSV, and stay consistent.
+
+The watcher runs in poll mode on a temp dir; every published snapshot is
+recorded through a listener and checked against the directory it came from.
+"""
+import threading
+import time
+import typing as t
+
+import pytest
+
+from dataset_cache import DatasetCache
+from dataset_snapshot import DatasetSnapshot, DatasetWatcher, SnapshotStore
+
+HEADER = "module_id,module_name,topic_title,difficulty\n"
+
+
+def csv_rows(n: int, label: str = "topic") -> str:
+    return HEADER + "".join(f"{i},Module {i // 3},{label} {i},Beginner\n" for i in range(n))
+
+
+def wait_for(condition: t.Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class Recorder:
+    """Listener that keeps every published snapshot."""
+
+    def __init__(self):
+        self.snapshots: t.List[DatasetSnapshot] = []
+
+    def __call__(self, snapshot: DatasetSnapshot) -> None:
+        self.snapshots.append(snapshot)
+
+    @property
+    def last(self) -> DatasetSnapshot:
+        return self.snapshots[-1]
+
+
+def assert_consistent(snapshot: DatasetSnapshot) -> None:
+    # resolver, signatures and entries all come from one listing
+    assert sorted(snapshot.resolver.files) == sorted(snapshot.signatures)
+    assert set(snapshot.entries) <= set(snapshot.signatures)
+    for filename, entry in snapshot.entries.items():
+        assert entry.signature == snapshot.signatures[filename]
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    (tmp_path / "aws_developer_learning.csv").write_text(csv_rows(6))
+    (tmp_path / "typescript_deep_dive_learning.csv").write_text(csv_rows(9))
+    return tmp_path
+
+
+@pytest.fixture
+def store(dataset_dir):
+    store = SnapshotStore(str(dataset_dir), DatasetCache(), settle_seconds=0.1)
+    store.reload("warm-up", notify=False)
+    return store
+
+
+@pytest.fixture
+def watched(store):
+    recorder = Recorder()
+    store.add_listener(recorder)
+    watcher = DatasetWatcher(store, mode="poll", poll_interval=0.05)
+    watcher.start()
+    yield store, recorder
+    watcher.stop()
+    for snapshot in recorder.snapshots:
+        assert_consistent(snapshot)
+    versions = [s.version for s in recorder.snapshots]
+    assert versions == sorted(set(versions))
+
+
+def test_warm_up_loads_every_dataset(store):
+    snapshot = store.current
+    assert snapshot.version == 1
+    assert set(snapshot.entries) == {"aws_developer_learning.csv", "typescript_deep_dive_learning.csv"}
+    assert len(snapshot.entries["typescript_deep_dive_learning.csv"].views["Elaborate"]) == 9
+    assert snapshot.resolver.resolve("aws developer") == "aws_developer_learning.csv"
+    assert_consistent(snapshot)
+
+
+def test_reload_without_changes_publishes_nothing(store):
+    recorder = Recorder()
+    store.add_listener(recorder)
+    before = store.current
+
+    assert store.reload("noop") is before
+    assert store.current is before
+    assert store.reloads == 1
+    assert recorder.snapshots == []
+    assert not store.changed()
+
+
+def test_added_file_is_published_and_unchanged_entries_are_reused(watched, dataset_dir):
+    store, recorder = watched
+    before = store.current
+
+    (dataset_dir / "machine_learning_basics_learning.csv").write_text(csv_rows(4))
+
+    assert wait_for(lambda: "machine_learning_basics_learning.csv" in store.current.entries)
+    snapshot = store.current
+    assert recorder.last is snapshot
+    assert snapshot.version == before.version + 1
+    assert snapshot.resolver is not before.resolver
+    assert snapshot.resolver.resolve("machine learning basics") == "machine_learning_basics_learning.csv"
+    for filename in before.entries:
+        assert snapshot.entries[filename] is before.entries[filename]
+    assert store.events[-1]["added"] == ["machine_learning_basics_learning.csv"]
+
+
+def test_changed_file_is_reparsed_and_the_resolver_kept(watched, dataset_dir):
+    store, recorder = watched
+    before = store.current
+    path = dataset_dir / "aws_developer_learning.csv"
+
+    path.write_text(csv_rows(12, label="revised"))
+
+    assert wait_for(lambda: store.current.version > before.version and not store.pending)
+    snapshot = store.current
+    records = snapshot.entries["aws_developer_learning.csv"].views["Elaborate"]
+    assert len(records) == 12 and records[0]["topic_title"] == "revised 0"
+    # same file names: the resolver (and its memo) carries over
+    assert snapshot.resolver is before.resolver
+    assert snapshot.entries["typescript_deep_dive_learning.csv"] is before.entries["typescript_deep_dive_learning.csv"]
+    assert store.events[-1]["changed"] == ["aws_developer_learning.csv"]
+
+
+def test_slow_write_stays_pending_and_is_never_parsed_half_written(watched, dataset_dir, monkeypatch):
+    store, recorder = watched
+    path = dataset_dir / "data_structures_algorithms_learning.csv"
+    parsed_sizes: t.List[int] = []
+    real_get = store.cache.get
+
+    def recording_get(file_path: str):
+        entry = real_get(file_path)
+        if file_path == str(path):
+            parsed_sizes.append(len(entry.views["Elaborate"]))
+        return entry
+
+    monkeypatch.setattr(store.cache, "get", recording_get)
+    body = csv_rows(40)
+    saw_pending = []
+
+    def write_slowly():
+        with open(path, "w") as f:
+            for line in body.splitlines(keepends=True):
+                f.write(line)
+                f.flush()
+                saw_pending.append(path.name in store.pending)
+                time.sleep(0.02)
+
+    writer = threading.Thread(target=write_slowly)
+    writer.start()
+    writer.join()
+
+    assert wait_for(lambda: path.name in store.current.entries and not store.pending)
+    assert any(saw_pending)
+    # only the finished file was ever parsed or published
+    assert parsed_sizes == [40]
+    for snapshot in recorder.snapshots:
+        if path.name in snapshot.entries:
+            assert len(snapshot.entries[path.name].views["Elaborate"]) == 40
+        if path.name in snapshot.signatures:
+            assert snapshot.signatures[path.name][1] == len(body)
+
+
+def test_removed_file_is_unpublished_and_discarded(watched, dataset_dir):
+    store, recorder = watched
+    path = dataset_dir / "typescript_deep_dive_learning.csv"
+    assert store.cache.stats()["entries"] == 2
+
+    path.unlink()
+
+    assert wait_for(lambda: path.name not in store.current.signatures)
+    snapshot = store.current
+    assert recorder.last is snapshot
+    assert path.name not in snapshot.entries
+    assert snapshot.resolver.files == ["aws_developer_learning.csv"]
+    assert snapshot.resolver.resolve("typescript deep dive") != path.name
+    assert store.cache.stats()["entries"] == 1
+    assert store.events[-1]["removed"] == [path.name]
+
+
+def test_listener_failure_does_not_stop_publishing(store, dataset_dir):
+    recorder = Recorder()
+
+    def broken(_snapshot):
+        raise RuntimeError("listener bug")
+
+    store.add_listener(broken)
+    store.add_listener(recorder)
+    (dataset_dir / "extra_learning.csv").write_text(csv_rows(2))
+
+    snapshot = store.reload("test")
+    assert recorder.snapshots == [snapshot]
+    assert store.current is snapshot
+    assert store.reload_errors == 0
\ No newline at end of file
@@ -0,0 +1,161 @@
+# backend/tests/test_encoded_response.py
+"""Pre-encoded bodies: ETag/304 for identity and compressed variants, Vary, and Accept-Encoding q-values."""
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import encoded_response
+import main
+from encoded_response import MIN_COMPRESS_SIZE, EncodedBody, choose_encoding, conditional_response, etag_matches
+
+LARGE = EncodedBody.from_obj({"content": ["record %d" % i for i in range(200)]})
+SMALL = EncodedBody.from_obj({"ok": True})
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+
+    @app.get("/large")
+    def large(request: Request):
+        return conditional_response(request, LARGE, headers={"X-Extra": "1"})
+
+    @app.get("/small")
+    def small(request: Request):
+        return conditional_response(request, SMALL)
+
+    return TestClient(app)
+
+
+def get(client, path: str, accept_encoding: str = "identity", **headers):
+    return client.get(path, headers={"Accept-Encoding": accept_encoding, **headers})
+
+
+def test_identity_response_and_304(client):
+    response = get(client, "/large")
+    assert response.status_code == 200
+    assert response.content == LARGE.body
+    assert response.headers["etag"] == LARGE.etag
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["x-extra"] == "1"
+    assert "content-encoding" not in response.headers
+
+    not_modified = get(client, "/large", **{"If-None-Match": LARGE.etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == LARGE.etag
+    assert not_modified.headers["vary"] == "Accept-Encoding"
+
+
+def test_gzip_variant_and_304_with_either_etag(client):
+    response = get(client, "/large", "gzip")
+    gzip_etag = f'{LARGE.etag[:-1]}-gzip"'
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == gzip_etag
+    assert response.headers["vary"] == "Accept-Encoding"
+    # TestClient decodes the body; it is the same resource
+    assert response.content == LARGE.body
+
+    for etag in (gzip_etag, LARGE.etag, f"W/{gzip_etag}", f'"other", {gzip_etag}'):
+        not_modified = get(client, "/large", "gzip", **{"If-None-Match": etag})
+        assert not_modified.status_code == 304, etag
+        assert not_modified.headers["etag"] == gzip_etag
+        assert "content-encoding" not in not_modified.headers
+    # a gzip ETag revalidates the identity representation too
+    assert get(client, "/large", **{"If-None-Match": gzip_etag}).status_code == 304
+    assert get(client, "/large", "gzip", **{"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_small_bodies_are_not_compressed(client):
+    assert len(SMALL.body) < MIN_COMPRESS_SIZE
+    response = get(client, "/small", "gzip, br")
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == SMALL.etag
+    assert get(client, "/small", "gzip", **{"If-None-Match": "*"}).status_code == 304
+
+
+@pytest.mark.parametrize("etag, header, expected", [
+    ('"abc"', '"abc"', True),
+    ('"abc"', 'W/"abc"', True),
+    ('"abc"', '"abc-gzip"', True),
+    ('"abc"', '"abc-br"', True),
+    ('"abc"', '"x", "abc-gzip"', True),
+    ('"abc"', "*", True),
+    ('"abc"', '"abcd"', False),
+    ('"abc"', '"ab-gzip"', False),
+    ('"abc"', '"xabc"', False),
+    ('"abc"', "", False),
+])
+def test_etag_matches(etag, header, expected):
+    assert etag_matches(header, etag) is expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip; q=0.5", "gzip"),
+    ("gzip;q=0.001, deflate", "gzip"),
+    ("gzip;q=bogus", None),
+    ("deflate, br;q=0", None),
+    ("br;q=0, gzip;q=0.2", "gzip"),
+])
+def test_choose_encoding_q_values(header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.parametrize("header", ["br", "gzip, br", "br;q=0.1, gzip"])
+def test_brotli_is_preferred_only_when_installed(monkeypatch, header):
+    monkeypatch.setattr(encoded_response, "brotli", None)
+    assert choose_encoding(header) == ("gzip" if "gzip" in header else None)
+    monkeypatch.setattr(encoded_response, "brotli", object())
+    assert choose_encoding(header) == "br"
+
+
+def test_transient_bodies_use_the_fastest_level():
+    body = encoded_response.encode_json({"rows": list(range(500))})
+    # gzip's XFL header byte: 2 = slowest/best compression, 4 = fastest
+    assert EncodedBody(body).variant("gzip")[8] == 2
+    assert EncodedBody(body, transient=True).variant("gzip")[8] == 4
+    assert gzip.decompress(EncodedBody(body, transient=True).variant("gzip")) == body
+
+
+def test_transient_bodies_use_the_fastest_brotli_quality(monkeypatch):
+    qualities = []
+
+    class FakeBrotli:
+        @staticmethod
+        def compress(data, quality):
+            qualities.append(quality)
+            return data
+
+    monkeypatch.setattr(encoded_response, "brotli", FakeBrotli)
+    EncodedBody(b"x" * 1000).variant("br")
+    EncodedBody(b"x" * 1000, transient=True).variant("br")
+    assert qualities == [11, 1]
+
+
+def test_health_is_compressed_at_the_fastest_level():
+    # rebuilt per request, so not worth the maximum level
+    with TestClient(main.app).stream("GET", "/api/health", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        compressed = b"".join(response.iter_raw())
+    assert compressed[8] == 4
+
+
+def test_learning_path_revalidates():
+    client = TestClient(main.app)
+    response = client.get("/api/learning-path/aws_developer", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.endswith('-gzip"')
+
+    for accept_encoding in ("gzip", "identity"):
+        not_modified = client.get("/api/learning-path/aws_developer", headers={"Accept-Encoding": accept_encoding, "If-None-Match": etag})
+        assert not_modified.status_code == 304
+    other_mode = client.get("/api/learning-path/aws_developer?mode=Short", headers={"If-None-Match": etag})
+    assert other_mode.status_code == 200
\ No newline at end of file
@@ -0,0 +1,130 @@
+# backend/tests/test_learning_path.py
+"""/api/learning-path: unchanged bytes without parameters, plus pagination, projection, module filter and NDJSON."""
+import json
+import os
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import main
+from course_resolver import course_key
+from dataset_cache import replace_nan_with_none
+
+MODES = ("Short", "Elaborate", "Realistic")
+
+
+def baseline_records(file_path: str, mode: str):
+    """The records the endpoint returned before the dataset cache, parsed per request."""
+    import pandas as pd
+
+    df = pd.read_csv(file_path, encoding="utf-8", on_bad_lines="skip")
+    df = df.where(pd.notnull(df), None)
+    if mode == "Short":
+        df = df.sample(frac=0.5, random_state=42) if len(df) > 1 else df
+    elif mode == "Realistic" and "difficulty" in df.columns:
+        df = df[df["difficulty"].isin(["Intermediate", "Advanced"])]
+        if len(df) == 0:
+            df = pd.read_csv(file_path, encoding="utf-8", on_bad_lines="skip")
+    return replace_nan_with_none(df.to_dict(orient="records"))
+
+
+def baseline_body(course_name: str, filename: str, mode: str) -> bytes:
+    records = baseline_records(os.path.join(main.DATASET_DIR, filename), mode)
+    body = {"course_name": course_name, "dataset_filename": filename, "learning_mode": mode, "total_modules": len(records), "content": records}
+    return JSONResponse(jsonable_encoder(body)).body
+
+
+@pytest.fixture(scope="module")
+def client():
+    main.dataset_store.reload("test", notify=False)
+    return TestClient(main.app)
+
+
+def learning_path(client, course: str = "aws_developer", headers=None, **params):
+    return client.get(f"/api/learning-path/{course}", params=params, headers=headers or {"Accept-Encoding": "identity"})
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("filename", sorted(f for f in os.listdir(main.DATASET_DIR) if f.endswith(".csv")))
+def test_without_parameters_body_is_unchanged(client, filename, mode):
+    course = course_key(filename)
+    response = learning_path(client, course, mode=mode)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == baseline_body(course, filename, mode)
+
+
+def test_default_mode_is_elaborate(client):
+    assert learning_path(client).content == learning_path(client, mode="Elaborate").content
+
+
+def test_cursor_pages_chain_to_the_full_list(client):
+    full = learning_path(client).json()["content"]
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 3} if cursor is None else {"limit": 3, "cursor": cursor}
+        body = learning_path(client, **params).json()
+        assert body["total_modules"] == len(full)
+        pages.append(body["content"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert all(len(page) == 3 for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= 3
+    assert [r for page in pages for r in page] == full
+
+
+def test_fields_project_records(client):
+    body = learning_path(client, fields="module_id, topic_title", limit=2).json()
+    full = learning_path(client, limit=2).json()["content"]
+    assert body["content"] == [{"module_id": r["module_id"], "topic_title": r["topic_title"]} for r in full]
+
+
+@pytest.mark.parametrize("params", [{"fields": "module_id,nope"}, {"cursor": "abc"}, {"cursor": "-1"}])
+def test_bad_fields_and_cursors_are_400(client, params):
+    response = learning_path(client, **params)
+    assert response.status_code == 400
+    if "fields" in params:
+        assert "nope" in response.json()["detail"]
+
+
+def test_module_filter(client):
+    full = learning_path(client).json()["content"]
+    module = full[0]["module_name"]
+    expected = [r for r in full if r["module_name"] == module]
+    assert 0 < len(expected) < len(full)
+
+    by_name = learning_path(client, module=module.upper().replace(" ", "_")).json()
+    assert by_name["content"] == expected
+    assert by_name["total_modules"] == len(expected)
+    by_id = learning_path(client, module=str(full[0]["module_id"])).json()
+    assert by_id["content"] == [r for r in full if r["module_id"] == full[0]["module_id"]]
+    assert learning_path(client, module="no such module").json()["content"] == []
+
+
+@pytest.mark.parametrize("how", ["query", "accept"])
+def test_ndjson_lines_and_headers(client, how):
+    full = learning_path(client).json()["content"]
+    if how == "query":
+        response = learning_path(client, format="ndjson", limit=4, fields="module_id,topic_title")
+    else:
+        response = learning_path(client, headers={"Accept": "application/x-ndjson"}, limit=4, fields="module_id,topic_title")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["x-total-modules"] == str(len(full))
+    assert response.headers["x-next-cursor"] == "4"
+    assert response.headers["x-dataset-filename"] == "aws_developer_learning.csv"
+    lines = response.content.decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [{"module_id": r["module_id"], "topic_title": r["topic_title"]} for r in full[:4]]
+
+    last = learning_path(client, format="ndjson", limit=4, cursor=str(len(full) - 1))
+    assert "x-next-cursor" not in last.headers
+    assert [json.loads(line) for line in last.content.decode("utf-8").splitlines()] == full[-1:]
+
+
+def test_unknown_course_is_404(client):
+    assert learning_path(client, "no_such_course_anywhere_xyz").status_code == 404
\ No newline at end of file
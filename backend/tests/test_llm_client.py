@@ -0,0 +1,160 @@
+# backend/tests/test_llm_client.py
+"""AsyncOpenAIClient against the local fake upstream (benchmarks/fake_openai.py).
+
+Retries on 429/5xx, timeouts, the concurrency cap and its queue, and that other
+routes stay responsive while generations wait on the upstream.
+"""
+import asyncio
+import statistics
+import time
+
+import httpx
+import pytest
+
+import main
+from benchmarks.fake_openai import create_app, free_port, serve_in_thread
+from llm_client import AsyncOpenAIClient, LLMError
+
+MESSAGES = [{"role": "user", "content": "Tell me about a project"}]
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    app = create_app(latency_ms=0, token_latency_ms=0)
+    port = free_port()
+    server = serve_in_thread(app, port)
+    yield app, f"http://127.0.0.1:{port}/v1"
+    server.should_exit = True
+
+
+@pytest.fixture
+def fake(upstream):
+    app, base_url = upstream
+    # abandoned calls from a previous test (e.g. timed out) may still be sleeping upstream
+    deadline = time.monotonic() + 5
+    while app.state.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    app.state.latency_ms = 0
+    app.state.error_rate = 0.0
+    app.state.calls = 0
+    app.state.max_in_flight = 0
+    app.state.scripted_statuses.clear()
+    return app, base_url
+
+
+def make_client(base_url: str, **kwargs) -> AsyncOpenAIClient:
+    kwargs.setdefault("backoff_base", 0.01)
+    return AsyncOpenAIClient("sk-test", base_url=base_url, model="fake", **kwargs)
+
+
+async def chat_and_close(client: AsyncOpenAIClient, **kwargs) -> str:
+    try:
+        return await client.chat(MESSAGES, **kwargs)
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retries_transient_status_then_succeeds(fake, status):
+    app, base_url = fake
+    app.state.scripted_statuses.extend([status, status])
+    client = make_client(base_url, max_retries=3)
+
+    answer = asyncio.run(chat_and_close(client))
+
+    assert answer.startswith("Situation:")
+    assert app.state.calls == 3
+    assert client.stats()["retries"] == 2
+    assert client.stats()["failures"] == 0
+
+
+def test_gives_up_after_max_retries(fake):
+    app, base_url = fake
+    app.state.scripted_statuses.extend([503] * 10)
+    client = make_client(base_url, max_retries=2)
+
+    with pytest.raises(LLMError, match="503"):
+        asyncio.run(chat_and_close(client))
+    assert app.state.calls == 3
+    assert client.stats()["failures"] == 1
+
+
+def test_client_errors_are_not_retried(fake):
+    app, base_url = fake
+    app.state.scripted_statuses.append(400)
+    client = make_client(base_url, max_retries=3)
+
+    with pytest.raises(LLMError, match="400"):
+        asyncio.run(chat_and_close(client))
+    assert app.state.calls == 1
+    assert client.stats()["retries"] == 0
+
+
+def test_timeouts_are_retried_then_raised(fake):
+    app, base_url = fake
+    app.state.latency_ms = 500
+    client = make_client(base_url, timeout=0.1, max_retries=2)
+
+    started = time.monotonic()
+    with pytest.raises(LLMError, match="Timeout"):
+        asyncio.run(chat_and_close(client))
+    # three attempts of ~0.1s each, not three full upstream latencies
+    assert time.monotonic() - started < 1.2
+    assert client.stats()["retries"] == 2
+
+
+def test_semaphore_caps_upstream_concurrency_and_queues_the_rest(fake):
+    app, base_url = fake
+    app.state.latency_ms = 200
+    client = make_client(base_url, max_concurrency=2)
+
+    async def run():
+        tasks = [asyncio.create_task(client.chat(MESSAGES)) for _ in range(6)]
+        await asyncio.sleep(0.1)
+        during = client.stats()
+        answers = await asyncio.gather(*tasks)
+        await client.aclose()
+        return during, answers
+
+    during, answers = asyncio.run(run())
+
+    assert len(answers) == 6
+    assert during["in_flight"] == 2
+    assert during["queued"] == 4
+    assert app.state.max_in_flight == 2
+    assert client.stats()["queued"] == client.stats()["in_flight"] == 0
+
+
+def test_health_stays_fast_while_generations_are_in_flight(fake, monkeypatch):
+    app, base_url = fake
+    app.state.latency_ms = 1000
+    generations = 50
+    client = make_client(base_url, max_concurrency=generations)
+    monkeypatch.setattr(main, "llm_client", client)
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=30) as backend:
+            tasks = [
+                asyncio.create_task(backend.post("/api/generate-answer", json={"prompt": f"Loop latency question {i} {time.time()}"}))
+                for i in range(generations)
+            ]
+            await asyncio.sleep(0.2)
+            in_flight = client.stats()["in_flight"]
+            samples = []
+            while len(samples) < 20:
+                start = time.perf_counter()
+                response = await backend.get("/api/health")
+                assert response.status_code == 200
+                samples.append(time.perf_counter() - start)
+            responses = await asyncio.gather(*tasks)
+        await client.aclose()
+        return in_flight, samples, responses
+
+    in_flight, samples, responses = asyncio.run(run())
+
+    assert in_flight == generations
+    # the event loop is never blocked on the upstream: health answers in a small fraction of its 1s latency
+    assert statistics.median(samples) < 0.1
+    assert max(samples) < 0.5
+    assert all(r.status_code == 200 and not r.json()["answer"].startswith("Error") for r in responses)
@@ -0,0 +1,56 @@
+# backend/tests/test_metrics.py
+"""Sharded histograms and gauges: exact totals across threads, no shard left behind by exited threads."""
+import threading
+
+from metrics import Gauge, Histogram
+
+
+def run_threads(n: int, target) -> None:
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_exited_threads_are_folded_into_retired_total():
+    histogram = Histogram("test_latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    child = histogram.labels("/x")
+    run_threads(500, lambda: child.observe(0.5))
+
+    assert len(child._sharded) == 0
+    counts, total = child.snapshot()
+    assert counts == [0, 500, 0]
+    assert total == 250.0
+
+
+def test_gauge_balances_across_short_lived_threads():
+    gauge = Gauge("test_in_flight", "test", ("method",))
+    child = gauge.labels("GET")
+    child.inc(3)
+    run_threads(200, lambda: (child.inc(), child.inc(), child.dec()))
+
+    assert child.value() == 203
+    # only this thread's shard is still live
+    assert len(child._sharded) == 1
+
+
+def test_live_thread_keeps_writing_its_own_shard():
+    histogram = Histogram("test_live_seconds", "test", buckets=(1.0,))
+    child = histogram.labels()
+    started, release = threading.Event(), threading.Event()
+
+    def worker():
+        child.observe(0.1)
+        started.set()
+        release.wait()
+        child.observe(2.0)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    started.wait()
+    assert child.snapshot()[0] == [1, 0]
+    release.set()
+    thread.join()
+    assert child.snapshot() == ([1, 1], 2.1)
+    assert "test_live_seconds_count 2" in "\n".join(histogram.render())
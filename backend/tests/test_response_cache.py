@@ -0,0 +1,133 @@
+# backend/tests/test_response_cache.py
+"""ResponseCache: the SQLite tier survives restarts but stays bounded; streamed answers are counted but not coalesced."""
+import asyncio
+import json
+import sqlite3
+import typing as t
+
+import httpx
+import pytest
+
+import main
+from benchmarks.fake_openai import create_app, free_port, serve_in_thread
+from llm_client import AsyncOpenAIClient
+from response_cache import CachedAnswer, ResponseCache
+
+
+def disk_rows(path) -> int:
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def test_answers_persist_across_instances(tmp_path):
+    path = str(tmp_path / "answers.db")
+    asyncio.run(ResponseCache(db_path=path).store("k", "answer", 1.5))
+
+    fresh = ResponseCache(db_path=path)
+    assert asyncio.run(fresh.lookup("k")) == "answer"
+    assert fresh.disk_hits == 1
+
+
+def test_expired_rows_are_deleted(tmp_path):
+    path = str(tmp_path / "answers.db")
+    cache = ResponseCache(db_path=path, ttl=-1, prune_interval=0)
+    for i in range(5):
+        asyncio.run(cache.store(f"expired-{i}", "old", 1.0))
+    cache.ttl = 3600
+    asyncio.run(cache.store("live", "new", 1.0))
+
+    assert disk_rows(path) == 1
+    assert cache.disk_pruned == 5
+    assert asyncio.run(ResponseCache(db_path=path).lookup("live")) == "new"
+
+
+def test_expired_rows_are_deleted_on_open(tmp_path):
+    path = str(tmp_path / "answers.db")
+    cache = ResponseCache(db_path=path, prune_interval=3600)
+    cache._put_disk("stale", CachedAnswer("old", 0.0, 1.0))
+    assert disk_rows(path) == 1
+
+    ResponseCache(db_path=path)
+    assert disk_rows(path) == 0
+
+
+def test_row_cap_evicts_oldest_writes(tmp_path):
+    path = str(tmp_path / "answers.db")
+    cache = ResponseCache(db_path=path, max_disk_entries=20, prune_interval=3600)
+    for i in range(100):
+        cache._put_disk(f"k{i}", CachedAnswer(f"a{i}", 10_000_000_000.0 + i, 1.0))
+        # pruned every max_disk_entries // 10 writes, so never far above the cap
+        assert disk_rows(path) <= 20 + 2
+
+    cache._prune(cache._connection())
+    cache._connection().commit()
+    assert disk_rows(path) == 20
+    fresh = ResponseCache(db_path=path)
+    assert asyncio.run(fresh.lookup("k99")) == "a99"
+    assert asyncio.run(fresh.lookup("k0")) is None
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    app = create_app(latency_ms=0, token_latency_ms=0)
+    port = free_port()
+    server = serve_in_thread(app, port)
+    yield app, f"http://127.0.0.1:{port}/v1"
+    server.should_exit = True
+
+
+@pytest.fixture
+def backend(upstream, monkeypatch):
+    app, base_url = upstream
+    app.state.calls = 0
+    app.state.latency_ms = 0
+    cache = ResponseCache()
+    monkeypatch.setattr(main, "response_cache", cache)
+    monkeypatch.setattr(main, "llm_client", AsyncOpenAIClient("sk-test", base_url=base_url, model="fake"))
+    return app, cache
+
+
+async def read_stream(client: httpx.AsyncClient, prompt: str) -> str:
+    """The answer of the final "done" event."""
+    response = await client.post("/api/generate-answer/stream", json={"prompt": prompt})
+    assert response.status_code == 200
+    done = response.text.rstrip("\n").rsplit("\n\n", 1)[-1]
+    assert done.startswith("event: done\ndata: ")
+    return json.loads(done.split("data: ", 1)[1])["answer"]
+
+
+def run_streams(prompts) -> t.List[str]:
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=30) as client:
+            bodies = await asyncio.gather(*(read_stream(client, p) for p in prompts))
+        await main.llm_client.aclose()
+        return bodies
+
+    return asyncio.run(run())
+
+
+def test_streamed_misses_are_counted(backend):
+    app, cache = backend
+    for prompt in ["one", "two", "three", "four"]:
+        run_streams([prompt])
+    run_streams(["one"])
+
+    assert app.state.calls == 4
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["coalesced"]) == (1, 4, 0)
+    assert stats["hit_ratio"] == 0.2
+
+
+def test_concurrent_identical_streams_are_not_coalesced(backend):
+    app, cache = backend
+    app.state.latency_ms = 100
+
+    answers = run_streams(["same question"] * 3)
+
+    # each stream relays its own upstream deltas; only the finished answer is shared afterwards
+    assert app.state.calls == 3
+    assert cache.stats()["misses"] == 3
+    assert len(set(answers)) == 1
+    assert run_streams(["same question"]) == answers[:1]
+    assert app.state.calls == 3
@@ -0,0 +1,195 @@
+# backend/tests/test_search_index.py
+"""BM25 search: scores match the textbook formula, filters narrow the candidates, highlights
+point at the query terms, and a refresh only re-tokenizes files whose signature changed."""
+import math
+import types
+
+import pytest
+
+import search_index
+from course_resolver import CourseResolver
+from search_index import (
+    B, K1, MODULE_FIELDS, QUESTION_FIELDS, SearchDoc, SearchIndex, SearchIndexer, _tokenize_docs, make_snippet, tokenize,
+)
+
+AWS = [
+    {"module_id": 1, "module_name": "IAM", "topic_title": "IAM roles", "content_summary": "Roles grant temporary credentials.", "difficulty": "Beginner"},
+    {"module_id": 2, "module_name": "IAM", "topic_title": "IAM policies", "content_summary": "Policies attach to roles and users.", "difficulty": "Intermediate"},
+    {"module_id": 3, "module_name": "Lambda", "topic_title": "Lambda functions", "content_summary": "Run code without servers; an execution role is required.", "difficulty": "Advanced"},
+    {"module_id": 4, "module_name": "S3", "topic_title": "Buckets", "content_summary": "Object storage.", "code_example": "aws s3 mb s3://bucket", "difficulty": "Beginner"},
+]
+TYPESCRIPT = [
+    {"module_id": 1, "module_name": "Types", "topic_title": "Generics", "content_summary": "Reusable typed functions.", "difficulty": "Intermediate"},
+    {"module_id": 2, "module_name": "Types", "topic_title": "Utility types", "content_summary": "Partial, Pick and Record.", "difficulty": None},
+]
+QUESTIONS = [
+    {"id": "q1", "question": "Tell me about a time you used IAM roles."},
+    {"id": "q2", "question": "How do lambda functions scale?"},
+]
+
+
+def course_docs(course: str, records):
+    return _tokenize_docs([SearchDoc("course", course, f"{course}_learning.csv", r, MODULE_FIELDS) for r in records])
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SearchIndex([
+        course_docs("aws_developer", AWS),
+        course_docs("typescript_deep_dive", TYPESCRIPT),
+        _tokenize_docs([SearchDoc("question_bank", "amazon", "amazon_clean.csv", r, QUESTION_FIELDS) for r in QUESTIONS]),
+    ])
+
+
+def reference_scores(index: SearchIndex, terms):
+    """Plain-Python BM25F over the same weighted fields."""
+    tfs, lengths = [], []
+    for doc in index.docs:
+        tf = {}
+        for field, weight in doc.fields:
+            value = doc.record.get(field)
+            for token in tokenize(value if isinstance(value, str) else ""):
+                tf[token] = tf.get(token, 0.0) + weight
+        tfs.append(tf)
+        lengths.append(sum(tf.values()))
+    n, avgdl = len(tfs), sum(lengths) / len(lengths)
+    scores = {}
+    for term in terms:
+        df = sum(1 for tf in tfs if term in tf)
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for i, tf in enumerate(tfs):
+            if term in tf:
+                freq = tf[term]
+                scores[i] = scores.get(i, 0.0) + idf * freq * (K1 + 1) / (freq + K1 * (1 - B + B * lengths[i] / avgdl))
+    return scores
+
+
+@pytest.mark.parametrize("query", ["iam roles", "role", "lambda functions", "types", "the roles of iam"])
+def test_bm25_scores_and_order(index, query):
+    expected = reference_scores(index, search_index.query_terms(query))
+    total, hits = index.search(query, limit=3)
+
+    ranked = sorted(expected, key=lambda i: (-expected[i], i))
+    assert total == len(expected)
+    assert [(h["course"], h.get("module_id") or h.get("question_id")) for h in hits] == [
+        (index.docs[i].course, index.docs[i].record.get("module_id") or index.docs[i].record.get("id")) for i in ranked[:3]
+    ]
+    assert [h["score"] for h in hits] == pytest.approx([round(expected[i], 4) for i in ranked[:3]], abs=1e-3)
+
+
+def test_title_hits_outrank_summary_hits(index):
+    _, hits = index.search("roles", limit=10)
+    assert hits[0]["topic_title"] == "IAM roles"
+
+
+def test_unknown_and_stopword_queries(index):
+    assert index.search("kubernetes") == (0, [])
+    # nothing but stopwords: searched as-is rather than dropped
+    total, hits = index.search("how")
+    assert total == 1 and hits[0]["question_id"] == "q2"
+
+
+def test_filters_remove_candidates(index):
+    total, _ = index.search("iam roles lambda functions")
+    assert total == 6
+
+    aws = index.course_codes(["aws_developer"])
+    total, hits = index.search("iam roles lambda functions", courses=aws)
+    assert total == 3 and {h["course"] for h in hits} == {"aws_developer"}
+
+    total, hits = index.search("iam roles lambda functions", difficulties=["advanced", "Beginner"])
+    assert total == 2 and {h["difficulty"] for h in hits} == {"Advanced", "Beginner"}
+
+    total, hits = index.search("iam roles lambda functions", source="question_bank")
+    assert total == 2 and {h["question_id"] for h in hits} == {"q1", "q2"}
+
+    total, hits = index.search("iam roles lambda functions", courses=aws, difficulties=["Beginner"], source="course")
+    assert total == 1 and hits[0]["topic_title"] == "IAM roles"
+
+    assert index.search("iam", courses=[])[0] == 0
+    assert index.search("iam", difficulties=["Expert"])[0] == 0
+    assert index.search("types", difficulties=["Intermediate"])[0] == 1
+
+
+def test_course_codes_fall_back_to_the_resolver(index):
+    resolver = CourseResolver(["aws_developer_learning.csv", "typescript_deep_dive_learning.csv"])
+    aws, typescript = index.courses.index("aws_developer"), index.courses.index("typescript_deep_dive")
+
+    assert index.course_codes(["aws_developer", "AWS Developer", "typescript-deep-dive"]) == [aws, aws, typescript]
+    assert index.course_codes(["typescript"]) == []
+    assert index.course_codes(["typescript"], resolver=resolver) == [typescript]
+    assert index.course_codes(["no such course"], resolver=resolver) == []
+
+
+@pytest.mark.parametrize("text", [
+    "IAM roles grant temporary credentials to services.",
+    " ".join(["filler"] * 60) + " then the IAM Roles section, and more roles " + " ".join(["tail"] * 60),
+    "roles" + " x" * 200 + " roles",
+])
+def test_snippet_highlights_point_at_query_terms(text):
+    snippet, highlights = make_snippet(text, {"iam", "roles"})
+
+    assert highlights
+    assert len(snippet) <= search_index.SNIPPET_WIDTH + 2
+    for start, end in highlights:
+        assert snippet[start:end].lower() in {"iam", "roles"}
+    assert snippet.strip("…") in text
+
+
+def test_search_hit_highlights(index):
+    _, hits = index.search("execution role", limit=1)
+    hit = hits[0]
+    assert hit["field"] == "content_summary"
+    assert [hit["snippet"][a:b] for a, b in hit["highlights"]] == ["execution", "role"]
+
+
+def test_refresh_only_retokenizes_changed_files(monkeypatch):
+    datasets = {"aws_developer_learning.csv": AWS, "typescript_deep_dive_learning.csv": TYPESCRIPT}
+    loaded, tokenized = [], []
+    real_tokenize = search_index._tokenize_docs
+
+    def counting_tokenize(docs):
+        tokenized.append(docs[0].filename if docs else None)
+        return real_tokenize(docs)
+
+    def load_records(_snapshot, filename):
+        loaded.append(filename)
+        return datasets[filename]
+
+    monkeypatch.setattr(search_index, "_tokenize_docs", counting_tokenize)
+    indexer = SearchIndexer(load_records)
+
+    def snapshot(version, **signatures):
+        return types.SimpleNamespace(version=version, signatures={f"{name}_learning.csv": sig for name, sig in signatures.items()})
+
+    first = indexer.refresh(snapshot(1, aws_developer=(1, 10), typescript_deep_dive=(1, 20)))
+    assert sorted(tokenized) == sorted(datasets) and first.version == 1
+
+    # same snapshot version: no rebuild at all
+    tokenized.clear()
+    assert indexer.refresh(snapshot(1, aws_developer=(1, 10), typescript_deep_dive=(1, 20))) is first
+    assert tokenized == [] and indexer.builds == 1
+
+    # one file changed: only it is reloaded and re-tokenized
+    datasets["typescript_deep_dive_learning.csv"] = TYPESCRIPT[:1]
+    loaded.clear()
+    second = indexer.refresh(snapshot(2, aws_developer=(1, 10), typescript_deep_dive=(2, 15)))
+    assert loaded == tokenized == ["typescript_deep_dive_learning.csv"]
+    assert second.version == 2 and len(second) == len(AWS) + 1
+
+    # removed files drop out without touching the rest
+    tokenized.clear()
+    third = indexer.refresh(snapshot(3, aws_developer=(1, 10)))
+    assert tokenized == [] and third.courses == ["aws_developer"]
+
+
+def test_refresh_rebuilds_when_a_question_bank_changes(tmp_path):
+    bank = tmp_path / "amazon_clean.csv"
+    bank.write_text("id,question\nq1,Why this team?\n")
+    indexer = SearchIndexer(lambda _snapshot, _filename: [], question_dir=str(tmp_path))
+    empty = types.SimpleNamespace(version=1, signatures={})
+
+    assert indexer.refresh(empty).search("team")[0] == 1
+    bank.write_text("id,question\nq1,Why this team?\nq2,Which team did you lead?\n")
+    assert indexer.refresh(empty).search("team")[0] == 2
+    assert indexer.builds == 2
\ No newline at end of file
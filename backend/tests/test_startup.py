@@ -0,0 +1,53 @@
+# backend/tests/test_startup.py
+"""Warm-up and readiness: a failed pack compile must not skip loading, and a failed warm-up is not ready."""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from startup import STARTUP
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture(autouse=True)
+def restore_startup_state():
+    ready, error = STARTUP.ready.is_set(), STARTUP.warmup_error
+    yield
+    STARTUP.warmup_error = error
+    if ready:
+        STARTUP.ready.set()
+    else:
+        STARTUP.ready.clear()
+
+
+def test_pack_compile_failure_falls_back_to_csv(monkeypatch, client):
+    monkeypatch.setattr(main, "DATASET_PACK_PATH", "/nonexistent/dir/datasets.pack")
+    monkeypatch.setattr(main, "dataset_pack", None)
+    monkeypatch.setattr(main.dataset_cache, "pack", None)
+
+    main.warm_up(compile_stale_pack=True)
+
+    assert STARTUP.warmup_error is None
+    snapshot = main.dataset_store.current
+    assert snapshot.signatures and len(snapshot.entries) == len(snapshot.signatures)
+    assert main.search_indexer.builds >= 1
+    assert main.course_ranker.builds >= 1
+    assert client.get("/api/ready").status_code == 200
+
+
+def test_ready_is_503_while_starting(client):
+    STARTUP.ready.clear()
+    response = client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+def test_ready_is_503_after_failed_warm_up(client):
+    STARTUP.mark_ready("boom")
+    response = client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "failed"
+    assert response.json()["startup"]["warmup_error"] == "boom"
@@ -0,0 +1,97 @@
+# backend/tests/test_static_assets.py
+"""In-memory frontend assets: immutable caching only for Vite-hashed names, HEAD without a body."""
+import pytest
+from fastapi.testclient import TestClient
+
+from static_assets import DEFAULT_CACHE, HASHED_NAME_RE, IMMUTABLE_CACHE, REVALIDATE_CACHE, AssetServer
+
+import main
+
+
+@pytest.mark.parametrize("name", ["index-V6t8lALd.js", "index-1_rgf39z.css", "vendor-AbCd1234.js", "logo-a_b-c9Zx.svg"])
+def test_hashed_names(name):
+    assert HASHED_NAME_RE.search(name)
+
+
+@pytest.mark.parametrize("name", ["my-component.js", "logo-placeholder.svg", "app-settings.js", "index.js", "favicon.ico", "chunk.V6t8lALd.js"])
+def test_unhashed_names(name):
+    assert not HASHED_NAME_RE.search(name)
+
+
+@pytest.fixture
+def dist(tmp_path):
+    files = {
+        "index.html": "<!doctype html><script src=/assets/index-V6t8lALd.js></script>" + " " * 600,
+        "assets/index-V6t8lALd.js": "console.log('hashed');" * 100,
+        "assets/my-component.js": "console.log('plain');" * 100,
+        "robots.txt": "User-agent: *\n",
+    }
+    for relpath, content in files.items():
+        path = tmp_path / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return str(tmp_path)
+
+
+def test_cache_control_per_file(dist):
+    server = AssetServer(dist)
+    assert server.lookup("index.html").cache_control == REVALIDATE_CACHE
+    assert server.lookup("assets/index-V6t8lALd.js").cache_control == IMMUTABLE_CACHE
+    assert server.lookup("assets/my-component.js").cache_control == DEFAULT_CACHE
+    assert server.lookup("robots.txt").cache_control == DEFAULT_CACHE
+
+
+@pytest.fixture
+def client(dist, monkeypatch):
+    monkeypatch.setattr(main, "asset_server", AssetServer(dist))
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("path", ["/", "/static/index-V6t8lALd.js", "/assets/index-V6t8lALd.js", "/dashboard/courses/42", "/robots.txt"])
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip"])
+def test_head_matches_get_without_body(client, path, accept_encoding):
+    headers = {"Accept-Encoding": accept_encoding}
+    get = client.get(path, headers=headers)
+    head = client.head(path, headers=headers)
+    assert get.status_code == head.status_code == 200
+    assert head.content == b""
+    for name in ("content-type", "content-length", "etag", "cache-control", "content-encoding"):
+        assert head.headers.get(name) == get.headers.get(name), name
+
+
+def test_head_missing_static_asset_is_404(client):
+    assert client.head("/static/nope-12345678.js").status_code == 404
+
+
+def test_head_range(client):
+    response = client.head("/static/index-V6t8lALd.js", headers={"Range": "bytes=0-9", "Accept-Encoding": "identity"})
+    assert response.status_code == 206
+    assert response.headers["content-range"].startswith("bytes 0-9/")
+    assert response.headers["content-length"] == "10"
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("range_header, status, body_slice", [
+    ("bytes=0-9", 206, slice(0, 10)),
+    ("bytes=10-", 206, slice(10, None)),
+    ("bytes=-5", 206, slice(-5, None)),
+    ("bytes=0-999999", 206, slice(0, None)),
+    # multiple or malformed ranges are ignored: full body, not 416
+    ("bytes=0-1,4-5", 200, slice(None)),
+    ("bytes=5-2", 200, slice(None)),
+    ("bytes=abc", 200, slice(None)),
+    ("bytes=-", 200, slice(None)),
+    ("items=0-5", 200, slice(None)),
+    # well-formed but unsatisfiable
+    ("bytes=999999-", 416, None),
+    ("bytes=-0", 416, None),
+])
+def test_range_requests(client, range_header, status, body_slice):
+    full = client.get("/static/index-V6t8lALd.js", headers={"Accept-Encoding": "identity"}).content
+    response = client.get("/static/index-V6t8lALd.js", headers={"Range": range_header, "Accept-Encoding": "identity"})
+    assert response.status_code == status
+    if status == 416:
+        assert response.headers["content-range"] == f"bytes */{len(full)}"
+    else:
+        assert response.content == full[body_slice]
+        assert ("content-range" in response.headers) == (status == 206)
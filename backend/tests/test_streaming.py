@@ -0,0 +1,140 @@
+# backend/tests/test_streaming.py
+"""Server-sent answer streaming end to end: the backend and the fake upstream both run under uvicorn.
+
+Deltas arrive in order and join into the final "done" answer, errors end the
+stream with an "error" event, and a client that goes away cancels the upstream.
+"""
+import json
+import time
+import typing as t
+
+import httpx
+import pytest
+
+import main
+from benchmarks.fake_openai import create_app, free_port, serve_in_thread
+from llm_client import AsyncOpenAIClient
+
+
+@pytest.fixture(scope="module")
+def servers():
+    upstream = create_app(latency_ms=0, token_latency_ms=0)
+    upstream_port = free_port()
+    upstream_server = serve_in_thread(upstream, upstream_port)
+    backend_port = free_port()
+    backend_server = serve_in_thread(main.app, backend_port)
+    yield upstream, f"http://127.0.0.1:{upstream_port}/v1", f"http://127.0.0.1:{backend_port}"
+    backend_server.should_exit = True
+    upstream_server.should_exit = True
+
+
+def wait_for(condition: t.Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def backend(servers, monkeypatch):
+    upstream, upstream_url, backend_url = servers
+    assert wait_for(lambda: upstream.state.in_flight == 0)
+    upstream.state.token_latency_ms = 0
+    upstream.state.calls = 0
+    upstream.state.scripted_statuses.clear()
+    # a fresh client per test: it binds to the backend server's event loop on first use
+    monkeypatch.setattr(main, "llm_client", AsyncOpenAIClient("sk-test", base_url=upstream_url, model="fake", max_retries=0))
+    # answers are not cached between tests, so every request reaches the upstream
+    monkeypatch.setattr(main.response_cache, "max_temperature", -1.0)
+    with httpx.Client(base_url=backend_url, timeout=30) as client:
+        yield upstream, client
+
+
+def parse_events(text: str) -> t.List[t.Tuple[t.Optional[str], dict]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        event = None
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[len("data: "):])))
+    return events
+
+
+def expected_answer(prompt: str) -> str:
+    return f"Situation: {prompt[:40]} Task: ... Action: ... Result: ..."
+
+
+def test_deltas_then_done(backend):
+    upstream, client = backend
+    response = client.post("/api/generate-answer/stream", json={"prompt": "Tell me about a conflict"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    events = parse_events(response.text)
+    deltas = [data["delta"] for event, data in events[:-1]]
+    assert all(event is None for event, _ in events[:-1])
+    # one delta per upstream token, in order
+    assert deltas == [token + " " for token in expected_answer("Tell me about a conflict").split(" ")]
+    assert events[-1] == ("done", {"answer": "".join(deltas).strip()})
+    assert upstream.state.calls == 1
+
+
+def test_accept_event_stream_on_generate_answer(backend):
+    _, client = backend
+    prompt = "Describe a deadline you missed"
+    streamed = client.post("/api/generate-answer", json={"prompt": prompt}, headers={"Accept": "text/event-stream"})
+    buffered = client.post("/api/generate-answer", json={"prompt": prompt})
+
+    assert streamed.headers["content-type"].startswith("text/event-stream")
+    assert parse_events(streamed.text)[-1] == ("done", {"answer": expected_answer(prompt)})
+    assert buffered.headers["content-type"] == "application/json"
+    assert buffered.json() == {"answer": expected_answer(prompt)}
+
+
+def test_star_fallback_without_api_key(backend, monkeypatch):
+    upstream, client = backend
+    monkeypatch.setattr(main, "llm_client", None)
+
+    events = parse_events(client.post("/api/generate-answer/stream", json={"prompt": "anything"}).text)
+
+    assert events == [(None, {"delta": main.LOCAL_FALLBACK_ANSWER}), ("done", {"answer": main.LOCAL_FALLBACK_ANSWER})]
+    assert upstream.state.calls == 0
+
+
+def test_upstream_client_error_ends_with_error_event(backend):
+    upstream, client = backend
+    upstream.state.scripted_statuses.append(400)
+
+    response = client.post("/api/generate-answer/stream", json={"prompt": "Bad request"})
+
+    assert response.status_code == 200
+    events = parse_events(response.text)
+    assert len(events) == 1
+    event, data = events[0]
+    assert event == "error"
+    assert data["answer"].startswith("Error: AI generation failed") and "400" in data["answer"]
+    assert upstream.state.calls == 1
+
+
+def test_client_disconnect_cancels_upstream(backend):
+    upstream, client = backend
+    # ~10 tokens at 200ms each: the upstream is still streaming long after the first delta
+    upstream.state.token_latency_ms = 200
+    completed, cancelled = upstream.state.streams_completed, upstream.state.streams_cancelled
+
+    with client.stream("POST", "/api/generate-answer/stream", json={"prompt": "Walk away early"}) as response:
+        # keep the iterator referenced: closing it early would already drop the connection
+        lines = response.iter_lines()
+        assert next(lines).startswith("data: ")
+        assert upstream.state.in_flight == 1
+        assert main.llm_client.stats()["in_flight"] == 1
+
+    assert wait_for(lambda: upstream.state.in_flight == 0, timeout=1.5)
+    assert upstream.state.streams_cancelled == cancelled + 1
+    assert upstream.state.streams_completed == completed
+    assert wait_for(lambda: main.llm_client.stats()["in_flight"] == 0, timeout=1.0)
\ No newline at end of file